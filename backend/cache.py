@@ -0,0 +1,142 @@
+"""
+Response cache for the read endpoints.
+
+Entries hold the already-serialized JSON body together with its ETag and
+Last-Modified value, grouped by player so writes only drop what they touch.
+Every invalidation also records when the player's data last changed, so
+Last-Modified moves on deletes too (the newest updated_at of the remaining
+rows does not), and bumps a version counter: a response built while a write
+landed is not cached. Change times are the real clock truncated to the
+second; two changes within one second share a Last-Modified and only the
+ETag tells them apart.
+The in-process cache is per worker; run a single worker or plug a shared
+backend (subclass ResponseCache) when scaling out.
+"""
+
+import hashlib
+import threading
+import typing as t
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+# bucket for responses that span every player (/players, /ranges/tree without player)
+ALL_PLAYERS = "*"
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    body: bytes
+    etag: str
+    last_modified: t.Optional[datetime] = None
+
+
+def make_entry(body: bytes, last_modified: t.Optional[datetime] = None) -> CacheEntry:
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    return CacheEntry(body=body, etag=etag, last_modified=last_modified)
+
+
+def _change_time() -> datetime:
+    # HTTP dates have a resolution of one second
+    return datetime.utcnow().replace(microsecond=0)
+
+
+class ResponseCache(ABC):
+    """Interface for response caches keyed by (player, key)."""
+
+    @abstractmethod
+    def changed_at(self, player: t.Optional[str]) -> datetime:
+        """Naive UTC time the player's data (any player's for None) last changed."""
+
+    @abstractmethod
+    def version(self, player: t.Optional[str]) -> int:
+        """Counter that moves on every change of the player's data (any player's for None)."""
+
+    @abstractmethod
+    def get(self, player: t.Optional[str], key: str) -> t.Optional[CacheEntry]:
+        pass
+
+    @abstractmethod
+    def set(self, player: t.Optional[str], key: str, entry: CacheEntry) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate(self, player: t.Optional[str] = None) -> None:
+        """Drop entries for player (and the cross-player bucket); all entries if player is None."""
+
+
+class NullResponseCache(ResponseCache):
+    """Cache that never stores anything; ETags are still computed per response."""
+
+    def changed_at(self, player):
+        # nothing is tracked: never old enough for If-Modified-Since, ETags still apply
+        return _change_time()
+
+    def version(self, player):
+        return 0
+
+    def get(self, player, key):
+        return None
+
+    def set(self, player, key, entry):
+        pass
+
+    def invalidate(self, player=None):
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    """Thread-safe LRU cache living in the worker process."""
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[t.Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # changes made before this process started are unknown
+        self._started = _change_time()
+        self._changed: t.Dict[str, t.Tuple[datetime, int]] = {}
+        self._changed_all: t.Tuple[datetime, int] = (self._started, 0)
+        # latest change of any player, as (time, version)
+        self._last_change: t.Tuple[datetime, int] = (self._started, 0)
+
+    def _state(self, player: t.Optional[str]) -> t.Tuple[datetime, int]:
+        if player is None:
+            return self._last_change
+        return max(self._changed.get(player, (self._started, 0)), self._changed_all)
+
+    def changed_at(self, player):
+        with self._lock:
+            return self._state(player)[0]
+
+    def version(self, player):
+        with self._lock:
+            return self._state(player)[1]
+
+    def get(self, player, key):
+        k = (player or ALL_PLAYERS, key)
+        with self._lock:
+            entry = self._entries.get(k)
+            if entry is not None:
+                self._entries.move_to_end(k)
+            return entry
+
+    def set(self, player, key, entry):
+        with self._lock:
+            self._entries[(player or ALL_PLAYERS, key)] = entry
+            self._entries.move_to_end((player or ALL_PLAYERS, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, player=None):
+        with self._lock:
+            # never earlier than a change already served, should the clock step back
+            time, version = self._last_change
+            self._last_change = (max(_change_time(), time), version + 1)
+            if player is None:
+                self._changed_all = self._last_change
+                self._entries.clear()
+                return
+            self._changed[player] = self._last_change
+            for k in [k for k in self._entries if k[0] in (player, ALL_PLAYERS)]:
+                del self._entries[k]
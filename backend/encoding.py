@@ -0,0 +1,177 @@
+"""
+Compact encoding of range editor payloads.
+
+The frontend stores a ``cardRange`` whose ``pairActions`` maps hand classes
+("AA", "AKs", "AKo", ...) to one segment ``{action, color, percent}`` or a list
+of them. Here that mapping is packed into a fixed 169-class record laid out in
+the editor's grid order (row-major over ``RANKS``), optionally zlib-compressed,
+and carried as base64 inside the JSON document:
+
+    header   b"PR" | version (u8) | flags (u8, bit 0 = zlib)
+    body     n_actions (u8) + [len (u8) + utf-8 name] * n_actions
+             n_colors  (u8) + [len (u8) + utf-8 color] * n_colors
+             169 records: count (u8) + count * [action (u8), color (u8), percent (u16 le)]
+
+A record count of 0 means the hand is absent, otherwise it is ``1 + segments``
+with bit 7 set when the value was a single object rather than a list.
+Percentages are kept as basis points, so anything with up to two decimals
+round-trips exactly. Payloads that do not fit the layout are left as JSON.
+"""
+
+import base64
+import struct
+import typing as t
+import zlib
+
+# one definition of the grid order, shared with the library: the "pr1"
+# records are laid out in this order, so the two must never drift apart
+from pypokerstar.src.types.cards import HAND_CLASS_INDEX as HAND_INDEX, HAND_CLASSES
+
+ENCODING = "pr1"
+MEDIA_TYPE = "application/vnd.pypokerstar.range+json"
+ENCODING_KEY = "pairActionsEncoding"
+
+_MAGIC = b"PR"
+_VERSION = 1
+_FLAG_ZLIB = 1
+_SINGLE = 0x80
+_MISSING = 0xFF
+_SEGMENT_KEYS = {"action", "color", "percent"}
+
+
+def _put_table(out: bytearray, values: t.List[str]) -> None:
+    out.append(len(values))
+    for v in values:
+        raw = v.encode("utf-8")
+        if len(raw) > 255:
+            raise ValueError(f"Value too long to encode: {v!r}")
+        out.append(len(raw))
+        out += raw
+
+
+def _get_table(data: bytes, pos: int) -> t.Tuple[t.List[str], int]:
+    values = []
+    for _ in range(data[pos]):
+        size = data[pos + 1]
+        values.append(data[pos + 2:pos + 2 + size].decode("utf-8"))
+        pos += 1 + size
+    return values, pos + 1
+
+
+def _basis_points(percent: t.Any) -> int:
+    if isinstance(percent, bool) or not isinstance(percent, (int, float)):
+        raise ValueError(f"Percent must be a number. Given: {percent!r}")
+    bp = round(percent * 100)
+    if not 0 <= bp < 0xFFFF or abs(bp / 100 - percent) > 1e-9:
+        raise ValueError(f"Percent not representable in basis points: {percent!r}")
+    return bp
+
+
+def pack_pair_actions(pair_actions: t.Dict[str, t.Any], compress: bool = True) -> bytes:
+    """Pack a pairActions mapping; raises ValueError if it does not fit the layout."""
+    actions: t.Dict[str, int] = {}
+    colors: t.Dict[str, int] = {}
+    records: t.List[t.Optional[t.Tuple[bool, t.List[t.Tuple[int, int, int]]]]] = [None] * len(HAND_CLASSES)
+
+    def index_of(table: t.Dict[str, int], value: t.Any) -> int:
+        if value is None:
+            return _MISSING
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a string. Given: {value!r}")
+        if value not in table:
+            if len(table) >= _MISSING:
+                raise ValueError("Too many distinct values to encode")
+            table[value] = len(table)
+        return table[value]
+
+    for hand, value in pair_actions.items():
+        if hand not in HAND_INDEX:
+            raise ValueError(f"Unknown hand class: {hand!r}")
+        single = isinstance(value, dict)
+        segments = [value] if single else value
+        if not isinstance(segments, list) or len(segments) > 126:
+            raise ValueError(f"Unsupported value for {hand}: {value!r}")
+        packed = []
+        for seg in segments:
+            if not isinstance(seg, dict) or not set(seg) <= _SEGMENT_KEYS or "percent" not in seg:
+                raise ValueError(f"Unsupported segment for {hand}: {seg!r}")
+            packed.append((index_of(actions, seg.get("action")), index_of(colors, seg.get("color")), _basis_points(seg["percent"])))
+        records[HAND_INDEX[hand]] = (single, packed)
+
+    body = bytearray()
+    _put_table(body, list(actions))
+    _put_table(body, list(colors))
+    for record in records:
+        if record is None:
+            body.append(0)
+            continue
+        single, packed = record
+        body.append((1 + len(packed)) | (_SINGLE if single else 0))
+        for action, color, bp in packed:
+            body += struct.pack("<BBH", action, color, bp)
+
+    flags = 0
+    payload = bytes(body)
+    if compress:
+        compressed = zlib.compress(payload, 9)
+        if len(compressed) < len(payload):
+            flags |= _FLAG_ZLIB
+            payload = compressed
+    return _MAGIC + bytes([_VERSION, flags]) + payload
+
+
+def unpack_pair_actions(data: bytes) -> t.Dict[str, t.Any]:
+    if data[:2] != _MAGIC or data[2] != _VERSION:
+        raise ValueError("Not a packed range")
+    body = data[4:]
+    if data[3] & _FLAG_ZLIB:
+        body = zlib.decompress(body)
+    actions, pos = _get_table(body, 0)
+    colors, pos = _get_table(body, pos)
+    out: t.Dict[str, t.Any] = {}
+    for hand in HAND_CLASSES:
+        head = body[pos]
+        pos += 1
+        if head == 0:
+            continue
+        segments = []
+        for _ in range((head & ~_SINGLE) - 1):
+            action, color, bp = struct.unpack_from("<BBH", body, pos)
+            pos += 4
+            seg: t.Dict[str, t.Any] = {}
+            if action != _MISSING:
+                seg["action"] = actions[action]
+            if color != _MISSING:
+                seg["color"] = colors[color]
+            seg["percent"] = bp // 100 if bp % 100 == 0 else bp / 100
+            segments.append(seg)
+        out[hand] = segments[0] if head & _SINGLE else segments
+    return out
+
+
+def is_compact(card_range: t.Any) -> bool:
+    return isinstance(card_range, dict) and card_range.get(ENCODING_KEY) == ENCODING
+
+
+def encode_card_range(card_range: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+    """Return card_range with pairActions packed as base64; unchanged if it cannot be packed losslessly."""
+    pair_actions = card_range.get("pairActions") if isinstance(card_range, dict) else None
+    if is_compact(card_range) or not isinstance(pair_actions, dict):
+        return card_range
+    try:
+        packed = pack_pair_actions(pair_actions)
+    except (ValueError, struct.error):
+        return card_range
+    out = dict(card_range)
+    out["pairActions"] = base64.b64encode(packed).decode("ascii")
+    out[ENCODING_KEY] = ENCODING
+    return out
+
+
+def decode_card_range(card_range: t.Any) -> t.Any:
+    """Inverse of encode_card_range; plain payloads are returned as they are."""
+    if not is_compact(card_range):
+        return card_range
+    out = {k: v for k, v in card_range.items() if k != ENCODING_KEY}
+    out["pairActions"] = unpack_pair_actions(base64.b64decode(card_range["pairActions"]))
+    return out
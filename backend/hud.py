@@ -0,0 +1,112 @@
+"""
+Real-time HUD statistics.
+
+HudService keeps running per-player counters in memory and is fed the rows of
+newly stored hands (see ingest.HandIngestor.listeners), whether they come from
+uploads or from the hand-history folder watcher. After every batch the
+updated players' stats are pushed to the WebSocket subscribers interested in
+them, so a table's opponents refresh as soon as a hand is written to disk.
+"""
+
+import asyncio
+import logging
+import typing as t
+
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from pypokerstar.src.parsers.watcher import HandHistoryWatcher
+
+from .ingest import HandIngestor, hand_rows
+
+logger = logging.getLogger(__name__)
+
+FLAGS = ("vpip", "pfr", "3bet", "wtsd", "w$sd")
+
+
+def _empty_counters() -> t.Dict[str, float]:
+    return {"hands": 0, **{flag: 0 for flag in FLAGS}, "invested": 0.0, "collected": 0.0}
+
+
+def hud_line(counters: t.Dict[str, float]) -> t.Dict[str, t.Any]:
+    """Counters plus the derived percentages shown on the HUD."""
+    hands = counters["hands"] or 1
+    out = dict(counters)
+    for flag in FLAGS:
+        out[f"{flag}_pct"] = round(100.0 * counters[flag] / hands, 1)
+    out["net"] = round(counters["collected"] - counters["invested"], 2)
+    return out
+
+
+class HudService:
+    def __init__(self) -> None:
+        self.counters: t.Dict[str, t.Dict[str, float]] = {}
+        # websocket -> player names it follows (None = everybody)
+        self.subscribers: t.Dict[WebSocket, t.Optional[t.Set[str]]] = {}
+
+    def apply(self, rows: t.List[t.Dict[str, t.Any]]) -> t.Set[str]:
+        """Add the per-player stats of new hands to the counters; returns the players updated."""
+        changed: t.Set[str] = set()
+        for row in rows:
+            for stat in row["stats"]:
+                c = self.counters.setdefault(stat["name"], _empty_counters())
+                c["hands"] += 1
+                for flag in FLAGS:
+                    c[flag] += bool(stat[flag])
+                c["invested"] += stat["invested"]
+                c["collected"] += stat["collected"]
+                changed.add(stat["name"])
+        return changed
+
+    def snapshot(self, players: t.Optional[t.Iterable[str]] = None) -> t.Dict[str, t.Dict[str, t.Any]]:
+        names = self.counters.keys() if players is None else [p for p in players if p in self.counters]
+        return {name: hud_line(self.counters[name]) for name in names}
+
+    async def on_hands(self, rows: t.List[t.Dict[str, t.Any]]) -> None:
+        changed = self.apply(rows)
+        if changed and self.subscribers:
+            await self.publish(changed)
+
+    async def publish(self, changed: t.Set[str]) -> None:
+        lines = self.snapshot(changed)
+        sends = []
+        targets = []
+        for ws, players in list(self.subscribers.items()):
+            delta = lines if players is None else {k: v for k, v in lines.items() if k in players}
+            if delta:
+                targets.append(ws)
+                sends.append(ws.send_json({"type": "delta", "players": delta}))
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for ws, result in zip(targets, results):
+            if isinstance(result, Exception):
+                self.subscribers.pop(ws, None)
+
+    async def serve(self, ws: WebSocket, players: t.Optional[t.Set[str]] = None) -> None:
+        """Run one subscriber: initial snapshot, then deltas; {"players": [...]} messages change the filter."""
+        await ws.accept()
+        self.subscribers[ws] = players
+        try:
+            await ws.send_json({"type": "snapshot", "players": self.snapshot(players)})
+            while True:
+                message = await ws.receive_json()
+                if isinstance(message, dict) and "players" in message:
+                    players = set(message["players"]) if message["players"] is not None else None
+                    self.subscribers[ws] = players
+                    await ws.send_json({"type": "snapshot", "players": self.snapshot(players)})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self.subscribers.pop(ws, None)
+
+
+async def watch_folder(watcher: HandHistoryWatcher, ingestor: HandIngestor, interval: float) -> None:
+    """Poll a live hand-history folder and push its new hands through the ingestor (and so to the HUD)."""
+    while True:
+        try:
+            hands = await run_in_threadpool(watcher.poll)
+            if hands:
+                await ingestor.store_and_notify([hand_rows(h) for h in hands])
+        except Exception:
+            # one bad file or a database hiccup must not stop the watcher for good
+            logger.exception("Polling %s failed", watcher.directory)
+        await asyncio.sleep(interval)
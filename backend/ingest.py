@@ -0,0 +1,264 @@
+"""
+Hand-history ingestion for the /hands endpoints.
+
+Uploaded text is split into hands in a worker thread and handed to a process
+pool in batches, where PokerStarsParser turns each batch into plain row
+dicts. Rows come back to a writer thread that drops hand ids already stored
+and bulk-inserts the rest into hands / hand_players / hand_actions. Nothing
+heavier than reading the request body runs on the event loop. Finished jobs
+are kept for JOB_TTL seconds, MAX_JOBS at most.
+"""
+
+import asyncio
+import codecs
+import os
+import re
+import threading
+import typing as t
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from pypokerstar.src.game.poker import Hand, Player, player_hand_stats
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+
+from .models import HandAction, HandPlayer, HandRecord
+
+# hands per parse task sent to the pool
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+# rows per executemany / IN (...) chunk when storing
+STORE_CHUNK_SIZE = 500
+# finished jobs stay queryable for this many seconds, and at most MAX_JOBS are kept
+JOB_TTL = int(os.getenv("INGEST_JOB_TTL", "3600"))
+MAX_JOBS = int(os.getenv("INGEST_MAX_JOBS", "1000"))
+
+_TABLE = re.compile(r"Table '([^']+)'")
+_DEALT = re.compile(r"Dealt to (.+?) \[")
+
+
+@dataclass
+class IngestJob:
+    id: str
+    status: str = "running"  # running | done | failed
+    files: int = 0
+    hands: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    error: t.Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: t.Optional[datetime] = None
+    tasks: t.List["asyncio.Task"] = field(default_factory=list, repr=False)
+    waiter: t.Optional["asyncio.Task"] = field(default=None, repr=False)
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name not in ("tasks", "waiter")}
+
+
+def split_hands(text: str) -> t.List[str]:
+    return [h for h in PokerStarsParser._get_hands(text.replace("\r\n", "\n")) if h]
+
+
+def hand_rows(hand: Hand) -> t.Dict[str, t.Any]:
+    """Flatten a parsed Hand into rows for the hands, hand_players and hand_actions tables."""
+    raw = hand.raw_text
+    table = _TABLE.search(raw)
+    dealt = _DEALT.search(raw)
+    result = hand.result
+    players = []
+    for p in hand.players:
+        players.append({
+            "hand_id": hand.id,
+            "seat": p.seat,
+            "name": p.name,
+            "stack": p.pot,
+            "cards": " ".join(c.standard_string() for c in p.cards) if p.cards else None,
+            "net": result.get(p),
+        })
+    actions = []
+    for rnd in hand.rounds:
+        for bet in rnd.bets:
+            actions.append({
+                "hand_id": hand.id,
+                "seq": len(actions),
+                "street": rnd.name.lower(),
+                "player": bet.player.name,
+                "action": bet.type,
+                "amount": bet.amount,
+            })
+    stats = [
+        {"name": name, **{k: row[k] for k in ("vpip", "pfr", "3bet", "wtsd", "w$sd", "invested", "collected")}}
+        for name, row in player_hand_stats(hand).items()
+    ]
+    return {
+        "hand": {
+            "id": hand.id,
+            "site": "PokerStars",
+            "table_name": table.group(1) if table else None,
+            "hero": hand.hero.name if hand.hero else (dealt.group(1) if dealt else None),
+            "game_type": hand.game_type,
+            "date": hand.date,
+            "button_seat": hand.button_seat,
+            "pot": hand.pot,
+            "rake": hand.rake,
+            "board": " ".join(c.standard_string() for c in hand.board),
+            "raw_text": raw,
+            "created_at": datetime.utcnow(),
+        },
+        "players": players,
+        "actions": actions,
+        # per player flags, not stored: consumed by listeners such as the HUD
+        "stats": stats,
+    }
+
+
+def parse_hand_history(text: str, hero: t.Optional[str] = None) -> t.Tuple[t.List[t.Dict[str, t.Any]], int]:
+    """Pool worker: parse a batch of hands, returning (rows, failed count)."""
+    if not text.strip():
+        return [], 0
+    parser = PokerStarsParser()
+    hands = parser.parse(file_content=text, hero=Player(name=hero) if hero else None, progress=False)
+    return [hand_rows(h) for h in hands], parser.failed
+
+
+def _chunks(items: t.Sequence[t.Any], size: int = STORE_CHUNK_SIZE) -> t.Iterator[t.Sequence[t.Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class HandIngestor:
+    """Owns the parse pool, the job registry and the writer lock.
+
+    Listeners are awaited with the rows of every batch of newly stored hands.
+    """
+
+    def __init__(self, session_factory: t.Callable[[], t.Any], max_workers: t.Optional[int] = None) -> None:
+        self.session_factory = session_factory
+        self.max_workers = max_workers or int(os.getenv("INGEST_WORKERS", "0")) or os.cpu_count()
+        self.jobs: t.Dict[str, IngestJob] = {}
+        self._executor: t.Optional[ProcessPoolExecutor] = None
+        self._write_lock = threading.Lock()
+        self.listeners: t.List[t.Callable[[t.List[t.Dict[str, t.Any]]], t.Awaitable[None]]] = []
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def new_job(self) -> IngestJob:
+        self.evict_jobs()
+        job = IngestJob(id=uuid.uuid4().hex)
+        self.jobs[job.id] = job
+        return job
+
+    def evict_jobs(self) -> None:
+        """Forget finished jobs older than JOB_TTL, then the oldest finished ones above MAX_JOBS."""
+        now = datetime.utcnow()
+        finished = [job for job in self.jobs.values() if job.finished_at is not None]
+        for job in finished:
+            if (now - job.finished_at).total_seconds() > JOB_TTL:
+                del self.jobs[job.id]
+        excess = len(self.jobs) - MAX_JOBS + 1
+        if excess > 0:
+            finished = sorted((job for job in self.jobs.values() if job.finished_at is not None), key=lambda job: job.finished_at)
+            for job in finished[:excess]:
+                del self.jobs[job.id]
+
+    def submit(self, job: IngestJob, hands: t.Sequence[str], hero: t.Optional[str] = None) -> None:
+        """Schedule parsing and storing of complete hand texts, in batches."""
+        for batch in _chunks(hands, INGEST_BATCH_SIZE):
+            job.tasks.append(asyncio.create_task(self._ingest_batch(job, "\n\n".join(batch), hero)))
+
+    def finish(self, job: IngestJob) -> None:
+        """Mark the job done once every submitted batch has been stored."""
+        async def wait():
+            results = await asyncio.gather(*job.tasks, return_exceptions=True)
+            errors = [r for r in results if isinstance(r, BaseException)]
+            job.tasks = []
+            job.status = "failed" if errors else "done"
+            job.error = repr(errors[0]) if errors else None
+            job.finished_at = datetime.utcnow()
+
+        # the event loop only keeps weak references to tasks
+        job.waiter = asyncio.create_task(wait())
+
+    async def _ingest_batch(self, job: IngestJob, text: str, hero: t.Optional[str]) -> None:
+        loop = asyncio.get_running_loop()
+        rows, failed = await loop.run_in_executor(self.executor, parse_hand_history, text, hero)
+        job.failed += failed
+        job.hands += len(rows)
+        new = await self.store_and_notify(rows)
+        job.inserted += len(new)
+        job.duplicates += len(rows) - len(new)
+
+    async def store_and_notify(self, rows: t.List[t.Dict[str, t.Any]]) -> t.List[t.Dict[str, t.Any]]:
+        new = await run_in_threadpool(self.store, rows)
+        if new:
+            for listener in self.listeners:
+                await listener(new)
+        return new
+
+    def store(self, rows: t.List[t.Dict[str, t.Any]]) -> t.List[t.Dict[str, t.Any]]:
+        """Insert hands whose id is not stored yet; returns the rows that were inserted."""
+        with self._write_lock:
+            try:
+                return self._store(rows)
+            except IntegrityError:
+                # another process stored some of these ids in the meantime: filter again
+                return self._store(rows)
+
+    def _store(self, rows: t.List[t.Dict[str, t.Any]]) -> t.List[t.Dict[str, t.Any]]:
+        unique: t.Dict[str, t.Dict[str, t.Any]] = {}
+        for row in rows:
+            unique.setdefault(row["hand"]["id"], row)
+        db = self.session_factory()
+        try:
+            ids = list(unique)
+            for chunk in _chunks(ids):
+                for hand_id in db.execute(select(HandRecord.id).where(HandRecord.id.in_(chunk))).scalars():
+                    unique.pop(hand_id, None)
+            new = list(unique.values())
+            for chunk in _chunks(new):
+                db.execute(insert(HandRecord), [r["hand"] for r in chunk])
+                players = [p for r in chunk for p in r["players"]]
+                if players:
+                    db.execute(insert(HandPlayer), players)
+                actions = [a for r in chunk for a in r["actions"]]
+                if actions:
+                    db.execute(insert(HandAction), actions)
+            db.commit()
+            return new
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def ingest_stream(self, job: IngestJob, chunks: t.AsyncIterator[bytes], hero: t.Optional[str] = None) -> None:
+        """Feed complete hands from a byte stream to the pool as soon as a batch is available."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        buffer = ""
+        pending: t.List[str] = []
+        async for chunk in chunks:
+            buffer = (buffer + decoder.decode(chunk)).replace("\r\n", "\n")
+            cut = buffer.rfind("\n\n")
+            if cut == -1:
+                continue
+            pending.extend(await run_in_threadpool(split_hands, buffer[:cut]))
+            buffer = buffer[cut:]
+            if len(pending) >= INGEST_BATCH_SIZE:
+                self.submit(job, pending, hero)
+                pending = []
+        pending.extend(await run_in_threadpool(split_hands, buffer + decoder.decode(b"", final=True)))
+        self.submit(job, pending, hero)
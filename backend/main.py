@@ -1,26 +1,60 @@
-from fastapi import FastAPI, HTTPException, Depends
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, File, Query, Request, UploadFile, WebSocket
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import create_engine, insert, select, update
 from typing import Any, Dict, Optional
 
 from sqlalchemy.orm import sessionmaker
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 import typing as t
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from .cache import MemoryResponseCache, NullResponseCache, make_entry
+from .hud import HudService, watch_folder
+from .ingest import HandIngestor, split_hands
+from .encoding import MEDIA_TYPE as COMPACT_MEDIA_TYPE, decode_card_range, encode_card_range
+from .migrations import migrate
 from .models import Base, Player, Category, Range as RangeModel
-from pydantic import BaseModel
+import json
 import os
 
 # Database setup
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ranges.db")
+# rows per executemany / IN (...) chunk for bulk import and export
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "500"))
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base.metadata.create_all(bind=engine)
+migrate(engine)
+# RESPONSE_CACHE=off disables caching of the read endpoints (ETags are still sent)
+if os.getenv("RESPONSE_CACHE", "memory") == "off":
+    response_cache = NullResponseCache()
+else:
+    response_cache = MemoryResponseCache(max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "2048")))
+ingestor = HandIngestor(SessionLocal)
+hud = HudService()
+ingestor.listeners.append(hud.on_hands)
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # HUD_WATCH_DIR: live PokerStars hand-history folder to follow for the HUD
+    watch_task = None
+    if os.getenv("HUD_WATCH_DIR"):
+        from pypokerstar.src.parsers.watcher import HandHistoryWatcher
+        watcher = HandHistoryWatcher(os.getenv("HUD_WATCH_DIR"))
+        watch_task = asyncio.create_task(watch_folder(watcher, ingestor, float(os.getenv("HUD_POLL_INTERVAL", "0.25"))))
+    yield
+    if watch_task:
+        watch_task.cancel()
+    ingestor.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -31,6 +65,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
 )
 def get_db():
     db = SessionLocal()
@@ -39,6 +74,52 @@ def get_db():
     finally:
         db.close()
 
+def _http_date(dt: datetime) -> str:
+    # stored timestamps are naive UTC
+    return format_datetime(dt.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+def _not_modified(request: Request, etag: str, last_modified: t.Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        return if_none_match.strip() == "*" or etag in [e.strip() for e in if_none_match.split(",")]
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+def wants_compact(request: Request) -> bool:
+    return COMPACT_MEDIA_TYPE in request.headers.get("accept", "")
+
+def card_range_for(request: Request, stored: t.Any) -> t.Any:
+    """Stored range_data in the representation negotiated through Accept."""
+    return encode_card_range(stored) if wants_compact(request) else decode_card_range(stored)
+
+def cached_json(request: Request, player: t.Optional[str], build: t.Callable[[], t.Tuple[t.Any, t.Optional[datetime]]], media_type: str = "application/json") -> Response:
+    """Serve build() -> (body, last_modified) from the response cache, answering 304 to matching conditional GETs."""
+    key = media_type + " " + request.url.path + "?" + str(request.query_params)
+    entry = response_cache.get(player, key)
+    if entry is None:
+        # read before building: a write landing while building must not leave its stale body cached
+        version = response_cache.version(player)
+        changed = response_cache.changed_at(player)
+        body, last_modified = build()
+        # rows only date additions and updates; deletes only show in the change time
+        last_modified = max(last_modified, changed) if last_modified else changed
+        content = json.dumps(jsonable_encoder(body), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        entry = make_entry(content, last_modified)
+        if response_cache.version(player) == version:
+            response_cache.set(player, key, entry)
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if entry.last_modified:
+        headers["Last-Modified"] = _http_date(entry.last_modified)
+    if _not_modified(request, entry.etag, entry.last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=media_type, headers=headers)
+
 class RangeCreate(BaseModel):
     player: str
     category: str
@@ -46,6 +127,16 @@ class RangeCreate(BaseModel):
     name: str
     cardRange: Dict[str, Any]
 
+    @field_validator("cardRange")
+    @classmethod
+    def check_card_range(cls, v):
+        # compact payloads are stored as sent, so reject the ones that do not decode
+        try:
+            decode_card_range(v)
+        except Exception as e:
+            raise ValueError(f"invalid compact cardRange: {e}")
+        return v
+
 class RangeResponse(BaseModel):
     id: int
     player: str
@@ -59,6 +150,9 @@ class RangeResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class RangeBulk(BaseModel):
+    ranges: t.List[RangeCreate]
+
 class PlayerCreate(BaseModel):
     name: str
 
@@ -74,12 +168,15 @@ def create_player(p: PlayerCreate, db: Session = Depends(get_db)):
     db.add(new)
     db.commit()
     db.refresh(new)
+    response_cache.invalidate(p.name)
     return {"id": new.id, "name": new.name}
 
 @app.get("/players")
-def list_players(db: Session = Depends(get_db)):
-    rows = db.query(Player).order_by(Player.name).all()
-    return [r.name for r in rows]
+def list_players(request: Request, db: Session = Depends(get_db)):
+    def build():
+        rows = db.execute(select(Player.name).order_by(Player.name)).scalars().all()
+        return rows, None
+    return cached_json(request, None, build)
 
 # Categories endpoints
 @app.post("/categories")
@@ -90,6 +187,7 @@ def create_category(c: CategoryCreate, db: Session = Depends(get_db)):
         db.add(player)
         db.commit()
         db.refresh(player)
+        response_cache.invalidate(c.player)
     existing = db.query(Category).filter(Category.player_id == player.id, Category.name == c.name).first()
     if existing:
         return {"id": existing.id, "name": existing.name}
@@ -97,45 +195,76 @@ def create_category(c: CategoryCreate, db: Session = Depends(get_db)):
     db.add(new)
     db.commit()
     db.refresh(new)
+    response_cache.invalidate(c.player)
     return {"id": new.id, "name": new.name}
 
 @app.get("/categories")
-def list_categories(player: str = "default", db: Session = Depends(get_db)):
-    player_row = db.query(Player).filter(Player.name == player).first()
-    if not player_row:
-        return []
-    rows = db.query(Category).filter(Category.player_id == player_row.id).order_by(Category.name).all()
-    return [r.name for r in rows]
+def list_categories(request: Request, player: str = "default", db: Session = Depends(get_db)):
+    def build():
+        rows = db.execute(
+            select(Category.name)
+            .join(Player, Category.player_id == Player.id)
+            .where(Player.name == player)
+            .order_by(Category.name)
+        ).scalars().all()
+        return rows, None
+    return cached_json(request, player, build)
 
 # Names: list saved range names for player/category/position
 @app.get("/names")
-def list_names(player: str = "default", category: str = "Ranges", position: str = "UTG", db: Session = Depends(get_db)):
-    player_row = db.query(Player).filter(Player.name == player).first()
-    if not player_row:
-        return []
-    cat = db.query(Category).filter(Category.player_id == player_row.id, Category.name == category).first()
-    if not cat:
-        return []
-    rows = db.query(RangeModel).filter(RangeModel.player_id == player_row.id, RangeModel.category_id == cat.id, RangeModel.position == position).order_by(RangeModel.name).all()
-    return [r.name for r in rows]
+def list_names(request: Request, player: str = "default", category: str = "Ranges", position: str = "UTG", db: Session = Depends(get_db)):
+    def build():
+        rows = db.execute(
+            select(RangeModel.name, RangeModel.updated_at)
+            .join(Player, RangeModel.player_id == Player.id)
+            .join(Category, RangeModel.category_id == Category.id)
+            .where(Player.name == player, Category.name == category, RangeModel.position == position)
+            .order_by(RangeModel.name)
+        ).all()
+        return [r.name for r in rows], max((r.updated_at for r in rows if r.updated_at), default=None)
+    return cached_json(request, player, build)
 
 # Tree explorer for UI
 @app.get("/ranges/tree")
-def ranges_tree(player: t.Optional[str] = None, db: Session = Depends(get_db)):
-    q = db.query(RangeModel)
-    if player:
-        player_row = db.query(Player).filter(Player.name == player).first()
-        if not player_row:
-            return {}
-        q = q.filter(RangeModel.player_id == player_row.id)
-    rows = q.all()
-    tree: t.Dict[str, t.Dict[str, t.Dict[str, t.List[str]]]] = {}
-    for r in rows:
-        p = r.player_rel.name
-        pos = r.position
-        cat = r.category_rel.name
-        tree.setdefault(p, {}).setdefault(pos, {}).setdefault(cat, []).append(r.name)
-    return tree
+def ranges_tree(
+    request: Request,
+    player: t.Optional[str] = None,
+    limit: t.Optional[int] = Query(None, ge=1, le=10000),
+    cursor: t.Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    # with limit the body is {"tree", "next_cursor"}: pages of ranges by id, merged by the client;
+    # without it the whole tree, as before
+    def build():
+        # single joined projection: no per-row lazy loads of player/category and no range_data blobs
+        stmt = (
+            select(RangeModel.id, Player.name, RangeModel.position, Category.name, RangeModel.name, RangeModel.updated_at)
+            .select_from(RangeModel)
+            .join(Player, RangeModel.player_id == Player.id)
+            .join(Category, RangeModel.category_id == Category.id)
+            .order_by(RangeModel.id)
+        )
+        if player:
+            stmt = stmt.where(Player.name == player)
+        if cursor is not None:
+            stmt = stmt.where(RangeModel.id > cursor)
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+        rows = db.execute(stmt).all()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][0]
+        tree: t.Dict[str, t.Dict[str, t.Dict[str, t.List[str]]]] = {}
+        last_modified = None
+        for _, p, pos, cat, name, updated_at in rows:
+            tree.setdefault(p, {}).setdefault(pos, {}).setdefault(cat, []).append(name)
+            if updated_at and (last_modified is None or updated_at > last_modified):
+                last_modified = updated_at
+        if limit is not None:
+            return {"tree": tree, "next_cursor": next_cursor}, last_modified
+        return tree, last_modified
+    return cached_json(request, player, build)
 
 # Ranges CRUD (save/load/list/delete)
 @app.post("/ranges/save")
@@ -162,17 +291,18 @@ def save_range(range_data: RangeCreate, db: Session = Depends(get_db)):
     ).first()
 
     if existing:
-        existing.range_data = range_data.cardRange
+        existing.card_range = range_data.cardRange
         existing.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(existing)
+        response_cache.invalidate(player_row.name)
         return {"status": "updated", "range": RangeResponse(
             id=existing.id,
             player=player_row.name,
             category=cat_row.name,
             position=existing.position,
             name=existing.name,
-            cardRange=existing.range_data,
+            cardRange=existing.card_range,
             created_at=existing.created_at,
             updated_at=existing.updated_at
         ).dict()}
@@ -181,26 +311,32 @@ def save_range(range_data: RangeCreate, db: Session = Depends(get_db)):
         category_id=cat_row.id,
         position=range_data.position,
         name=range_data.name,
-        range_data=range_data.cardRange
+        card_range=range_data.cardRange
     )
     db.add(new)
     db.commit()
     db.refresh(new)
+    response_cache.invalidate(player_row.name)
     return {"status": "created", "range": RangeResponse(
         id=new.id,
         player=player_row.name,
         category=cat_row.name,
         position=new.position,
         name=new.name,
-        cardRange=new.range_data,
+        cardRange=new.card_range,
         created_at=new.created_at,
         updated_at=new.updated_at
     ).dict()}
 
 @app.get("/ranges/load")
-def load_range(player: str = "default", category: str = "Ranges", position: str = "UTG", name: str = None, db: Session = Depends(get_db)):
+def load_range(request: Request, player: str = "default", category: str = "Ranges", position: str = "UTG", name: str = None, db: Session = Depends(get_db)):
     if not name:
         raise HTTPException(status_code=400, detail="name is required")
+    if wants_compact(request):
+        return cached_json(request, player, lambda: _load_range(request, db, player, category, position, name), COMPACT_MEDIA_TYPE)
+    return cached_json(request, player, lambda: _load_range(request, db, player, category, position, name))
+
+def _load_range(request: Request, db: Session, player: str, category: str, position: str, name: str):
     player_row = db.query(Player).filter(Player.name == player).first()
     if not player_row:
         raise HTTPException(status_code=404, detail="player not found")
@@ -221,36 +357,224 @@ def load_range(player: str = "default", category: str = "Ranges", position: str
         "category": cat_row.name,
         "position": r.position,
         "name": r.name,
-        "cardRange": r.range_data,
+        "cardRange": card_range_for(request, r.range_data),
         "created_at": r.created_at,
         "updated_at": r.updated_at
-    }
+    }, r.updated_at
 
 @app.get("/ranges/list")
-def list_ranges(player: str = "default", category: str = "Ranges", position: t.Optional[str] = None, db: Session = Depends(get_db)):
-    player_row = db.query(Player).filter(Player.name == player).first()
-    if not player_row:
-        return {"ranges": []}
-    cat_row = db.query(Category).filter(Category.player_id == player_row.id, Category.name == category).first()
-    if not cat_row:
-        return {"ranges": []}
-    q = db.query(RangeModel).filter(RangeModel.player_id == player_row.id, RangeModel.category_id == cat_row.id)
+def list_ranges(
+    request: Request,
+    player: str = "default",
+    category: str = "Ranges",
+    position: t.Optional[str] = None,
+    include_data: bool = True,
+    limit: t.Optional[int] = Query(None, ge=1, le=1000),
+    cursor: t.Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    # include_data=false skips the range_data blobs when only names/metadata are needed;
+    # limit/cursor page by id (pass back next_cursor to get the following page)
+    columns = [RangeModel.id, RangeModel.name, RangeModel.position, RangeModel.created_at, RangeModel.updated_at]
+    if include_data:
+        columns.append(RangeModel.range_data)
+    stmt = (
+        select(*columns)
+        .join(Player, RangeModel.player_id == Player.id)
+        .join(Category, RangeModel.category_id == Category.id)
+        .where(Player.name == player, Category.name == category)
+        .order_by(RangeModel.id)
+    )
     if position:
-        q = q.filter(RangeModel.position == position)
-    rows = q.all()
+        stmt = stmt.where(RangeModel.position == position)
+    if cursor is not None:
+        stmt = stmt.where(RangeModel.id > cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    rows = db.execute(stmt).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
     out = []
     for r in rows:
-        out.append({
+        item = {
             "id": r.id,
             "name": r.name,
             "position": r.position,
-            "player": player_row.name,
-            "category": cat_row.name,
-            "cardRange": r.range_data,
+            "player": player,
+            "category": category,
             "created_at": r.created_at,
             "updated_at": r.updated_at
+        }
+        if include_data:
+            item["cardRange"] = card_range_for(request, r.range_data)
+        out.append(item)
+    return {"ranges": out, "next_cursor": next_cursor}
+
+# Bulk import/export
+def _chunks(items: t.Sequence[t.Any], size: int = BULK_BATCH_SIZE) -> t.Iterator[t.Sequence[t.Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _ensure_players(db: Session, names: t.Iterable[str]) -> t.Dict[str, int]:
+    """Return name -> id for every player, inserting the missing ones in batches."""
+    names = sorted(set(names))
+    ids: t.Dict[str, int] = {}
+
+    def fetch(chunk):
+        ids.update({name: pid for name, pid in db.execute(select(Player.name, Player.id).where(Player.name.in_(chunk)))})
+
+    for chunk in _chunks(names):
+        fetch(chunk)
+    missing = [n for n in names if n not in ids]
+    for chunk in _chunks(missing):
+        db.execute(insert(Player), [{"name": n, "created_at": datetime.utcnow()} for n in chunk])
+        fetch(chunk)
+    return ids
+
+def _ensure_categories(db: Session, keys: t.Iterable[t.Tuple[int, str]]) -> t.Dict[t.Tuple[int, str], int]:
+    """Return (player_id, name) -> id for every category, inserting the missing ones in batches."""
+    keys = sorted(set(keys))
+    names = sorted({name for _, name in keys})
+    ids: t.Dict[t.Tuple[int, str], int] = {}
+
+    def fetch(chunk):
+        player_ids = sorted({pid for pid, _ in chunk})
+        rows = db.execute(
+            select(Category.player_id, Category.name, Category.id)
+            .where(Category.player_id.in_(player_ids), Category.name.in_(names))
+        )
+        ids.update({(pid, name): cid for pid, name, cid in rows})
+
+    for chunk in _chunks(keys):
+        fetch(chunk)
+    missing = [k for k in keys if k not in ids]
+    for chunk in _chunks(missing):
+        db.execute(insert(Category), [{"player_id": pid, "name": name, "created_at": datetime.utcnow()} for pid, name in chunk])
+        fetch(chunk)
+    return ids
+
+def _upsert_ranges(db: Session, rows: t.List[t.Dict[str, t.Any]]) -> None:
+    """Insert or update ranges on the (player, category, position, name) key using executemany batches."""
+    table = RangeModel.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["player_id", "category_id", "position", "name"],
+            set_={"range_data": stmt.excluded.range_data, "updated_at": stmt.excluded.updated_at},
+        )
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_duplicate_key_update(range_data=stmt.inserted.range_data, updated_at=stmt.inserted.updated_at)
+    else:
+        # no native upsert: split into bulk UPDATE by primary key and bulk INSERT
+        for chunk in _chunks(rows):
+            existing = {
+                (pid, cid, pos, name): rid
+                for rid, pid, cid, pos, name in db.execute(
+                    select(RangeModel.id, RangeModel.player_id, RangeModel.category_id, RangeModel.position, RangeModel.name)
+                    .where(
+                        RangeModel.player_id.in_(list({r["player_id"] for r in chunk})),
+                        RangeModel.category_id.in_(list({r["category_id"] for r in chunk})),
+                        RangeModel.name.in_(list({r["name"] for r in chunk})),
+                    )
+                )
+            }
+            updates, inserts = [], []
+            for r in chunk:
+                rid = existing.get((r["player_id"], r["category_id"], r["position"], r["name"]))
+                if rid is None:
+                    inserts.append(r)
+                else:
+                    updates.append({"id": rid, "range_data": r["range_data"], "updated_at": r["updated_at"]})
+            if updates:
+                db.execute(update(RangeModel), updates)
+            if inserts:
+                db.execute(insert(RangeModel), inserts)
+        return
+    for chunk in _chunks(rows):
+        db.execute(stmt, chunk)
+
+@app.post("/ranges/bulk")
+def bulk_save_ranges(payload: RangeBulk, db: Session = Depends(get_db)):
+    # the last occurrence of a key wins, as with repeated /ranges/save calls
+    latest: t.Dict[t.Tuple[str, str, str, str], RangeCreate] = {}
+    for r in payload.ranges:
+        latest[(r.player, r.category, r.position, r.name)] = r
+    if not latest:
+        return {"status": "ok", "upserted": 0}
+
+    player_ids = _ensure_players(db, (r.player for r in latest.values()))
+    category_ids = _ensure_categories(db, ((player_ids[r.player], r.category) for r in latest.values()))
+    now = datetime.utcnow()
+    rows = []
+    for r in latest.values():
+        player_id = player_ids[r.player]
+        rows.append({
+            "player_id": player_id,
+            "category_id": category_ids[(player_id, r.category)],
+            "position": r.position,
+            "name": r.name,
+            "range_data": encode_card_range(r.cardRange),
+            "created_at": now,
+            "updated_at": now,
         })
-    return {"ranges": out}
+    _upsert_ranges(db, rows)
+    db.commit()
+    for name in player_ids:
+        response_cache.invalidate(name)
+    return {"status": "ok", "upserted": len(rows)}
+
+@app.get("/ranges/export")
+def export_ranges(request: Request, player: t.Optional[str] = None, category: t.Optional[str] = None, position: t.Optional[str] = None):
+    stmt = (
+        select(
+            RangeModel.id,
+            Player.name.label("player"),
+            Category.name.label("category"),
+            RangeModel.position,
+            RangeModel.name,
+            RangeModel.range_data,
+            RangeModel.created_at,
+            RangeModel.updated_at,
+        )
+        .join(Player, RangeModel.player_id == Player.id)
+        .join(Category, RangeModel.category_id == Category.id)
+        .order_by(RangeModel.id)
+    )
+    if player:
+        stmt = stmt.where(Player.name == player)
+    if category:
+        stmt = stmt.where(Category.name == category)
+    if position:
+        stmt = stmt.where(RangeModel.position == position)
+
+    def lines():
+        # own session: the stream outlives the request-scoped one from get_db
+        db = SessionLocal()
+        try:
+            for r in db.execute(stmt.execution_options(yield_per=BULK_BATCH_SIZE)):
+                yield json.dumps({
+                    "id": r.id,
+                    "player": r.player,
+                    "category": r.category,
+                    "position": r.position,
+                    "name": r.name,
+                    "cardRange": card_range_for(request, r.range_data),
+                    "created_at": r.created_at.isoformat() if r.created_at else None,
+                    "updated_at": r.updated_at.isoformat() if r.updated_at else None,
+                }) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 @app.delete("/ranges/delete")
 def delete_range(range_data: RangeCreate, db: Session = Depends(get_db)):
@@ -270,4 +594,41 @@ def delete_range(range_data: RangeCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="range not found")
     db.delete(r)
     db.commit()
-    return {"status": "deleted"}
\ No newline at end of file
+    response_cache.invalidate(player_row.name)
+    return {"status": "deleted"}
+
+# Hand histories: parsing runs in the ingestor's process pool, the response only carries the job
+@app.post("/hands/upload", status_code=202)
+async def upload_hands(files: t.List[UploadFile] = File(...), hero: t.Optional[str] = None):
+    job = ingestor.new_job()
+    for f in files:
+        content = (await f.read()).decode("utf-8-sig", errors="replace")
+        job.files += 1
+        ingestor.submit(job, await run_in_threadpool(split_hands, content), hero)
+    ingestor.finish(job)
+    return job.to_dict()
+
+@app.post("/hands/ingest", status_code=202)
+async def ingest_hands(request: Request, hero: t.Optional[str] = None):
+    # raw hand-history text streamed as the request body
+    job = ingestor.new_job()
+    job.files = 1
+    await ingestor.ingest_stream(job, request.stream(), hero)
+    ingestor.finish(job)
+    return job.to_dict()
+
+@app.get("/hands/jobs/{job_id}")
+def ingest_status(job_id: str):
+    job = ingestor.jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job.to_dict()
+
+# HUD: running per-player stats, pushed over the websocket as hands arrive
+@app.websocket("/hud/ws")
+async def hud_ws(websocket: WebSocket, players: t.Optional[str] = None):
+    await hud.serve(websocket, set(players.split(",")) if players else None)
+
+@app.get("/hud/stats")
+def hud_stats(players: t.Optional[str] = None):
+    return hud.snapshot(players.split(",") if players else None)
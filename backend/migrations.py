@@ -0,0 +1,76 @@
+"""
+Schema migrations for the range backend.
+
+migrate() is idempotent and runs at startup. It creates missing tables, moves
+rows out of the legacy denormalized ``ranges`` table (player and category kept
+as strings) into players/categories/ranges, and creates indexes that databases
+built by older versions are missing. The legacy rows are kept in
+``ranges_legacy`` after being copied.
+"""
+
+import json
+import typing as t
+
+from sqlalchemy import MetaData, Table, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .models import Base, Category, Player, Range
+
+LEGACY_TABLE = "ranges_legacy"
+
+
+def _migrate_legacy_ranges(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE ranges RENAME TO {LEGACY_TABLE}"))
+    Base.metadata.create_all(bind=engine)
+    legacy = Table(LEGACY_TABLE, MetaData(), autoload_with=engine)
+
+    with Session(engine) as db:
+        # the legacy table had no unique key: keep the most recent row per key
+        latest: t.Dict[t.Tuple[str, str, str, str], t.Any] = {}
+        for row in db.execute(select(legacy)).mappings():
+            key = (row["player"], row["category"], row["position"], row["name"])
+            if key not in latest or (row["updated_at"] or row["created_at"]) >= (latest[key]["updated_at"] or latest[key]["created_at"]):
+                latest[key] = row
+
+        players: t.Dict[str, Player] = {}
+        categories: t.Dict[t.Tuple[str, str], Category] = {}
+        for (player, category, position, name), row in latest.items():
+            if player not in players:
+                players[player] = Player(name=player)
+                db.add(players[player])
+            if (player, category) not in categories:
+                categories[(player, category)] = Category(player=players[player], name=category)
+                db.add(categories[(player, category)])
+            data = row["range_data"]
+            if isinstance(data, str):
+                data = json.loads(data)
+            r = Range(
+                player_rel=players[player],
+                category_rel=categories[(player, category)],
+                position=position,
+                name=name,
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+            )
+            r.card_range = data
+            db.add(r)
+        db.commit()
+
+
+def migrate(engine: Engine) -> None:
+    inspector = inspect(engine)
+    if "ranges" in inspector.get_table_names():
+        columns = {c["name"] for c in inspector.get_columns("ranges")}
+        if "player_id" not in columns and "player" in columns:
+            _migrate_legacy_ranges(engine)
+
+    Base.metadata.create_all(bind=engine)
+    # create_all only builds indexes together with new tables
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
@@ -1,36 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, func, Text
-from sqlalchemy.ext.declarative import declarative_base
-Base = declarative_base()
-
-class Range(Base):
-    __tablename__ = "ranges"
-
-    id = Column(Integer, primary_key=True, index=True)
-    # Specify length for VARCHAR columns (MySQL requires a length)
-    player = Column(String(100), nullable=False, index=True)
-    category = Column(String(100), nullable=False, index=True)
-    position = Column(String(50), nullable=False, index=True)
-    name = Column(String(150), nullable=False, index=True)
-
-    # If using MySQL 5.7+ you can use JSON; otherwise use Text and serialize manually
-    try:
-        range_data = Column(JSON, nullable=False)
-    except Exception:
-        range_data = Column(Text, nullable=False)
-
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
-
-from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, JSON, DateTime, Float, ForeignKey, Index, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
+from .encoding import decode_card_range, encode_card_range
+
 Base = declarative_base()
 
 class Player(Base):
     __tablename__ = "players"
     id = Column(Integer, primary_key=True)
+    # the unique index doubles as the lookup index for Player.name == ...
     name = Column(String(200), unique=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -47,6 +27,7 @@ class Category(Base):
     player = relationship("Player", back_populates="categories")
     ranges = relationship("Range", back_populates="category_rel", cascade="all, delete-orphan")
 
+    # (player_id, name) serves both the per-player listing ordered by name and the name lookup
     __table_args__ = (UniqueConstraint("player_id", "name", name="_player_category_uc"),)
 
 class Range(Base):
@@ -63,4 +44,76 @@ class Range(Base):
     player_rel = relationship("Player", back_populates="ranges")
     category_rel = relationship("Category", back_populates="ranges")
 
-    __table_args__ = (UniqueConstraint("player_id", "category_id", "position", "name", name="_range_unique_uc"),)
\ No newline at end of file
+    __table_args__ = (
+        # exact-match key used by /ranges/load, /ranges/save and the bulk upsert
+        UniqueConstraint("player_id", "category_id", "position", "name", name="_range_unique_uc"),
+        # covering index for /names (player, category, position -> name ordered, updated_at)
+        # and, through its player_id prefix, for /ranges/tree
+        Index("ix_ranges_player_category_position_name", "player_id", "category_id", "position", "name", "updated_at"),
+        # join/cascade path from categories
+        Index("ix_ranges_category_id", "category_id"),
+    )
+
+    # range_data holds the cardRange with pairActions packed (see encoding.py); older plain rows still decode
+    @property
+    def card_range(self):
+        return decode_card_range(self.range_data)
+
+    @card_range.setter
+    def card_range(self, value):
+        self.range_data = encode_card_range(value)
+
+
+# Hand histories ingested through /hands (see ingest.py)
+class HandRecord(Base):
+    __tablename__ = "hands"
+    # site hand id, e.g. "257430875516"
+    id = Column(String(32), primary_key=True)
+    site = Column(String(32), nullable=False, default="PokerStars")
+    table_name = Column(String(200))
+    hero = Column(String(200))
+    game_type = Column(String(16))
+    date = Column(DateTime)
+    button_seat = Column(Integer)
+    pot = Column(Float)
+    rake = Column(Float)
+    board = Column(String(20))
+    raw_text = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    players = relationship("HandPlayer", back_populates="hand", cascade="all, delete-orphan")
+    actions = relationship("HandAction", back_populates="hand", cascade="all, delete-orphan", order_by="HandAction.seq")
+
+    __table_args__ = (Index("ix_hands_hero_date", "hero", "date"),)
+
+class HandPlayer(Base):
+    __tablename__ = "hand_players"
+    id = Column(Integer, primary_key=True)
+    hand_id = Column(String(32), ForeignKey("hands.id"), nullable=False)
+    seat = Column(Integer)
+    name = Column(String(200), nullable=False)
+    stack = Column(Float)
+    cards = Column(String(8))
+    net = Column(Float)
+
+    hand = relationship("HandRecord", back_populates="players")
+
+    __table_args__ = (
+        UniqueConstraint("hand_id", "name", name="_hand_player_uc"),
+        Index("ix_hand_players_name_hand", "name", "hand_id"),
+    )
+
+class HandAction(Base):
+    __tablename__ = "hand_actions"
+    id = Column(Integer, primary_key=True)
+    hand_id = Column(String(32), ForeignKey("hands.id"), nullable=False)
+    # order of the action within the hand
+    seq = Column(Integer, nullable=False)
+    street = Column(String(16), nullable=False)
+    player = Column(String(200), nullable=False)
+    action = Column(String(16), nullable=False)
+    amount = Column(Float, default=0.0)
+
+    hand = relationship("HandRecord", back_populates="actions")
+
+    __table_args__ = (UniqueConstraint("hand_id", "seq", name="_hand_action_seq_uc"),)
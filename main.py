@@ -1,4 +1,5 @@
-from pypokerstar.src.game.poker import Game, Player
+from pypokerstar.src.game.poker import Player
+from pypokerstar.src.game.simulation import Game
 
 player1 = Player(name="Pablo", pot=100)
 player2 = Player(name="Juan", pot=100)
@@ -6,3 +7,10 @@ player2 = Player(name="Juan", pot=100)
 game = Game(player1, player2)
 
 game.pre_flop()
+game.flop()
+game.turn()
+game.river()
+hand = game.showdown()
+
+print(hand)
+print(hand.result)
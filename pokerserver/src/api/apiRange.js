@@ -29,10 +29,13 @@ export async function loadRange({ player = "default", category = "Ranges", posit
     return handleResponse(res); // expected to return the stored cardRange object
 }
 
-export async function listRanges({ player = "default", category = "Ranges", position } = {}) {
+export async function listRanges({ player = "default", category = "Ranges", position, includeData = true, limit, cursor } = {}) {
     try {
     const params = new URLSearchParams({ player, category });
     if (position) params.set("position", position);
+    if (!includeData) params.set("include_data", "false");
+    if (limit) params.set("limit", limit);
+    if (cursor !== undefined && cursor !== null) params.set("cursor", cursor);
     const url = `${API_BASE}/ranges/list?${params.toString()}`;
     const res = await fetch(url, { method: "GET" });
     return handleResponse(res);
@@ -121,4 +124,29 @@ export async function getTree(player = null) {
     const url = `${API_BASE}/ranges/tree${params}`;
     const res = await fetch(url, { method: "GET" });
     return handleResponse(res);
-}
\ No newline at end of file
+}
+export async function bulkSaveRanges(ranges) {
+    const url = `${API_BASE}/ranges/bulk`;
+    const res = await fetch(url, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ ranges }),
+    });
+    return handleResponse(res);
+}
+
+export async function exportRanges({ player, category, position } = {}) {
+    const params = new URLSearchParams();
+    if (player) params.set("player", player);
+    if (category) params.set("category", category);
+    if (position) params.set("position", position);
+    const url = `${API_BASE}/ranges/export?${params.toString()}`;
+    const res = await fetch(url, { method: "GET" });
+    if (!res.ok) {
+        const text = await res.text();
+        throw new Error(`API error ${res.status}: ${text}`);
+    }
+    // NDJSON: one range per line
+    const text = await res.text();
+    return text.split("\n").filter(line => line.trim() !== "").map(line => JSON.parse(line));
+}
@@ -1,7 +1,17 @@
 from .src.game.poker import Player, Hand, History
+from .src.game.simulation import Game, SimulationResult, simulate
+from .src.game.evaluator import Evaluator, PhEvaluator, get_evaluator
+from .src.game.texture import board_textures, texture_features
 from .src.parsers.pokerstars import PokerStarsParser
-from .src.metrics.metrics import VPIP, PFR, WTSD, WSD, StatsMetric
+from .src.parsers.index import HandIndex
+from .src.parsers.watcher import HandHistoryWatcher
+from .src.tools.profiles import OpponentProfile, ProfileStore
+from .src.tools.sessions import Session, SessionTracker
+from .src.tools.filters import Filter, HandFilterIndex
+from .src.tools.playerstats import PlayerHandIndex, PlayerStats
+from .src.metrics.metrics import VPIP, PFR, WTSD, WSD, StatsMetric, MetricDefinition, MetricsRegistry, evaluate_metrics, with_intervals, PopulationBaseline
 from .src.types.cards import Card, Pair, Deck
+from .src.types.rng import make_rng, spawn_rngs
 
 __version__ = "0.1.0"
 __author__ = "Minue"
@@ -0,0 +1,141 @@
+"""
+Hand strength evaluation on integer cards.
+
+Cards are card numbers (cards.card_index, 0-51) everywhere, so callers never
+convert Card objects to strings to rank a hand. Ranks follow the
+phevaluator scale: 1 (royal flush) to 7462 (seven high), smaller is
+stronger. An Evaluator ranks one hand, a whole NumPy array of 5, 6 or 7 card
+hands at once, or every one of the 1326 hole card combos on a board; board
+results are memoized, as equity and showdown analysis keep coming back to
+the same boards.
+
+Backends register in EVALUATORS; phevaluator is the reference one.
+
+Classes:
+    Evaluator: Base evaluator with the bulk and board APIs and the board memo
+    PhEvaluator: phevaluator backend
+"""
+
+import typing as t
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    # the native functions, without the per card id conversion of the public wrappers
+    from phevaluator import _pheval as _phevaluator
+except ImportError:  # pragma: no cover
+    import phevaluator as _phevaluator
+
+MAX_RANK = 7462
+# hand categories, best first, and the highest (weakest) rank of each
+CATEGORIES = (
+    "straight flush", "four of a kind", "full house", "flush", "straight",
+    "three of a kind", "two pair", "pair", "high card",
+)
+CATEGORY_LIMITS = np.array([10, 166, 322, 1599, 1609, 2467, 3325, 6185, 7462], dtype=np.int32)
+
+# card_index -> phevaluator id (ranks 2..A major, suits c, d, h, s minor)
+_PHEVAL_SUITS = (3, 0, 2, 1)
+PHEVAL_IDS = np.array([(12 - card // 4) * 4 + _PHEVAL_SUITS[card % 4] for card in range(52)], dtype=np.int64)
+_PHEVAL_ID_LIST: list[int] = PHEVAL_IDS.tolist()
+
+# the two card numbers of each of the 1326 combos, in cards.COMBO_INDEX order
+COMBO_CARDS = np.array([(lo, hi) for hi in range(52) for lo in range(hi)], dtype=np.int64)
+
+
+def hand_category(ranks: t.Union[int, np.ndarray]) -> t.Union[int, np.ndarray]:
+    """Index in CATEGORIES of one rank or of an array of ranks."""
+    return np.searchsorted(CATEGORY_LIMITS, ranks)
+
+
+class Evaluator(ABC):
+    """
+    Ranks poker hands given as card numbers.
+
+    Subclasses implement evaluate_many; evaluate and board_ranks are built on
+    it. board_ranks results are kept in a least recently used memo.
+
+    Attributes:
+        name (str): Backend name
+        memo_size (int): Boards kept in the memo
+
+    Methods:
+        evaluate: Rank of one hand of 5 to 7 cards
+        evaluate_many: Ranks of an (n, 5 to 7) array of hands
+        board_ranks: Rank of every hole card combo on a 5 card board (cached)
+    """
+    name = "base"
+
+    def __init__(self, memo_size: int = 4096) -> None:
+        self.memo_size = memo_size
+        self._boards: "OrderedDict[tuple[int, ...], np.ndarray]" = OrderedDict()
+
+    def evaluate(self, cards: t.Sequence[int]) -> int:
+        return int(self.evaluate_many(np.asarray([cards]))[0])
+
+    @abstractmethod
+    def evaluate_many(self, hands: np.ndarray) -> np.ndarray:
+        pass
+
+    def board_ranks(self, board: t.Sequence[int]) -> np.ndarray:
+        """
+        Ranks of the 1326 combos (cards.COMBO_INDEX order) with a 5 card board;
+        combos holding a board card get MAX_RANK + 1. The array is shared with
+        the memo and must not be modified.
+        """
+        key = tuple(sorted(board))
+        ranks = self._boards.get(key)
+        if ranks is not None:
+            self._boards.move_to_end(key)
+            return ranks
+        if len(key) != 5:
+            raise ValueError(f"A board must have 5 cards. Given: {len(key)}")
+        ranks = np.full(len(COMBO_CARDS), MAX_RANK + 1, dtype=np.int32)
+        free = ~np.isin(COMBO_CARDS, key).any(axis=1)
+        hands = np.hstack([COMBO_CARDS[free], np.broadcast_to(np.asarray(key), (int(free.sum()), 5))])
+        ranks[free] = self.evaluate_many(hands)
+        ranks.flags.writeable = False
+        self._boards[key] = ranks
+        if len(self._boards) > self.memo_size:
+            self._boards.popitem(last=False)
+        return ranks
+
+    def clear(self) -> None:
+        self._boards.clear()
+
+
+class PhEvaluator(Evaluator):
+    """phevaluator backend: the native 5, 6 and 7 card functions mapped over the columns of the hands."""
+    name = "phevaluator"
+
+    FUNCTIONS = {
+        5: _phevaluator.evaluate_5cards,
+        6: _phevaluator.evaluate_6cards,
+        7: _phevaluator.evaluate_7cards,
+    }
+
+    def evaluate(self, cards: t.Sequence[int]) -> int:
+        ids = _PHEVAL_ID_LIST
+        return self.FUNCTIONS[len(cards)](*[ids[card] for card in cards])
+
+    def evaluate_many(self, hands: np.ndarray) -> np.ndarray:
+        hands = np.asarray(hands)
+        if hands.ndim != 2 or hands.shape[1] not in self.FUNCTIONS:
+            raise ValueError(f"Hands must be an (n, 5 to 7) array of card numbers. Given shape: {hands.shape}")
+        columns = PHEVAL_IDS[hands].T.tolist()
+        return np.fromiter(map(self.FUNCTIONS[hands.shape[1]], *columns), dtype=np.int32, count=len(hands))
+
+
+EVALUATORS: dict[str, type[Evaluator]] = {PhEvaluator.name: PhEvaluator}
+_shared: dict[str, Evaluator] = {}
+
+
+def get_evaluator(name: str = PhEvaluator.name) -> Evaluator:
+    """Shared instance of a registered backend, so its board memo is reused."""
+    if name not in EVALUATORS:
+        raise ValueError(f"Evaluator must be one of {list(EVALUATORS)}. Given: {name}")
+    if name not in _shared:
+        _shared[name] = EVALUATORS[name]()
+    return _shared[name]
@@ -0,0 +1,151 @@
+"""
+Action-sequence (line) classification.
+
+Every player of a hand is tagged with the lines they took, as bits of a
+``Line`` flag: raise first in, limp, 3bet, 4bet, c-bet, donk bet, check-raise,
+folds to 3bets and c-bets, and the matching opportunities so frequencies can
+be computed as flag / opportunity. The classifier walks the bets of a hand
+once, keeping only the raise count, the preflop aggressor and per street who
+checked, so the cost is linear in the number of actions.
+
+Classes:
+    Line: IntFlag of the line codes
+"""
+
+import enum
+import typing as t
+
+import polars as pl
+
+if t.TYPE_CHECKING:
+    from pypokerstar.src.game.poker import Hand
+
+VOLUNTARY = ("calls", "bets", "raises")
+POSTFLOP = ("flop", "turn", "river")
+
+
+class Line(enum.IntFlag):
+    NONE = 0
+    # preflop
+    LIMP = 1 << 0
+    RFI = 1 << 1  # raise first in: open raise with no limpers before
+    COLD_CALL = 1 << 2  # call of a raise without money voluntarily in before
+    THREE_BET = 1 << 3
+    FOUR_BET = 1 << 4  # 4bet or higher
+    FACED_3BET = 1 << 5  # opened and was 3bet
+    FOLD_TO_3BET = 1 << 6
+    # flop
+    CBET_OPP = 1 << 7  # preflop aggressor acting on an unbet flop
+    CBET = 1 << 8
+    FACED_CBET = 1 << 9
+    FOLD_TO_CBET = 1 << 10
+    DONK = 1 << 11  # flop bet into the preflop aggressor
+    # any postflop street
+    CHECK_RAISE = 1 << 12
+
+
+# stat name -> (line, opportunity); a None opportunity means per hand dealt
+LINE_STATS: dict[str, tuple[Line, t.Optional[Line]]] = {
+    "rfi": (Line.RFI, None),
+    "limp": (Line.LIMP, None),
+    "cold_call": (Line.COLD_CALL, None),
+    "4bet": (Line.FOUR_BET, None),
+    "fold_to_3bet": (Line.FOLD_TO_3BET, Line.FACED_3BET),
+    "cbet": (Line.CBET, Line.CBET_OPP),
+    "fold_to_cbet": (Line.FOLD_TO_CBET, Line.FACED_CBET),
+    "donk": (Line.DONK, None),
+    "check_raise": (Line.CHECK_RAISE, None),
+}
+
+
+def classify_lines(hand: "Hand") -> dict[str, Line]:
+    """Return player_name -> Line flags for a hand, in one pass over its bets."""
+    lines: dict[str, Line] = {p.name: Line.NONE for p in hand.players if p is not None}
+    raises = 0
+    opener: t.Optional[str] = None
+    aggressor: t.Optional[str] = None
+    entered: set[str] = set()
+    for rnd in hand.rounds:
+        street = rnd.name.lower()
+        if street == "hole cards":
+            for bet in rnd.bets:
+                name = getattr(bet.player, "name", None)
+                if name not in lines:
+                    continue
+                if bet.type == "calls":
+                    if raises == 0:
+                        lines[name] |= Line.LIMP
+                    elif name not in entered:
+                        lines[name] |= Line.COLD_CALL
+                elif bet.type == "raises":
+                    if raises == 0:
+                        if not entered:
+                            lines[name] |= Line.RFI
+                        opener = name
+                    elif raises == 1:
+                        lines[name] |= Line.THREE_BET
+                        if opener is not None and opener != name:
+                            lines[opener] |= Line.FACED_3BET
+                    else:
+                        lines[name] |= Line.FOUR_BET
+                    raises += 1
+                    aggressor = name
+                elif bet.type == "folds" and name == opener and raises == 2:
+                    lines[name] |= Line.FOLD_TO_3BET
+                if bet.type in VOLUNTARY:
+                    entered.add(name)
+        elif street in POSTFLOP:
+            bettor: t.Optional[str] = None
+            checked: set[str] = set()
+            # flop: whether the aggressor acted yet, whether they c-bet, and who answered the c-bet;
+            # players who checked before the c-bet still face it
+            aggressor_acted = False
+            cbet = False
+            responded: set[str] = set()
+            for bet in rnd.bets:
+                name = getattr(bet.player, "name", None)
+                if name not in lines:
+                    continue
+                if street == "flop":
+                    if name == aggressor:
+                        if not aggressor_acted and bettor is None:
+                            lines[name] |= Line.CBET_OPP
+                            if bet.type == "bets":
+                                lines[name] |= Line.CBET
+                                cbet = True
+                        aggressor_acted = True
+                    elif cbet and name not in responded:
+                        lines[name] |= Line.FACED_CBET
+                        if bet.type == "folds":
+                            lines[name] |= Line.FOLD_TO_CBET
+                        responded.add(name)
+                    elif bet.type == "bets" and bettor is None and aggressor in lines and not aggressor_acted:
+                        lines[name] |= Line.DONK
+                if bet.type == "checks":
+                    checked.add(name)
+                elif bet.type == "raises" and name in checked:
+                    lines[name] |= Line.CHECK_RAISE
+                if bet.type == "bets" and bettor is None:
+                    bettor = name
+    return lines
+
+
+def has_line(line: Line, column: str = "line") -> pl.Expr:
+    """Boolean expression: the integer line column contains the flag."""
+    return (pl.col(column) & int(line)) != 0
+
+
+def line_frequencies(stats: pl.DataFrame, by: t.Union[str, list[str]] = "player") -> pl.DataFrame:
+    """
+    Frequency of each LINE_STATS entry per group of a get_main_stats frame,
+    with the number of opportunities it was computed over.
+    """
+    aggregations = [pl.len().alias("hands")]
+    for name, (line, opportunity) in LINE_STATS.items():
+        if opportunity is None:
+            aggregations.append(has_line(line).mean().alias(name))
+        else:
+            opportunities = has_line(opportunity).sum()
+            aggregations.append((has_line(line).sum() / opportunities).alias(name))
+            aggregations.append(opportunities.alias(f"{name}_opp"))
+    return stats.group_by(by, maintain_order=True).agg(aggregations)
@@ -14,29 +14,41 @@ Classes:
 """
 
 import datetime
-import random
 import typing as t
-import phevaluator
-import copy
 import collections
 from collections import defaultdict, Counter
 from rich.progress import Progress
-from functools import cache
+import numpy as np
 import polars as pl
 import uuid
 import os
+import re
 
 
+from pypokerstar.src.game.lines import classify_lines
+from pypokerstar.src.game.texture import board_textures
 from pypokerstar.src.types import Card, Deck, Range
-
-SEATS = {
-    1: "button",
-    2: "small blind",
-    3: "big blind",
-    4: "under the gun",
-    5: "middle position",
-    6: "cutoff",
+from pypokerstar.src.game.evaluator import Evaluator, get_evaluator
+from pypokerstar.src.types.cards import HAND_CLASSES, card_index, hand_class_index
+from pypokerstar.src.types.rng import Seed, make_rng
+
+# Position labels from the button clockwise, by number of players dealt in
+POSITIONS_BY_SIZE = {
+    2: ("BTN", "BB"),
+    3: ("BTN", "SB", "BB"),
+    4: ("BTN", "SB", "BB", "CO"),
+    5: ("BTN", "SB", "BB", "UTG", "CO"),
+    6: ("BTN", "SB", "BB", "UTG", "MP", "CO"),
+    7: ("BTN", "SB", "BB", "UTG", "MP", "HJ", "CO"),
+    8: ("BTN", "SB", "BB", "UTG", "UTG+1", "MP", "HJ", "CO"),
+    9: ("BTN", "SB", "BB", "UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO"),
 }
+# Preflop acting order, used as the categories of the position column
+POSITIONS = ("UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO", "BTN", "SB", "BB")
+BUTTON_PATTERN = re.compile(r"Seat #(\d+) is the button")
+TABLE_PATTERN = re.compile(r"Table '([^']+)'")
+# stakes in the header line: "(€0.01/€0.02)" for cash games, "Level I (10/20)" for tournaments
+STAKES_PATTERN = re.compile(r"\(\D*?(\d+(?:\.\d+)?)/\D*?(\d+(?:\.\d+)?)\)")
 
 ROUNDS = {
     "table": 0,
@@ -57,13 +69,10 @@ def rank_str(n: int) -> str:
 
 
 def pair_notation(c1, c2) -> str:
+    """Hand class of two cards as in HAND_CLASSES ("AKs", "T9o", "22"), ace high."""
     if c1 is None or c2 is None:
         return None
-    a, b = (c1, c2) if c1.number >= c2.number else (c2, c1)
-    if a.number == b.number:
-        return f"{rank_str(a.number)}{rank_str(b.number)}"
-    suited = "s" if a.suit == b.suit else "o"
-    return f"{rank_str(a.number)}{rank_str(b.number)}{suited}"
+    return HAND_CLASSES[hand_class_index(c1, c2)]
 
 
 def get_player_bets_for(hand: "Hand", player: "Player") -> list:
@@ -75,7 +84,6 @@ def get_player_bets_for(hand: "Hand", player: "Player") -> list:
     return bets
 
 
-per_hand_rows = []
 pos_range: dict[t.Any, dict[str, collections.Counter]] = {}
 vpip_count = 0
 pfr_count = 0
@@ -95,17 +103,106 @@ def build_player_bets_map(hand: "Hand") -> dict[str, list[tuple[str, "Bet"]]]:
     return bets_map
 
 
-per_player_stats: dict[str, dict] = defaultdict(lambda: {
-    "hands": 0,
-    "vpip": 0,
-    "pfr": 0,
-    "3bet": 0,
-    "invested": 0.0,
-    "collected": 0.0,
-    "showdown_seen": 0,
-    "pos_ranges": defaultdict(lambda: {"openers": Counter(), "callers": Counter(), "3bet": Counter(), "total_seen": 0}),
-})
-per_hand_rows = []
+def player_hand_stats(hand: "Hand") -> dict[str, dict[str, t.Any]]:
+    """
+    Per player flags and money flow of a single hand, in one pass over its bets.
+
+    Returns player_name -> {vpip, pfr, 3bet, invested, collected, showdown_cards,
+    winner, wtsd, w$sd}. A 3bet is a player's first preflop raise made after
+    somebody else already raised.
+    """
+    stats: dict[str, dict[str, t.Any]] = {
+        p.name: {"vpip": False, "pfr": False, "3bet": False, "invested": 0.0, "collected": 0.0}
+        for p in hand.players
+        if p is not None
+    }
+    raises = 0
+    folded: set[str] = set()
+    for rnd in hand.rounds:
+        preflop = rnd.name.lower() == "hole cards"
+        for bet in rnd.bets:
+            row = stats.get(getattr(bet.player, "name", None))
+            if row is None:
+                continue
+            if bet.type == "collected":
+                row["collected"] += bet.amount
+            elif bet.type == "folds":
+                folded.add(bet.player.name)
+            else:
+                row["invested"] += bet.amount
+            if preflop and bet.type in ("calls", "bets", "raises"):
+                row["vpip"] = True
+                if bet.type == "raises":
+                    if not row["pfr"] and raises > 0:
+                        row["3bet"] = True
+                    row["pfr"] = True
+                    raises += 1
+    winners = {w.name for w in hand.winner}
+    showdown = hand.get_round("show down") is not None
+    for p in hand.players:
+        if p is None:
+            continue
+        row = stats[p.name]
+        c = getattr(p, "cards", None)
+        row["showdown_cards"] = pair_notation(c[0], c[1]) if isinstance(c, (list, tuple)) and len(c) >= 2 else None
+        row["winner"] = p.name in winners
+        # the hero's cards are always known: reaching showdown is what counts
+        row["wtsd"] = showdown and p.name not in folded and row["showdown_cards"] is not None
+        row["w$sd"] = row["collected"] > 0.0 and row["wtsd"]
+    return stats
+
+
+STAT_FLAGS = ("vpip", "pfr", "3bet", "wtsd", "w$sd")
+
+
+def bucket_aggregations() -> list[pl.Expr]:
+    """Aggregations of get_main_stats rows shared by the windowed stats of History."""
+    return [
+        pl.len().alias("hands"),
+        *[pl.col(flag).cast(pl.Float64).mean().alias(f"{flag}_rate") for flag in STAT_FLAGS],
+        pl.col("invested").sum(),
+        pl.col("collected").sum(),
+        (pl.col("collected") - pl.col("invested")).sum().alias("net"),
+    ]
+
+
+def resolve_positions(button_seat: t.Optional[int], seats: t.Iterable[int]) -> dict[int, str]:
+    """
+    Map occupied seats to position labels (BTN, SB, BB, UTG, ... CO), going
+    clockwise from the button. With a dead button (empty button seat) the
+    first player after it is the small blind.
+    """
+    seats = sorted(set(seats))
+    if button_seat is None or not 2 <= len(seats) <= len(POSITIONS):
+        return {}
+    modulo = max(seats[-1], button_seat) + 1
+    ordered = sorted(seats, key=lambda seat: (seat - button_seat) % modulo)
+    if button_seat in seats:
+        labels = POSITIONS_BY_SIZE[len(seats)]
+    elif len(seats) < len(POSITIONS):
+        labels = POSITIONS_BY_SIZE[len(seats) + 1][1:]
+    else:
+        return {}
+    return dict(zip(ordered, labels))
+
+
+def hand_table(hand: "Hand") -> str:
+    """Table name from the hand header (the text before the first *** section)."""
+    match = TABLE_PATTERN.search(hand.raw_text)
+    return match.group(1) if match else "unknown"
+
+
+def hand_big_blind(hand: "Hand") -> t.Optional[float]:
+    header = hand.raw_text.lstrip("\ufeff").split("\n", 1)[0]
+    match = STAKES_PATTERN.search(header)
+    return float(match.group(2)) if match else None
+
+
+def player_position(hand: "Hand", player: "Player") -> t.Optional[str]:
+    """Position label of a player in a hand, resolved from the button seat."""
+    return hand.positions.get(player.name)
+
+
 
 
 
@@ -221,7 +318,8 @@ class Round:
                 + name
             )
         self.name: str = name
-        self.players = players
+        # own list: the default is shared between every Round
+        self.players = list(players)
         self.bets: t.Iterable[Bet] = []
         self.pot: float = 0.0
         self.board: t.Iterable[Card] = []
@@ -249,36 +347,33 @@ class Round:
     def set_winner(self, player: "Player") -> None:
         self.winner.append(player)
 
-    def get_hero_equity(self, hero: Player, iterations: int) -> float:
-        deck = Deck()
-        for card in hero.cards + list(self.board):
-            deck.remove_cards(card)
-        wins = 0
+    def get_hero_equity(
+        self, hero: Player, iterations: int, rng: Seed = None, evaluator: t.Optional[Evaluator] = None
+    ) -> float:
+        """
+        Monte Carlo equity of hero against random hands of the active players
+        (ties count as wins); rng (a seed or Generator) makes it reproducible.
+        All runouts are dealt first and ranked in two bulk evaluations.
+        """
+        evaluator = evaluator or get_evaluator()
+        deck = Deck(rng=make_rng(rng))
+        deck.remove_cards(*hero.cards, *self.board)
+        hero_cards = [card_index(card) for card in hero.cards]
+        board = [card_index(card) for card in self.board]
+        opponents = sum(1 for player in self.active_players() if player != hero)
+        hero_hands, opponent_hands = [], []
         for _ in range(iterations):
-            deck.shuffle()
-            sim_deck = copy.deepcopy(deck)
-            sim_board = list(self.board)
-            while len(sim_board) < 5:
-                sim_board.append(sim_deck.draw())
-            hero_hand = hero.cards + sim_board
-            hero_score = phevaluator.evaluate_cards(
-                *[card.standard_string() for card in hero_hand]
-            )
-            is_winner = True
-            for player in self.active_players():
-                if player == hero:
-                    continue
-                opp_cards = [sim_deck.draw() for _ in range(2)]
-                opp_hand = opp_cards + sim_board
-                opp_score = phevaluator.evaluate_cards(
-                    *[card.standard_string() for card in opp_hand]
-                )
-                if opp_score < hero_score:
-                    is_winner = False
-                    break
-            if is_winner:
-                wins += 1
-        return wins / iterations
+            # dealt cards go back in the deck, the known cards stay out
+            deck.reset()
+            sim_board = board + deck.deal(5 - len(board))
+            hero_hands.append(hero_cards + sim_board)
+            for _ in range(opponents):
+                opponent_hands.append(deck.deal(2) + sim_board)
+        if not opponents:
+            return 1.0
+        hero_ranks = evaluator.evaluate_many(np.array(hero_hands))
+        best_opponent = evaluator.evaluate_many(np.array(opponent_hands)).reshape(iterations, opponents).min(axis=1)
+        return float((hero_ranks <= best_opponent).mean())
 
     def __str__(self) -> str:
         return self.name
@@ -311,6 +406,11 @@ class Hand:
         self.players = list(players)
 
         self.players_map: dict[str, Player] = {p.name: p for p in self.players}
+        button = BUTTON_PATTERN.search(raw_text or "")
+        self.button_seat: t.Optional[int] = int(button.group(1)) if button else None
+        by_seat = resolve_positions(self.button_seat, (p.seat for p in self.players))
+        # player name -> position label, resolved once per hand
+        self.positions: dict[str, str] = {p.name: by_seat[p.seat] for p in self.players if p.seat in by_seat}
         self.game_type: t.Literal["cash", "tournament"] = "cash"
         self.pot = pot
         self.rake = rake
@@ -488,11 +588,16 @@ class History:
         
     Methods:
         get_money_history: Returns DataFrame with financial results over time
+        get_main_stats: Returns DataFrame with one row per player and hand
+        get_bucket_stats: Per player stats per day, week, ... (cached per bucket)
+        get_last_hands_stats: Per player stats over their last N hands
+        get_rolling_stats: Per hand rolling rates over a window of hands
+        get_board_textures: Per hand flop, turn and river texture features
     """
     def __init__(
         self, hands: t.Iterable[Hand] = [], hero: t.Optional[Player] = None
     ) -> None:
-        self.hands: t.Iterable[Hand] = hands
+        self.hands: list[Hand] = list(hands)
         self.hero = hero
         if self.hero:
             self.hands = [
@@ -501,9 +606,21 @@ class History:
                 if hand.hero == hero and hand.game_type == "cash"
             ]
         self.main_stats: t.Optional[pl.DataFrame] = None
+        # get_main_stats frames per hero name and how many of self.hands they cover
+        self._stats_frames: dict[t.Optional[str], pl.DataFrame] = {}
+        self._stats_seen: dict[t.Optional[str], int] = {}
+        # (hero, every, player) -> (stats rows covered, bucket frame)
+        self._bucket_cache: dict[tuple, tuple[int, pl.DataFrame]] = {}
+        # board texture rows and how many of self.hands they cover
+        self._textures: t.Optional[pl.DataFrame] = None
+        self._textures_seen = 0
 
     def add_hand(self, hand: Hand) -> None:
+        # same filter as the constructor, so hands can be streamed in incrementally
+        if self.hero and not (hand.hero == self.hero and hand.game_type == "cash"):
+            return
         self.hands.append(hand)
+        self.main_stats = None
 
     def get_money_history(self) -> pl.DataFrame:
         if not self.hero:
@@ -560,125 +677,159 @@ class History:
         return df
     
 
-    @cache
-    def get_main_stats(self, hero: t.Optional[Player], force: bool = False) -> pl.DataFrame:
-        if self.main_stats is not None and not force:
+    def get_main_stats(self, hero: t.Optional[Player] = None, force: bool = False) -> pl.DataFrame:
+        """
+        One row per player and hand. Hands added since the last call are the
+        only ones processed; the rows of earlier hands are reused.
+        """
+        key = hero.name if hero else None
+        if force:
+            self._stats_frames.pop(key, None)
+            self._stats_seen.pop(key, None)
+        start = self._stats_seen.get(key, 0)
+        if key in self._stats_frames and start == len(self.hands):
+            self.main_stats = self._stats_frames[key]
             return self.main_stats
+        rows = []
         with Progress() as progress:
-            task = progress.add_task("[cyan]Processing hands...", total=len(self.hands))
-            hands = self.hands if not hero else [hand for hand in self.hands if hand.hero == hero]
+            hands = list(self.hands)[start:]
+            task = progress.add_task("[cyan]Processing hands...", total=len(hands))
+            hands = hands if not hero else [hand for hand in hands if hand.hero == hero]
             for hand in hands:
                 hand.refresh()
-                bets_map = build_player_bets_map(hand)
+                hand_stats = player_hand_stats(hand)
+                hand_lines = classify_lines(hand)
+                big_blind = hand_big_blind(hand)
 
                 # iterate canonical players present in the hand
                 for player_obj in hand.players:
                     if player_obj is None:
                         continue
                     name = player_obj.name
-                    stats = per_player_stats[name]
-                    stats["hands"] += 1
-
-                    # preflop bets for this player
-                    player_bets = [b for (rnd, b) in bets_map.get(name, []) if rnd == "hole cards"]
-
-                    # VPIP: voluntarily put money in pot preflop (calls/bets/raises) excluding forced posts
-                    did_vpip = any(b.type in ("calls", "bets", "raises") for b in player_bets)
-                    if did_vpip:
-                        stats["vpip"] += 1
-
-                    # PFR: raised preflop
-                    did_pfr = any(b.type == "raises" for b in player_bets)
-                    if did_pfr:
-                        stats["pfr"] += 1
-
-                    # detect 3bet: player raised and there was any earlier raise by another player in same preflop
-                    is_3bet = False
-                    preflop_bets = [b for (rnd, b) in bets_map.get(name, []) if rnd == "hole cards"]
-                    # build chronological list of all preflop bets
-                    all_preflop = [b for (rnd, b) in (x for x in [(r.name.lower(), bet) for r in hand.rounds for bet in r.bets] ) if b is not None]  # fallback, but we'll build below
-
-                    # safer: construct chronological preflop bets from hole round if present
-                    hole_round = hand.get_round("hole cards")
-                    all_preflop = hole_round.bets if hole_round else []
-                    for idx, b in enumerate(all_preflop):
-                        if b.player == player_obj and b.type == "raises":
-                            earlier_raises = any(
-                                all_preflop[i].type == "raises" and all_preflop[i].player != player_obj
-                                for i in range(0, idx)
-                            )
-                            if earlier_raises:
-                                is_3bet = True
-                            break
-                    if is_3bet:
-                        stats["3bet"] += 1
-
-                    # invested / collected (sum across rounds using bets_map)
-                    invested = sum(b.amount for lst in bets_map.get(name, []) for (_, b) in [(None, lst[1])] if b.type != "collected")  # simplified below
-
-                    # simpler correct calculation:
-                    invested = 0.0
-                    collected = 0.0
-                    for (_, b) in bets_map.get(name, []):
-                        if b.type == "collected":
-                            collected += b.amount
-                        else:
-                            invested += b.amount
-
-                    stats["invested"] += invested
-                    stats["collected"] += collected
-
-                    # showdown cards if available
-                    showdown_cards = None
-                    c = getattr(player_obj, "cards", None)
-                    if isinstance(c, (list, tuple)) and len(c) >= 2:
-                        showdown_cards = pair_notation(c[0], c[1])
-
-                    # position: prefer seat attribute, normalize to string key
-                    pos = getattr(player_obj, "seat", None)
-                    if pos is None:
-                        try:
-                            pos = next(i + 1 for i, p in enumerate(hand.players) if p.name == name)
-                        except StopIteration:
-                            pos = "unknown"
-                    pos_key = pos
-
-                    # record per-position showdown range usage
-                    if showdown_cards:
-                        stats["showdown_seen"] += 1
-                        pr = stats["pos_ranges"][pos_key]
-                        pr["total_seen"] += 1
-                        if is_3bet:
-                            pr["3bet"][showdown_cards] += 1
-                        elif did_pfr:
-                            # determine opener: first raise in the hole round
-                            preflop_raises = [b for b in (hole_round.bets if hole_round else []) if b.type == "raises"]
-                            if preflop_raises and preflop_raises[0].player == player_obj:
-                                pr["openers"][showdown_cards] += 1
-                            else:
-                                pr["openers"][showdown_cards] += 1
-                        elif did_vpip:
-                            pr["callers"][showdown_cards] += 1
-
-                    per_hand_rows.append({
+                    row = hand_stats[name]
+                    rows.append({
                         "player": name,
                         "hand_id": getattr(hand, "id", None),
                         "date": hand.date,
-                        "position": pos_key,
-                        "vpip": did_vpip,
-                        "pfr": did_pfr,
-                        "3bet": is_3bet,
-                        "invested": invested,
-                        "collected": collected,
-                        "showdown_cards": showdown_cards,
-                        "winner": any(w.name == name for w in hand.winner),
-                        "wtsd": showdown_cards is not None,
-                        "w$sd": collected > 0.0 and showdown_cards is not None,
+                        "big_blind": big_blind,
+                        "position": player_position(hand, player_obj),
+                        "vpip": row["vpip"],
+                        "pfr": row["pfr"],
+                        "3bet": row["3bet"],
+                        "invested": row["invested"],
+                        "collected": row["collected"],
+                        "showdown_cards": row["showdown_cards"],
+                        "winner": row["winner"],
+                        "wtsd": row["wtsd"],
+                        "w$sd": row["w$sd"],
+                        # Line flags, see lines.line_frequencies
+                        "line": int(hand_lines[name]),
                     })
                 progress.update(task, advance=1)
-                self.main_stats = pl.DataFrame(per_hand_rows)
-        return pl.DataFrame(per_hand_rows)
+        frame = pl.DataFrame(rows)
+        if rows:
+            frame = frame.with_columns(pl.col("position").cast(pl.Enum(POSITIONS)), pl.col("line").cast(pl.UInt16))
+        if key in self._stats_frames and rows:
+            frame = pl.concat([self._stats_frames[key], frame], how="vertical_relaxed")
+        elif key in self._stats_frames:
+            frame = self._stats_frames[key]
+        self._stats_frames[key] = frame
+        self._stats_seen[key] = len(self.hands)
+        self.main_stats = frame
+        return frame
+
+    def get_bucket_stats(
+        self, every: str = "1d", hero: t.Optional[Player] = None, player: t.Optional[str] = None
+    ) -> pl.DataFrame:
+        """
+        Per player stats aggregated over calendar buckets of `every` (a polars
+        duration such as "1h", "1d", "1w", "1mo"), from get_main_stats.
+
+        Bucket results are cached: after new hands are added only the buckets
+        from the earliest new hand onwards are recomputed.
+        """
+        stats = self.get_main_stats(hero=hero)
+        if stats.is_empty():
+            return stats
+        cache_key = (hero.name if hero else None, every, player)
+        cached = self._bucket_cache.get(cache_key)
+        if cached is not None and cached[0] == stats.height:
+            return cached[1]
+        if cached is not None:
+            # only rows appended since the cached result can move buckets
+            covered, previous = cached
+            new_rows = stats.slice(covered)
+            if player is not None:
+                new_rows = new_rows.filter(pl.col("player") == player)
+            if new_rows.is_empty():
+                self._bucket_cache[cache_key] = (stats.height, previous)
+                return previous
+            since = new_rows.select(pl.col("date").min().dt.truncate(every)).item()
+            stats = stats.filter(pl.col("date") >= since)
+            previous = previous.filter(pl.col("date") < since)
+        else:
+            previous = None
+        if player is not None:
+            stats = stats.filter(pl.col("player") == player)
+        buckets = (
+            stats.sort("date")
+            .group_by_dynamic("date", every=every, group_by="player")
+            .agg(bucket_aggregations())
+        )
+        if previous is not None:
+            buckets = pl.concat([previous, buckets], how="vertical_relaxed")
+        buckets = buckets.sort("player", "date")
+        self._bucket_cache[cache_key] = (self.get_main_stats(hero=hero).height, buckets)
+        return buckets
+
+    def get_last_hands_stats(
+        self, n: int = 1000, hero: t.Optional[Player] = None, player: t.Optional[str] = None
+    ) -> pl.DataFrame:
+        """Per player stats over each player's last `n` hands."""
+        stats = self.get_main_stats(hero=hero)
+        if stats.is_empty():
+            return stats
+        if player is not None:
+            stats = stats.filter(pl.col("player") == player)
+        return (
+            stats.sort("date")
+            .group_by("player", maintain_order=True)
+            .tail(n)
+            .group_by("player", maintain_order=True)
+            .agg([pl.col("date").min().alias("from"), pl.col("date").max().alias("to"), *bucket_aggregations()])
+        )
+
+    def get_rolling_stats(self, window: int = 100, player: t.Optional[str] = None, hero: t.Optional[Player] = None) -> pl.DataFrame:
+        """Per hand rows with the player's rates and net over the last `window` hands."""
+        stats = self.get_main_stats(hero=hero)
+        if stats.is_empty():
+            return stats
+        if player is not None:
+            stats = stats.filter(pl.col("player") == player)
+        net = pl.col("collected") - pl.col("invested")
+        return stats.sort("player", "date").with_columns(
+            [
+                *[
+                    pl.col(flag).cast(pl.Float64).rolling_mean(window, min_samples=1).over("player").alias(f"{flag}_rate")
+                    for flag in STAT_FLAGS
+                ],
+                net.rolling_sum(window, min_samples=1).over("player").alias("net_window"),
+            ]
+        )
 
+    def get_board_textures(self, force: bool = False) -> pl.DataFrame:
+        """
+        One row per hand with the texture features of its flop, turn and river
+        (see texture.board_textures), joinable with get_main_stats on hand_id.
+        Only hands added since the last call are computed.
+        """
+        if force or self._textures is None:
+            self._textures, self._textures_seen = None, 0
+        if self._textures is None or self._textures_seen < len(self.hands):
+            rows = board_textures(self.hands[self._textures_seen:])
+            self._textures = rows if self._textures is None else pl.concat([self._textures, rows])
+            self._textures_seen = len(self.hands)
+        return self._textures
 
     def __str__(self) -> str:
         return f"History with {len(self.hands)} hands."
@@ -0,0 +1,521 @@
+"""
+Headless No Limit Hold'em table simulation.
+
+Hands are played on TableState, a compact array mirror of a table: per seat
+lists of stacks, chips committed on the street and in the hand, folded
+flags and hole cards as card numbers (cards.card_index). Every decision is
+asked to a strategy callback, ``strategy(state, seat) -> (action, amount)``,
+where action is one of folds/checks/calls/bets/raises and amount is the total
+the player wants committed on the street for bets and raises (PokerStars'
+"raises to"). Illegal answers are coerced (a check facing a bet folds, a
+raise below the minimum becomes a minimum raise, anything above the stack is
+all-in). Strategies draw randomness from ``state.rng`` so runs are
+reproducible.
+
+Game plays hands between Player objects and returns them as Hand objects
+(Round/Bet model), ready for History and its stats. simulate plays many
+hands in fixed-size chunks, each with its own stream from spawn_rngs, in
+parallel processes if asked, and records them in columnar form: one row
+per action and one row per player and hand. Results only depend on the seed
+and the chunk size, not on the number of processes.
+
+Classes:
+    TableState: Array state of one hand and the betting engine
+    Game: Hands between Player objects, as Hand objects
+    SimulationResult: Action and result frames of a batch of hands
+"""
+
+import multiprocessing
+import os
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
+
+import polars as pl
+
+from pypokerstar.src.game.evaluator import Evaluator, get_evaluator
+from pypokerstar.src.game.poker import POSITIONS, Bet, Hand, Player, Round, resolve_positions
+from pypokerstar.src.types.cards import COMBO_CLASS, COMBO_INDEX, DECK_CARDS, HAND_CLASSES, Deck
+from pypokerstar.src.types.rng import Seed, make_rng, spawn_rngs
+
+STREETS = ("hole cards", "flop", "turn", "river", "summary")
+ACTIONS = ("small blind", "big blind", "folds", "checks", "calls", "bets", "raises", "uncalled", "collected")
+BOARD_SIZES = (0, 3, 4, 5)
+ACTION_INDEX = {action: i for i, action in enumerate(ACTIONS)}
+
+Strategy = t.Callable[["TableState", int], tuple[str, float]]
+
+# chips are kept in cents: every amount is rounded after each operation and
+# a stack under half a cent is empty, so no float residue can keep a player in
+HALF_CENT = 0.005
+
+
+def _cents(amount: float) -> float:
+    return round(amount, 2)
+
+
+def check_call(state: "TableState", seat: int) -> tuple[str, float]:
+    """Never folds, never raises."""
+    return "calls", 0.0
+
+
+class TableState:
+    """
+    State of the hand being played, one list entry per seat.
+
+    Seats are numbered from 0 in table order. The small blind sits after the
+    button (heads up, the button is the small blind) and the first to act
+    postflop is the first player still in after the button.
+
+    Attributes:
+        strategies (list[Strategy]): Decision callback of each seat
+        small_blind (float): Small blind
+        big_blind (float): Big blind
+        rng (np.random.Generator): Stream used for the deck and available to strategies
+        evaluator (Evaluator): Ranks the hands at showdown
+        button (int): Seat of the button
+        stacks (list[float]): Chips behind
+        committed (list[float]): Chips put in on the current street
+        invested (list[float]): Chips put in during the hand
+        collected (list[float]): Chips won
+        folded (list[bool]): Whether the seat folded
+        hole (list[tuple[int, int]]): Hole cards as card numbers
+        board (list[int]): Board cards as card numbers
+        street (int): Index in STREETS of the street being played
+        pot (float): Chips in the pot
+        current_bet (float): Highest street commitment
+        min_raise (float): Smallest raise increment allowed
+        actions (list[tuple]): (street, seat, action, amount, street total) of the hand
+        showdown (bool): Whether the hand went to showdown
+
+    Methods:
+        start: Reset for a new hand, deal the hole cards and post the blinds
+        play_street: Deal and bet one street
+        finish: Award the pot(s)
+        play: A whole hand
+    """
+    def __init__(
+        self,
+        strategies: t.Sequence[Strategy],
+        small_blind: float = 0.5,
+        big_blind: float = 1.0,
+        rng: Seed = None,
+        evaluator: t.Optional[Evaluator] = None,
+    ) -> None:
+        self.strategies = list(strategies)
+        self.evaluator = evaluator or get_evaluator()
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.rng = make_rng(rng)
+        self.deck = Deck(rng=self.rng)
+        self.n = len(self.strategies)
+        self.button = 0
+        self.start([0.0] * self.n, 0, post=False)
+
+    def start(self, stacks: t.Sequence[float], button: int, post: bool = True) -> None:
+        n = self.n = len(stacks)
+        self.button = button % n
+        self.stacks = [_cents(stack) for stack in stacks]
+        self.committed = [0.0] * n
+        self.invested = [0.0] * n
+        self.collected = [0.0] * n
+        self.folded = [False] * n
+        self.deck.reset(keep_dead=False)
+        cards = self.deck.deal(2 * n) if post else [0] * (2 * n)
+        self.hole = list(zip(cards[::2], cards[1::2]))
+        self.board: list[int] = []
+        self.street = 0
+        self.pot = 0.0
+        self.current_bet = 0.0
+        self.min_raise = self.big_blind
+        self.actions: list[tuple[int, int, str, float, float]] = []
+        self.showdown = False
+        self.finished = False
+        if post:
+            small, big = (self.button, self.button + 1) if n == 2 else (self.button + 1, self.button + 2)
+            self._put(small % n, self.small_blind, "small blind")
+            self._put(big % n, self.big_blind, "big blind")
+            self.current_bet = max(self.committed)
+
+    def _put(self, seat: int, amount: float, action: str) -> None:
+        amount = _cents(min(amount, self.stacks[seat]))
+        self.stacks[seat] = _cents(self.stacks[seat] - amount)
+        self.committed[seat] = _cents(self.committed[seat] + amount)
+        self.invested[seat] = _cents(self.invested[seat] + amount)
+        self.pot = _cents(self.pot + amount)
+        self.actions.append((self.street, seat, action, amount, self.committed[seat]))
+
+    def live(self) -> int:
+        return self.folded.count(False)
+
+    def can_act(self, seat: int) -> bool:
+        return not self.folded[seat] and self.stacks[seat] >= HALF_CENT
+
+    def _act(self, seat: int, action: str, amount: float) -> bool:
+        """Apply a decision, returning True when it is a bet or raise."""
+        to_call = self.current_bet - self.committed[seat]
+        if action == "checks" and to_call > 0:
+            action = "folds"
+        if action == "folds":
+            if to_call <= 0:
+                self.actions.append((self.street, seat, "checks", 0.0, self.committed[seat]))
+                return False
+            self.folded[seat] = True
+            self.actions.append((self.street, seat, "folds", 0.0, self.committed[seat]))
+            return False
+        if action in ("bets", "raises"):
+            target = _cents(min(max(amount, self.current_bet + self.min_raise), self.committed[seat] + self.stacks[seat]))
+            if target > self.current_bet:
+                # an all-in short of a full raise does not change the minimum
+                self.min_raise = max(self.min_raise, target - self.current_bet)
+                kind = "bets" if self.current_bet == 0 else "raises"
+                self.current_bet = target
+                self._put(seat, target - self.committed[seat], kind)
+                return True
+        if to_call <= 0:
+            self.actions.append((self.street, seat, "checks", 0.0, self.committed[seat]))
+        else:
+            self._put(seat, to_call, "calls")
+        return False
+
+    def _bet(self, first: int) -> None:
+        n = self.n
+        queue = [seat % n for seat in range(first, first + n) if self.can_act(seat % n)]
+        while queue and self.live() > 1:
+            seat = queue.pop(0)
+            if not self.can_act(seat):
+                continue
+            if self.committed[seat] >= self.current_bet and not any(
+                self.can_act(other) for other in range(n) if other != seat
+            ):
+                continue
+            action, amount = self.strategies[seat](self, seat)
+            if self._act(seat, action, amount):
+                queue = [s % n for s in range(seat + 1, seat + n) if self.can_act(s % n)]
+        self._return_uncalled()
+
+    def _return_uncalled(self) -> None:
+        top = max(range(self.n), key=self.committed.__getitem__)
+        rest = max((c for seat, c in enumerate(self.committed) if seat != top), default=0.0)
+        excess = _cents(self.committed[top] - rest)
+        if excess > 0:
+            self.stacks[top] = _cents(self.stacks[top] + excess)
+            self.invested[top] = _cents(self.invested[top] - excess)
+            self.pot = _cents(self.pot - excess)
+            self.actions.append((self.street, top, "uncalled", -excess, rest))
+        self.committed = [0.0] * self.n
+        self.current_bet = 0.0
+        self.min_raise = self.big_blind
+
+    def play_street(self) -> None:
+        if self.finished:
+            return
+        if self.street == 0:
+            # heads up the button is the small blind and acts first preflop
+            first = self.button if self.n == 2 else self.button + 3
+        else:
+            self.board.extend(self.deck.deal(BOARD_SIZES[self.street] - len(self.board)))
+            first = self.button + 1
+        if self.live() > 1:
+            self._bet(first)
+        self.street += 1
+        if self.live() <= 1 or self.street == 4:
+            self.finish()
+
+    def finish(self) -> None:
+        if self.finished:
+            return
+        live = [seat for seat in range(self.n) if not self.folded[seat]]
+        if len(live) > 1:
+            # run out the board when everybody left is all-in
+            self.board.extend(self.deck.deal(5 - len(self.board)))
+            self.showdown = True
+            ranks = {seat: self.evaluator.evaluate((*self.hole[seat], *self.board)) for seat in live}
+            # side pots in integer cents, odd cents of a split to the first winners after the button
+            remaining = [round(invested * 100) for invested in self.invested]
+            while any(remaining[seat] > 0 for seat in live):
+                level = min(remaining[seat] for seat in live if remaining[seat] > 0)
+                eligible = [seat for seat in live if remaining[seat] >= level]
+                pot = 0
+                for seat in range(self.n):
+                    part = min(remaining[seat], level)
+                    remaining[seat] -= part
+                    pot += part
+                best = min(ranks[seat] for seat in eligible)
+                winners = sorted((seat for seat in eligible if ranks[seat] == best), key=lambda seat: (seat - self.button - 1) % self.n)
+                share, odd = divmod(pot, len(winners))
+                for i, seat in enumerate(winners):
+                    self.collected[seat] = _cents(self.collected[seat] + (share + (i < odd)) / 100)
+        else:
+            self.collected[live[0]] = self.pot
+        self.street = 4
+        for seat in range(self.n):
+            if self.collected[seat] > 0:
+                self.stacks[seat] = _cents(self.stacks[seat] + self.collected[seat])
+                self.actions.append((4, seat, "collected", self.collected[seat], 0.0))
+        self.finished = True
+
+    def play(self, stacks: t.Sequence[float], button: int) -> None:
+        self.start(stacks, button)
+        while not self.finished:
+            self.play_street()
+
+
+class Game:
+    """
+    Hands played between Player objects with pluggable strategies.
+
+    Stacks are taken from and written back to Player.pot, and the button moves
+    one seat after every hand. Each hand can be played street by street
+    (pre_flop, flop, turn, river, showdown) or at once with play.
+
+    Attributes:
+        players (list[Player]): Players in seat order
+        strategies (list[Strategy]): Strategy of each player (check_call by default)
+        state (TableState): Engine state of the current hand
+        hands (list[Hand]): Hands played so far
+
+    Methods:
+        pre_flop / flop / turn / river: Play up to the end of that street
+        showdown: Finish the hand and return it as a Hand
+        play: Play whole hands until one player has all the chips
+    """
+    def __init__(
+        self,
+        *players: Player,
+        strategies: t.Optional[t.Union[t.Sequence[Strategy], dict[str, Strategy]]] = None,
+        small_blind: float = 0.5,
+        big_blind: float = 1.0,
+        rng: Seed = None,
+        table: str = "Simulation",
+    ) -> None:
+        if len(players) < 2 or len(players) > len(POSITIONS):
+            raise ValueError(f"A game needs 2 to {len(POSITIONS)} players. Given: {len(players)}")
+        self.players = list(players)
+        if isinstance(strategies, dict):
+            strategies = [strategies.get(p.name, check_call) for p in self.players]
+        self.strategies = list(strategies) if strategies is not None else [check_call] * len(self.players)
+        self.table = table
+        self.state = TableState(self.strategies, small_blind, big_blind, rng)
+        self.hands: list[Hand] = []
+        self.button = 0
+        self._seated: t.Optional[list[int]] = None
+
+    def _start(self) -> None:
+        seated = [i for i, p in enumerate(self.players) if p.pot > 0]
+        if len(seated) < 2:
+            raise ValueError("Fewer than two players have chips left")
+        self._seated = seated
+        self.state.strategies = [self.strategies[i] for i in seated]
+        button = next((k for k, i in enumerate(seated) if i >= self.button), 0)
+        self.state.start([self.players[i].pot for i in seated], button)
+
+    def _play_to(self, street: int) -> "Game":
+        if self._seated is None:
+            self._start()
+        while not self.state.finished and self.state.street <= street:
+            self.state.play_street()
+        return self
+
+    def pre_flop(self) -> "Game":
+        return self._play_to(0)
+
+    def flop(self) -> "Game":
+        return self._play_to(1)
+
+    def turn(self) -> "Game":
+        return self._play_to(2)
+
+    def river(self) -> "Game":
+        return self._play_to(3)
+
+    def showdown(self) -> Hand:
+        self._play_to(3)
+        hand = self._to_hand()
+        for k, i in enumerate(self._seated):
+            self.players[i].pot = self.state.stacks[k]
+        self.button = (self._seated[self.state.button] + 1) % len(self.players)
+        self._seated = None
+        self.hands.append(hand)
+        return hand
+
+    def play(self, hands: int = 1) -> list[Hand]:
+        """Play up to `hands` hands, stopping when fewer than two players have chips."""
+        played = []
+        for _ in range(hands):
+            if sum(p.pot > 0 for p in self.players) < 2:
+                break
+            played.append(self.showdown())
+        return played
+
+    def _to_hand(self) -> Hand:
+        state = self.state
+        players = [
+            Player(name=self.players[i].name, pot=self.players[i].pot, seat=i + 1, cards=[DECK_CARDS[c] for c in state.hole[k]])
+            for k, i in enumerate(self._seated)
+        ]
+        rounds = {name: Round(name) for name in ("table", "hole cards", "flop", "turn", "river", "summary")}
+        for street, seat, action, amount, total in state.actions:
+            name = "table" if action.endswith("blind") else STREETS[street]
+            # chips put in by each action, so Hand.result and invested add up
+            rounds[name].add_bet(Bet(players[seat], action, amount))
+            if action == "collected":
+                rounds[name].set_winner(players[seat])
+        for street, size in ((1, 3), (2, 4), (3, 5)):
+            if len(state.board) >= size:
+                rounds[STREETS[street]].update_board(*[DECK_CARDS[c] for c in state.board[:size]])
+            else:
+                del rounds[STREETS[street]]
+        if state.showdown:
+            rounds["show down"] = Round("show down", players=[players[k] for k in range(state.n) if not state.folded[k]])
+        number = len(self.hands) + 1
+        header = (
+            f"Simulated Hand #{number}: Hold'em No Limit ({state.small_blind}/{state.big_blind}) - "
+            f"Table '{self.table}' {len(self.players)}-max Seat #{self._seated[state.button] + 1} is the button"
+        )
+        return Hand(id=str(number), raw_text=header, players=players, rounds=rounds.values(), pot=state.pot, rake=0.0)
+
+
+class SimulationResult:
+    """
+    Columnar record of simulated hands.
+
+    Attributes:
+        actions (pl.DataFrame): One row per action: hand, street, seat, action,
+            amount (chips added, negative for uncalled bets) and total (street commitment)
+        results (pl.DataFrame): One row per player and hand: hand, seat, player,
+            position, cards (hand class), invested, collected, net, showdown
+
+    Methods:
+        summary: Hands, net and bb/100 per player
+        save: Write both frames as parquet files
+    """
+    def __init__(self, actions: pl.DataFrame, results: pl.DataFrame, big_blind: float = 1.0) -> None:
+        self.actions = actions
+        self.results = results
+        self.big_blind = big_blind
+
+    def summary(self) -> pl.DataFrame:
+        return (
+            self.results.group_by("player", maintain_order=True)
+            .agg(
+                pl.len().alias("hands"),
+                pl.col("net").sum(),
+                (100 * pl.col("net").mean() / self.big_blind).alias("bb_per_100"),
+                pl.col("showdown").mean().alias("wtsd"),
+            )
+        )
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.actions.write_parquet(os.path.join(directory, "actions.parquet"))
+        self.results.write_parquet(os.path.join(directory, "results.parquet"))
+
+
+def _simulate_chunk(
+    strategies: t.Sequence[Strategy],
+    names: t.Sequence[str],
+    first_hand: int,
+    hands: int,
+    stack: float,
+    small_blind: float,
+    big_blind: float,
+    rng: Seed,
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    state = TableState(strategies, small_blind, big_blind, rng)
+    n = len(strategies)
+    positions = [resolve_positions(button + 1, range(1, n + 1)) for button in range(n)]
+    stacks = [stack] * n
+    a_hand, a_street, a_seat, a_action, a_amount, a_total = [], [], [], [], [], []
+    r_hand, r_seat, r_position, r_cards, r_invested, r_collected, r_showdown = [], [], [], [], [], [], []
+    for hand_id in range(first_hand, first_hand + hands):
+        state.play(stacks, hand_id % n)
+        for street, seat, action, amount, total in state.actions:
+            a_hand.append(hand_id)
+            a_street.append(street)
+            a_seat.append(seat)
+            a_action.append(ACTION_INDEX[action])
+            a_amount.append(amount)
+            a_total.append(total)
+        labels = positions[state.button]
+        for seat in range(n):
+            card1, card2 = state.hole[seat]
+            r_hand.append(hand_id)
+            r_seat.append(seat)
+            r_position.append(labels[seat + 1])
+            r_cards.append(COMBO_CLASS[COMBO_INDEX[card1 * 52 + card2]])
+            r_invested.append(state.invested[seat])
+            r_collected.append(state.collected[seat])
+            r_showdown.append(state.showdown and not state.folded[seat])
+    actions = pl.DataFrame(
+        {
+            "hand": pl.Series(a_hand, dtype=pl.UInt64),
+            "street": pl.Series(a_street, dtype=pl.UInt8),
+            "seat": pl.Series(a_seat, dtype=pl.UInt8),
+            "action": pl.Series(a_action, dtype=pl.UInt8),
+            "amount": pl.Series(a_amount, dtype=pl.Float64),
+            "total": pl.Series(a_total, dtype=pl.Float64),
+        }
+    ).with_columns(
+        pl.col("street").replace_strict(list(range(len(STREETS))), STREETS, return_dtype=pl.Enum(STREETS)),
+        pl.col("action").replace_strict(list(range(len(ACTIONS))), ACTIONS, return_dtype=pl.Enum(ACTIONS)),
+    )
+    results = pl.DataFrame(
+        {
+            "hand": pl.Series(r_hand, dtype=pl.UInt64),
+            "seat": pl.Series(r_seat, dtype=pl.UInt8),
+            "position": pl.Series(r_position, dtype=pl.Enum(POSITIONS)),
+            "cards": pl.Series(r_cards, dtype=pl.UInt8),
+            "invested": pl.Series(r_invested, dtype=pl.Float64),
+            "collected": pl.Series(r_collected, dtype=pl.Float64),
+            "showdown": pl.Series(r_showdown, dtype=pl.Boolean),
+        }
+    ).with_columns(
+        pl.col("seat").replace_strict(list(range(n)), names, return_dtype=pl.String).alias("player"),
+        pl.col("cards").replace_strict(list(range(len(HAND_CLASSES))), HAND_CLASSES, return_dtype=pl.Enum(HAND_CLASSES)),
+        (pl.col("collected") - pl.col("invested")).alias("net"),
+    )
+    return actions, results
+
+
+def simulate(
+    strategies: t.Sequence[Strategy],
+    hands: int,
+    seed: Seed = None,
+    names: t.Optional[t.Sequence[str]] = None,
+    stack: float = 100.0,
+    small_blind: float = 0.5,
+    big_blind: float = 1.0,
+    processes: int = 1,
+    chunk_size: int = 10_000,
+) -> SimulationResult:
+    """
+    Play hands between strategies (one per seat), every hand starting from the
+    same stacks with the button moving one seat per hand.
+
+    Hands are split in chunks of chunk_size, chunk i playing with the i-th
+    stream spawned from seed, so the result is the same for any number of
+    processes. Strategies must be picklable (module level functions) to run
+    in more than one process.
+    """
+    if not 2 <= len(strategies) <= len(POSITIONS):
+        raise ValueError(f"A table needs 2 to {len(POSITIONS)} strategies. Given: {len(strategies)}")
+    names = list(names) if names is not None else [f"player{seat + 1}" for seat in range(len(strategies))]
+    starts = list(range(0, hands, chunk_size))
+    rngs = spawn_rngs(seed, len(starts))
+    jobs = [
+        (strategies, names, start, min(chunk_size, hands - start), stack, small_blind, big_blind, rng)
+        for start, rng in zip(starts, rngs)
+    ]
+    if processes > 1 and len(jobs) > 1:
+        # forking a process that already runs polars threads can deadlock
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+            chunks = list(executor.map(_simulate_chunk, *zip(*jobs)))
+    else:
+        chunks = [_simulate_chunk(*job) for job in jobs]
+    if not chunks:
+        return SimulationResult(pl.DataFrame(), pl.DataFrame(), big_blind)
+    return SimulationResult(
+        pl.concat([actions for actions, _ in chunks]),
+        pl.concat([results for _, results in chunks]),
+        big_blind,
+    )
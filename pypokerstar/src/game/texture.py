@@ -0,0 +1,137 @@
+"""
+Board texture features.
+
+Each street's board (flop, turn, river) is described by small integer codes:
+
+    suits:      most cards of one suit (1-5)
+    flush:      0 none, 1 flush draw (two of a suit, cards to come), 2 flush possible
+    paired:     0 unpaired, 1 paired, 2 two pair, 3 trips, 4 full house or quads
+    high:       highest rank (2-14, ace = 14)
+    connected:  most distinct ranks inside one five rank straight window (ace plays low too)
+    straight:   0 none, 1 straight draw (two ranks in a window, cards to come), 2 straight possible
+
+Features are computed with NumPy over arrays of boards. Boards are reduced
+to 52-bit card masks first and only the distinct ones are computed, so a
+history of hundreds of thousands of hands costs as much as its distinct
+boards. board_textures returns one row per hand keyed by hand_id, to be
+joined with History.get_main_stats, e.g. c-bet frequency by flop texture:
+
+    stats = history.get_main_stats().join(history.get_board_textures(), on="hand_id")
+    evaluate_metrics(stats, ["cbet"], by=["player", "flop_flush"])
+
+Classes:
+    Flush: Codes of the flush feature
+    Straight: Codes of the straight feature
+    Paired: Codes of the paired feature
+"""
+
+import enum
+import typing as t
+
+import numpy as np
+import polars as pl
+
+from pypokerstar.src.types.cards import card_index
+
+if t.TYPE_CHECKING:
+    from pypokerstar.src.game.poker import Hand
+
+STREET_CARDS = {"flop": 3, "turn": 4, "river": 5}
+FEATURES = ("suits", "flush", "paired", "high", "connected", "straight")
+
+
+class Flush(enum.IntEnum):
+    NONE = 0
+    DRAW = 1
+    POSSIBLE = 2
+
+
+class Straight(enum.IntEnum):
+    NONE = 0
+    DRAW = 1
+    POSSIBLE = 2
+
+
+class Paired(enum.IntEnum):
+    UNPAIRED = 0
+    PAIRED = 1
+    TWO_PAIR = 2
+    TRIPS = 3
+    FULL_HOUSE = 4  # or quads
+
+
+def _compute(boards: np.ndarray) -> dict[str, np.ndarray]:
+    """Features of an (n, k) array of distinct boards of card numbers."""
+    n, k = boards.shape
+    # card_index is rank_index * 4 + suit with ace = 0 ... deuce = 12
+    values = 14 - boards // 4
+    suit_counts = (boards[:, :, None] % 4 == np.arange(4)).sum(axis=1)
+    rank_counts = (values[:, :, None] == np.arange(2, 15)).sum(axis=1)
+    suits = suit_counts.max(axis=1)
+    to_come = k < 5
+    flush = np.where(suits >= 3, Flush.POSSIBLE, np.where((suits == 2) & to_come, Flush.DRAW, Flush.NONE))
+    ordered = -np.sort(-rank_counts, axis=1)
+    top, second = ordered[:, 0], ordered[:, 1]
+    paired = np.select(
+        [(top >= 4) | ((top == 3) & (second >= 2)), top == 3, (top == 2) & (second == 2), top == 2],
+        [Paired.FULL_HOUSE, Paired.TRIPS, Paired.TWO_PAIR, Paired.PAIRED],
+        Paired.UNPAIRED,
+    )
+    # rank presence over values 1-14, the ace counted as 1 as well as 14
+    present = np.zeros((n, 15), dtype=np.int8)
+    present[:, 2:] = rank_counts > 0
+    present[:, 1] = present[:, 14]
+    window_sums = np.cumsum(np.pad(present[:, 1:], ((0, 0), (1, 0))), axis=1)
+    connected = (window_sums[:, 5:] - window_sums[:, :-5]).max(axis=1)
+    straight = np.where(
+        connected >= 3, Straight.POSSIBLE, np.where((connected == 2) & to_come, Straight.DRAW, Straight.NONE)
+    )
+    return {
+        "suits": suits,
+        "flush": flush,
+        "paired": paired,
+        "high": values.max(axis=1),
+        "connected": connected,
+        "straight": straight,
+    }
+
+
+def texture_features(boards: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Features (FEATURES) of an (n, 3 to 5) array of boards of card numbers, as
+    uint8 arrays. Each distinct board is computed once.
+    """
+    boards = np.asarray(boards, dtype=np.int64)
+    if boards.ndim != 2 or boards.shape[1] not in STREET_CARDS.values():
+        raise ValueError(f"Boards must be an (n, 3 to 5) array of card numbers. Given shape: {boards.shape}")
+    masks = np.bitwise_or.reduce(np.left_shift(np.int64(1), boards), axis=1)
+    _, first, inverse = np.unique(masks, return_index=True, return_inverse=True)
+    features = _compute(boards[first])
+    return {name: values.astype(np.uint8)[inverse.ravel()] for name, values in features.items()}
+
+
+def board_textures(hands: t.Iterable["Hand"]) -> pl.DataFrame:
+    """
+    One row per hand: hand_id, board_cards and `<street>_<feature>` for the
+    flop, turn and river, null for streets the hand did not reach.
+    """
+    ids, boards = [], []
+    for hand in hands:
+        ids.append(getattr(hand, "id", None))
+        boards.append([card_index(card) for card in hand.board[:5]])
+    lengths = np.fromiter(map(len, boards), dtype=np.int64, count=len(boards))
+    columns: dict[str, pl.Series] = {
+        "hand_id": pl.Series(ids, dtype=pl.String),
+        "board_cards": pl.Series(lengths, dtype=pl.UInt8),
+    }
+    for street, size in STREET_CARDS.items():
+        rows = np.flatnonzero(lengths >= size)
+        street_boards = np.array([boards[i][:size] for i in rows], dtype=np.int64).reshape(len(rows), size)
+        features = texture_features(street_boards)
+        for name in FEATURES:
+            values = np.zeros(len(boards), dtype=np.uint8)
+            values[rows] = features[name]
+            reached = np.zeros(len(boards), dtype=bool)
+            reached[rows] = True
+            columns[f"{street}_{name}"] = pl.Series(values).set(pl.Series(~reached), None)
+    return pl.DataFrame(columns)
@@ -1,8 +1,290 @@
+"""
+Player metrics.
+
+Metrics are registered once in a MetricsRegistry with the columns of the
+get_main_stats frame they need and polars expressions for their hits and
+opportunities. Any number of metrics are then evaluated together as one
+group-by over the shared stats frame, which returns for each group the value
+of every metric and the sample size it was computed over (``<name>_n``).
+
+Classes:
+    MetricDefinition: Frequency metric as hits over opportunities
+    MetricsRegistry: Registered metrics, evaluated in a single pass
+    with_intervals: Adds confidence intervals and shrunk estimates to evaluated metrics
+    PopulationBaseline: Pool-wide rates by stake and position, cached per stats snapshot
+    Metric: Base class of single metrics of a hero
+    StatsMetric: Hero metric backed by the registry
+    VPIP, PFR, WTSD, WSD: Common hero metrics
+"""
+
+import math
 import typing as t
 from abc import ABC, abstractmethod
 
-from pypokerstar.src.game.poker import Bet, Hand, Player, History
-from rich.progress import Progress
+import polars as pl
+
+from pypokerstar.src.game.lines import LINE_STATS, has_line
+from pypokerstar.src.game.poker import Hand, Player, History
+
+
+class MetricDefinition:
+    """
+    A frequency metric: how often `hits` happened out of `opportunities`.
+
+    Attributes:
+        name (str): Metric name, also the output column
+        hits (pl.Expr): Boolean expression per stats row
+        opportunities (pl.Expr | None): Boolean expression per stats row; None means every row
+        columns (tuple[str, ...]): Stats columns the expressions read
+        description (str): What the metric measures
+    """
+    def __init__(
+        self,
+        name: str,
+        hits: pl.Expr,
+        opportunities: t.Optional[pl.Expr] = None,
+        columns: t.Iterable[str] = (),
+        description: str = "",
+    ) -> None:
+        self.name = name
+        self.hits = hits
+        self.opportunities = opportunities
+        self.columns = tuple(columns)
+        self.description = description
+
+    def aggregations(self) -> list[pl.Expr]:
+        if self.opportunities is None:
+            n = pl.len()
+            hits = self.hits.cast(pl.UInt32).sum()
+        else:
+            n = self.opportunities.cast(pl.UInt32).sum()
+            hits = (self.hits & self.opportunities).cast(pl.UInt32).sum()
+        return [hits.alias(f"{self.name}_hits"), n.alias(f"{self.name}_n")]
+
+    def __repr__(self) -> str:
+        return f"MetricDefinition({self.name!r})"
+
+
+class MetricsRegistry:
+    """
+    Metrics by name, evaluated together over a stats frame.
+
+    Methods:
+        register: Add a metric
+        evaluate: Values and sample sizes of many metrics in one group-by
+    """
+    def __init__(self) -> None:
+        self.metrics: dict[str, MetricDefinition] = {}
+
+    def register(self, metric: MetricDefinition) -> MetricDefinition:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.metrics
+
+    def __getitem__(self, name: str) -> MetricDefinition:
+        return self.metrics[name]
+
+    def evaluate(
+        self,
+        stats: pl.DataFrame,
+        names: t.Optional[t.Iterable[str]] = None,
+        by: t.Union[str, list[str], None] = "player",
+    ) -> pl.DataFrame:
+        """
+        One row per group of `by` (or a single row when None) with `hands`, and
+        for every metric its value and `<name>_n` sample size. Metrics whose
+        columns are missing from stats raise a ValueError.
+        """
+        metrics = [self.metrics[name] for name in (names or self.metrics)]
+        missing = {c for m in metrics for c in m.columns if c not in stats.columns}
+        if missing:
+            raise ValueError(f"Stats frame is missing columns {sorted(missing)}")
+        aggregations = [pl.len().alias("hands")]
+        for metric in metrics:
+            aggregations.extend(metric.aggregations())
+        if by is None:
+            result = stats.select(aggregations)
+        else:
+            result = stats.group_by(by, maintain_order=True).agg(aggregations)
+        keys = [] if by is None else [by] if isinstance(by, str) else list(by)
+        return result.select(
+            *keys,
+            "hands",
+            *[
+                column
+                for m in metrics
+                for column in ((pl.col(f"{m.name}_hits") / pl.col(f"{m.name}_n")).alias(m.name), f"{m.name}_n")
+            ],
+        )
+
+
+registry = MetricsRegistry()
+registry.register(MetricDefinition("vpip", pl.col("vpip"), columns=("vpip",), description="Voluntarily put money in pot"))
+registry.register(MetricDefinition("pfr", pl.col("pfr"), columns=("pfr",), description="Preflop raise"))
+registry.register(MetricDefinition("3bet", pl.col("3bet"), columns=("3bet",), description="Preflop 3bet"))
+registry.register(MetricDefinition("wtsd", pl.col("wtsd"), columns=("wtsd",), description="Went to showdown"))
+registry.register(MetricDefinition("w$sd", pl.col("w$sd"), pl.col("wtsd"), columns=("wtsd", "w$sd"), description="Won money at showdown"))
+for _name, (_line, _opportunity) in LINE_STATS.items():
+    registry.register(MetricDefinition(
+        _name,
+        has_line(_line),
+        has_line(_opportunity) if _opportunity is not None else None,
+        columns=("line",),
+        description=_line.name.lower(),
+    ))
+
+
+def evaluate_metrics(
+    stats: t.Union[History, pl.DataFrame],
+    names: t.Optional[t.Iterable[str]] = None,
+    by: t.Union[str, list[str], None] = "player",
+) -> pl.DataFrame:
+    """Evaluate registered metrics over a History's main stats or a stats frame."""
+    if isinstance(stats, History):
+        stats = stats.get_main_stats()
+    return registry.evaluate(stats, names, by)
+
+
+def metric_names(result: pl.DataFrame) -> list[str]:
+    """Metrics present in an evaluate() result (columns with a `<name>_n` sample size)."""
+    return [c for c in result.columns if f"{c}_n" in result.columns]
+
+
+def population_priors(result: pl.DataFrame, names: t.Optional[t.Iterable[str]] = None) -> dict[str, float]:
+    """Pooled rate of each metric over all rows of an evaluate() result."""
+    names = list(names or metric_names(result))
+    totals = result.select(
+        *[(pl.col(n) * pl.col(f"{n}_n")).fill_nan(0).sum().alias(f"{n}_hits") for n in names],
+        *[pl.col(f"{n}_n").sum() for n in names],
+    ).row(0, named=True)
+    return {n: totals[f"{n}_hits"] / totals[f"{n}_n"] if totals[f"{n}_n"] else 0.0 for n in names}
+
+
+def with_intervals(
+    result: pl.DataFrame,
+    names: t.Optional[t.Iterable[str]] = None,
+    confidence: float = 0.95,
+    method: t.Literal["wilson", "beta"] = "wilson",
+    priors: t.Optional[dict[str, float]] = None,
+    prior_strength: float = 30.0,
+) -> pl.DataFrame:
+    """
+    Add `<name>_lo`, `<name>_hi` and `<name>_shrunk` columns for the metrics of
+    an evaluate() result, as vectorized expressions over every row at once.
+
+    `wilson` gives the Wilson score interval of hits / n. `beta` gives the
+    interval of the Beta posterior under a prior centered on the population
+    rate, using its normal approximation. `_shrunk` is that posterior mean:
+    (hits + prior * prior_strength) / (n + prior_strength), so small samples
+    are pulled toward the prior and large ones keep their raw rate. Priors
+    default to the pooled rates of `result` (see population_priors).
+    """
+    names = list(names or metric_names(result))
+    priors = {**population_priors(result, names), **(priors or {})}
+    z = _z_score(confidence)
+    columns = []
+    for name in names:
+        p = pl.col(name).fill_nan(None)
+        n = pl.col(f"{name}_n").cast(pl.Float64)
+        hits = p * n
+        a = hits + priors[name] * prior_strength
+        b = n - hits + (1 - priors[name]) * prior_strength
+        posterior = a / (a + b)
+        if method == "wilson":
+            center = (p + z**2 / (2 * n)) / (1 + z**2 / n)
+            half = z * (p * (1 - p) / n + z**2 / (4 * n**2)).sqrt() / (1 + z**2 / n)
+        elif method == "beta":
+            center = posterior
+            half = z * (a * b / ((a + b) ** 2 * (a + b + 1))).sqrt()
+        else:
+            raise ValueError(f"Method must be 'wilson' or 'beta'. Given: {method}")
+        empty = n == 0
+        columns += [
+            pl.when(empty).then(0.0).otherwise((center - half).clip(0.0, 1.0)).alias(f"{name}_lo"),
+            pl.when(empty).then(1.0).otherwise((center + half).clip(0.0, 1.0)).alias(f"{name}_hi"),
+            pl.when(empty).then(priors[name]).otherwise(posterior).alias(f"{name}_shrunk"),
+        ]
+    return result.with_columns(columns)
+
+
+class PopulationBaseline:
+    """
+    Pool-wide rates of the registered metrics, grouped by stake and position
+    (or any stats columns), in one aggregation over the stats frame.
+
+    The result is cached for the frame it was computed from: get_main_stats
+    returns the same frame until hands are added, so repeated queries and
+    comparisons reuse it, and a new snapshot is aggregated once.
+
+    Attributes:
+        by (list[str]): Stats columns the pool is grouped by
+        exclude (set[str]): Players left out of the pool (e.g. the hero)
+
+    Methods:
+        get: Pool rates per group, with `pool_hands` and `<name>_n`
+        compare: Players' rates next to the pool rates of their groups
+    """
+    def __init__(
+        self,
+        by: t.Iterable[str] = ("big_blind", "position"),
+        exclude: t.Iterable[str] = (),
+        metrics: MetricsRegistry = registry,
+    ) -> None:
+        self.by = list(by)
+        self.exclude = set(exclude)
+        self.metrics = metrics
+        self._snapshot: t.Optional[pl.DataFrame] = None
+        self._cache: dict[t.Optional[tuple[str, ...]], pl.DataFrame] = {}
+
+    def get(self, stats: t.Union[History, pl.DataFrame], names: t.Optional[t.Iterable[str]] = None) -> pl.DataFrame:
+        if isinstance(stats, History):
+            stats = stats.get_main_stats()
+        if stats is not self._snapshot:
+            self._snapshot = stats
+            self._cache = {}
+        key = tuple(names) if names else None
+        if key not in self._cache:
+            pool = stats.filter(~pl.col("player").is_in(list(self.exclude))) if self.exclude else stats
+            self._cache[key] = self.metrics.evaluate(pool, names, by=self.by).rename({"hands": "pool_hands"})
+        return self._cache[key]
+
+    def compare(
+        self,
+        stats: t.Union[History, pl.DataFrame],
+        players: t.Optional[t.Iterable[str]] = None,
+        names: t.Optional[t.Iterable[str]] = None,
+    ) -> pl.DataFrame:
+        """
+        Per player and group: the player's rates, the pool's (`<name>_pool`)
+        and the difference (`<name>_diff`).
+        """
+        if isinstance(stats, History):
+            stats = stats.get_main_stats()
+        pool = self.get(stats, names)
+        names = list(names or metric_names(pool))
+        subset = stats.filter(pl.col("player").is_in(list(players))) if players is not None else stats
+        result = self.metrics.evaluate(subset, names, by=["player", *self.by])
+        pool = pool.select(*self.by, "pool_hands", *[pl.col(n).alias(f"{n}_pool") for n in names])
+        return result.join(pool, on=self.by, how="left", nulls_equal=True).with_columns(
+            [(pl.col(n) - pl.col(f"{n}_pool")).alias(f"{n}_diff") for n in names]
+        )
+
+
+def _z_score(confidence: float) -> float:
+    """Two-sided normal quantile, by bisection on erf (no scipy needed)."""
+    if not 0 < confidence < 1:
+        raise ValueError(f"Confidence must be between 0 and 1. Given: {confidence}")
+    low, high = 0.0, 10.0
+    for _ in range(60):
+        mid = (low + high) / 2
+        if math.erf(mid / math.sqrt(2)) < confidence:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
 
 class Metric(ABC):
     def __init__(self, hands: t.Union[History, t.Iterable[Hand]], hero: Player):
@@ -10,7 +292,6 @@ class Metric(ABC):
             self.history = hands
         else:
             self.history = History(hands = [hand for hand in hands if hand.hero == hero], hero=hero)
-            self.history.get_main_stats()
         self.hero = hero
         self._value: t.Union[int, float, None] = None
 
@@ -18,37 +299,41 @@ class Metric(ABC):
     def get(self) -> t.Union[int, float]:
         pass
 
-    @abstractmethod
     @property
     def value(self) -> t.Union[int, float]:
         if self._value is None:
             self._value = self.get()
         return self._value
 
-    @value.setter
-    def value(self) -> None:
-        raise AttributeError("Can't set value directly, use get() method.")
-
 class StatsMetric(Metric):
     def __init__(self, hands: t.Union[History, t.Iterable[Hand]], hero: Player, stat: str) -> None:
         super().__init__(hands, hero)
-        if stat not in self.history.get_main_stats(hero=self.hero).columns:
-            raise ValueError(f"Stat {stat} not found in main stats DataFrame.")
+        if stat not in registry:
+            raise ValueError(f"Stat {stat} is not a registered metric.")
         self.stat = stat
+        self.sample_size: t.Optional[int] = None
 
     def get(self) -> float:
-        df = self.history.get_main_stats(hero=self.hero)
-        return df[self.stat].mean()
+        df = self.history.get_main_stats(hero=self.hero).filter(pl.col("player") == self.hero.name)
+        row = registry.evaluate(df, [self.stat], by=None).row(0, named=True)
+        self.sample_size = row[f"{self.stat}_n"]
+        return row[self.stat]
+
+    def interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """Wilson score interval of the hero's rate."""
+        df = self.history.get_main_stats(hero=self.hero).filter(pl.col("player") == self.hero.name)
+        row = with_intervals(registry.evaluate(df, [self.stat], by=None), confidence=confidence).row(0, named=True)
+        return row[f"{self.stat}_lo"], row[f"{self.stat}_hi"]
 
 class VPIP(StatsMetric):
     def __init__(self, hands: t.Union[History, t.Iterable[Hand]], hero: Player) -> None:
         super().__init__(hands, hero, stat="vpip")
 
-class WTSD(Metric):
+class WTSD(StatsMetric):
     def __init__(self, hands: t.Union[History, t.Iterable[Hand]], hero: Player) -> None:
         super().__init__(hands, hero, stat="wtsd")
 
-class WSD(Metric):
+class WSD(StatsMetric):
     def __init__(self, hands: t.Union[History, t.Iterable[Hand]], hero: Player) -> None:
         super().__init__(hands, hero, stat="w$sd")
 
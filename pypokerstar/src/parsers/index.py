@@ -0,0 +1,98 @@
+"""
+Index of already parsed hand ids.
+
+Hand history folders often hold the same hands more than once (re-exported
+files, ``_1`` copies, ``Hold_em``/``Hold'em`` spellings of the same table).
+The parser consults a HandIndex before the expensive round parsing so each
+hand id is parsed and returned only once.
+
+A persisted index keeps the parsed hands next to the id file, so a later run
+over the same folders gets the hands it already parsed back from the index
+instead of parsing them again. The hand file is a cache: it is tagged with
+HANDS_FORMAT and dropped when the tag does not match or it cannot be
+unpickled, and it holds at most `max_hands` hands; hands it does not hold are
+parsed again.
+
+Classes:
+    HandIndex: Set of hand ids, optionally persisted with the parsed hands
+"""
+
+import os
+import pickle
+import typing as t
+
+if t.TYPE_CHECKING:
+    from pypokerstar.src.game.poker import Hand
+
+# bump whenever Hand, Round, Bet, Player or Card change shape: older hand files are then discarded
+HANDS_FORMAT = 1
+MAX_HANDS = 50_000
+
+
+class HandIndex:
+    """
+    Set of hand ids seen so far.
+
+    Attributes:
+        path (str | None): File the ids are loaded from and saved to, one per line;
+            the hands are pickled to `<path>.hands`
+        ids (set[str]): Hand ids in the index
+        hands (dict[str, Hand]): Parsed hands by id, kept only when the index has a path
+        max_hands (int): Most hands kept
+    """
+    def __init__(self, path: t.Optional[str] = None, max_hands: int = MAX_HANDS) -> None:
+        self.path = path
+        self.max_hands = max_hands
+        self.ids: set[str] = set()
+        self.hands: dict[str, "Hand"] = {}
+        if path and os.path.exists(path):
+            self.load(path)
+
+    @staticmethod
+    def hands_path(path: str) -> str:
+        return path + ".hands"
+
+    def load(self, path: t.Optional[str] = None) -> None:
+        path = path or self.path
+        with open(path, "r") as file:
+            self.ids.update(line.strip() for line in file if line.strip())
+        if os.path.exists(self.hands_path(path)):
+            try:
+                with open(self.hands_path(path), "rb") as file:
+                    data = pickle.load(file)
+            except Exception:
+                # written by code whose classes no longer match: parse those hands again
+                data = None
+            if isinstance(data, dict) and data.get("format") == HANDS_FORMAT:
+                self.hands.update(data["hands"])
+
+    def save(self, path: t.Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given to save the hand index")
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, "w") as file:
+            file.write("\n".join(sorted(self.ids)))
+        with open(self.hands_path(path), "wb") as file:
+            pickle.dump({"format": HANDS_FORMAT, "hands": self.hands}, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def add(self, hand_id: str, hand: t.Optional["Hand"] = None) -> bool:
+        """Add a hand id (and its hand, for a persisted index), returning False if it was already indexed."""
+        if hand is not None and self.path and (hand_id in self.hands or len(self.hands) < self.max_hands):
+            self.hands[hand_id] = hand
+        if hand_id in self.ids:
+            return False
+        self.ids.add(hand_id)
+        return True
+
+    def get(self, hand_id: str) -> t.Optional["Hand"]:
+        """Hand stored for an id, if the index keeps hands."""
+        return self.hands.get(hand_id)
+
+    def __contains__(self, hand_id: object) -> bool:
+        return hand_id in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
@@ -16,9 +16,12 @@ import typing as t
 from rich.progress import Progress
 
 from pypokerstar.src.game.poker import Bet, Card, Hand, Player, Round
+from pypokerstar.src.parsers.index import HandIndex
 from pypokerstar.src.parsers.parser import Parser
 from pypokerstar.src.parsers.pokerparser import PokerParser
 
+HAND_ID_PATTERN = re.compile(r"Hand \#(\d*)\:")
+
 SPANISH_MAP = {
     "CARTAS DE MANO": "hole cards",
     "RESUMEN": "summary",
@@ -36,6 +39,9 @@ class PokerStarsParser:
         file_path (str): Path to hand history file
         site (str): Site identifier ("PokerStars")
         failed (int): Count of failed hand parses
+        duplicates (int): Count of hands skipped because their id was already parsed
+        index (HandIndex): Hand ids parsed so far, checked before parsing each hand
+        returned (set[str]): Hand ids this parser has returned, across calls
         
     Methods:
         parse: Parse single file into Hand objects
@@ -44,10 +50,13 @@ class PokerStarsParser:
         _parse_round: Internal method to parse single round
         _get_players: Internal method to extract player details
     """
-    def __init__(self, file_path: str = "") -> None:
+    def __init__(self, file_path: str = "", index: t.Optional[HandIndex] = None) -> None:
         self.file_path = file_path
         self.site = "PokerStars"
         self.failed = 0
+        self.duplicates = 0
+        self.index = index if index is not None else HandIndex()
+        self.returned: set[str] = set()
 
     @staticmethod
     def _get_hands(file_content: str) -> t.List[str]:
@@ -355,6 +364,7 @@ class PokerStarsParser:
         hero: t.Optional[Player] = None,
         skip_tournaments: bool = True,
         progress: bool = True,
+        dedupe: bool = True,
     ) -> t.Iterable[Hand]:
         if file_content:
             pass
@@ -372,15 +382,33 @@ class PokerStarsParser:
                 task = prog.add_task("Parsing file...", total=len(hands), color="blue")
             for hand in hands:
                 try:
-                    id_pattern = re.compile(r"Hand \#(\d*)\:")
-                    match = id_pattern.search(hand)
+                    match = HAND_ID_PATTERN.search(hand)
                     if not match:
                         print("No hand ID found, skipping hand.")
                         print(f"This error comes from {self.file_path}")
                         self.failed += 1
                         continue
                     hand_id = match.group(1)
-                    
+
+                    # skip hands already parsed (duplicated files) before the round parsing;
+                    # a hand a persisted index kept from an earlier run is returned once from it,
+                    # and one it knows the id of but did not keep is parsed again
+                    if dedupe and hand_id in self.index:
+                        stored = self.index.get(hand_id)
+                        if hand_id in self.returned or (stored is None and not self.index.path):
+                            self.duplicates += 1
+                            if progress:
+                                prog.advance(task_id=task, advance=2)
+                            continue
+                        if stored is not None:
+                            stored.hero = hero
+                            stored.refresh()
+                            results.append(stored)
+                            self.returned.add(hand_id)
+                            if progress:
+                                prog.advance(task_id=task, advance=2)
+                            continue
+
                     if skip_tournaments:
                         if re.search(
                             pattern=r"Tournament",
@@ -436,6 +464,8 @@ class PokerStarsParser:
                         pass
                     hand_obj.refresh()
                     results.append(hand_obj)
+                    self.index.add(hand_id, hand_obj)
+                    self.returned.add(hand_id)
 
                     if len(hand_obj.winner) == 0:
                         print("No winner found in hand:")
@@ -457,7 +487,18 @@ class PokerStarsParser:
         *args,
         **kwargs,
     ) -> t.Iterable[Hand]:
+        """
+        Parse every .txt file under directory.
 
+        Each hand id is returned once, however many files hold it. With a
+        persisted index (HandIndex(path)) the parsed hands are saved with the
+        ids at the end of the run; a later run over the same folders returns
+        those hands from the index, set up for the given hero, without parsing
+        them again, so it returns the same hands plus any new ones. Hands whose
+        id is known but whose hand was not kept (an index saved without hands,
+        a discarded hand file, more than max_hands) are parsed again. Hands that
+        fail to parse or are skipped (tournaments) are not stored.
+        """
         paths = []
         if os.path.exists(directory) is False:
             raise ValueError(f"Directory {directory} does not exist")
@@ -476,4 +517,8 @@ class PokerStarsParser:
                 prog.advance(task_id=task, advance=1)
         if self.failed > 0:
             print(f"Failed to parse {self.failed} hands.")
+        if self.duplicates > 0:
+            print(f"Skipped {self.duplicates} duplicated hands.")
+        if self.index.path:
+            self.index.save()
         return data
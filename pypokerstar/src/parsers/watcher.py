@@ -0,0 +1,116 @@
+"""
+Follow a live PokerStars hand history folder.
+
+The PokerStars client appends each finished hand to the table's history file
+followed by blank lines. The watcher remembers a byte offset per file and on
+every poll reads only what was appended since, parses the complete hands in
+it and leaves a partially written trailing hand for the next poll.
+
+Classes:
+    HandHistoryWatcher: Polling tail of a hand history directory
+"""
+
+import os
+import time
+import typing as t
+
+from pypokerstar.src.game.poker import Hand, History, Player
+from pypokerstar.src.parsers.index import HandIndex
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+
+HAND_SEPARATORS = (b"\r\n\r\n", b"\n\n")
+
+
+class HandHistoryWatcher:
+    """
+    Incrementally parses hands appended to the history files of a directory.
+
+    Attributes:
+        directory (str): Hand history folder, scanned recursively for .txt files
+        hero (Player | None): Hero passed to the parser
+        parser (PokerStarsParser): Parser used for new hands; its index dedupes hand ids
+        history (History | None): History that new hands are added to
+        offsets (dict[str, int]): Bytes of each file already consumed
+        callbacks (list[Callable]): Called with the list of new hands after each poll
+
+    Methods:
+        poll: Read and parse what was appended since the last poll
+        run: Poll forever (or for a number of iterations) every `interval` seconds
+    """
+    def __init__(
+        self,
+        directory: str,
+        hero: t.Optional[Player] = None,
+        history: t.Optional[History] = None,
+        index: t.Optional[HandIndex] = None,
+        from_start: bool = False,
+    ) -> None:
+        if not os.path.isdir(directory):
+            raise ValueError(f"Directory {directory} does not exist")
+        self.directory = directory
+        self.hero = hero
+        self.history = history
+        self.parser = PokerStarsParser(index=index)
+        self.offsets: dict[str, int] = {}
+        self.callbacks: list[t.Callable[[list[Hand]], None]] = []
+        if not from_start:
+            # start at the end of what is already on disk: only new hands are reported
+            for path in self._files():
+                self.offsets[path] = os.path.getsize(path)
+
+    def subscribe(self, callback: t.Callable[[list[Hand]], None]) -> None:
+        self.callbacks.append(callback)
+
+    def _files(self) -> t.Iterator[str]:
+        for dirpath, _, filenames in os.walk(self.directory):
+            for f in filenames:
+                if f.endswith(".txt"):
+                    yield os.path.join(dirpath, f)
+
+    def _read_new(self, path: str) -> str:
+        """Return the complete hands appended to path and advance its offset past them."""
+        size = os.path.getsize(path)
+        offset = self.offsets.get(path, 0)
+        if size < offset:
+            # file was truncated or replaced
+            offset = 0
+        if size == offset:
+            return ""
+        with open(path, "rb") as file:
+            file.seek(offset)
+            data = file.read(size - offset)
+        end = -1
+        for sep in HAND_SEPARATORS:
+            idx = data.rfind(sep)
+            if idx != -1:
+                end = max(end, idx + len(sep))
+        if end == -1:
+            # no complete hand yet
+            self.offsets[path] = offset
+            return ""
+        self.offsets[path] = offset + end
+        return data[:end].decode("utf-8-sig" if offset == 0 else "utf-8", errors="replace")
+
+    def poll(self) -> list[Hand]:
+        hands: list[Hand] = []
+        for path in self._files():
+            text = self._read_new(path)
+            if not text.strip():
+                continue
+            self.parser.file_path = path
+            hands.extend(self.parser.parse(file_content=text, hero=self.hero, progress=False))
+        if hands:
+            if self.history is not None:
+                for hand in hands:
+                    self.history.add_hand(hand)
+            for callback in self.callbacks:
+                callback(hands)
+        return hands
+
+    def run(self, interval: float = 1.0, iterations: t.Optional[int] = None) -> None:
+        done = 0
+        while iterations is None or done < iterations:
+            self.poll()
+            done += 1
+            if iterations is None or done < iterations:
+                time.sleep(interval)
@@ -0,0 +1,266 @@
+"""
+Composable hand filters backed by bitmap indexes.
+
+HandFilterIndex reduces every hand to a row of features seen from one player
+(position, stakes, pot, showdown, preflop pot type and action, ...) once, and
+keeps for each value of a categorical feature a bitmap of the hands having
+it, stored as a Python int. Numeric features are kept sorted so a range turns
+into a bitmap with two bisections. Filters are built from the functions of
+this module and composed with ``&``, ``|`` and ``~``, which evaluate to
+bitwise operations on those bitmaps:
+
+    index = HandFilterIndex(hands, player=hero)
+    hands = index.select(position("BTN", "CO") & pot_type("3bet") & showdown() & date(start, end))
+
+Classes:
+    Filter: A composable hand predicate evaluated against a HandFilterIndex
+    HandFilterIndex: Per hand feature columns and bitmap indexes
+"""
+
+import bisect
+import datetime
+import typing as t
+
+import polars as pl
+
+from pypokerstar.src.game.poker import Hand, Player, hand_big_blind, hand_table, player_hand_stats, player_position
+
+CATEGORICAL = ("position", "big_blind", "game_type", "table", "pot_type", "preflop_action", "vpip", "pfr", "showdown", "won")
+NUMERIC = ("date", "pot", "net")
+POT_TYPES = ("limped", "single raised", "3bet", "4bet+")
+
+
+def _bitmap(positions: t.Iterable[int], size: int) -> int:
+    buffer = bytearray(size // 8 + 1)
+    for i in positions:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _positions(bits: int) -> t.Iterator[int]:
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for offset, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield offset * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+def hand_features(hand: Hand, player: Player) -> t.Optional[dict[str, t.Any]]:
+    """Features of a hand seen from player, or None if the player is not in the hand."""
+    canonical = hand.get_player(player.name)
+    if canonical is None:
+        return None
+    stats = player_hand_stats(hand)[player.name]
+    hole_cards = hand.get_round("hole cards")
+    raises = sum(1 for bet in hole_cards.bets if bet.type == "raises") if hole_cards else 0
+    if stats["3bet"]:
+        action = "3bet"
+    elif stats["pfr"]:
+        action = "raise"
+    elif stats["vpip"]:
+        action = "call"
+    else:
+        action = "fold"
+    net = next((v for p, v in hand.result.items() if p.name == player.name), 0.0)
+    return {
+        "position": player_position(hand, canonical),
+        "big_blind": hand_big_blind(hand),
+        "game_type": hand.game_type,
+        "table": hand_table(hand),
+        "pot_type": POT_TYPES[min(raises, len(POT_TYPES) - 1)],
+        "preflop_action": action,
+        "vpip": stats["vpip"],
+        "pfr": stats["pfr"],
+        "showdown": stats["wtsd"],
+        "won": net > 0,
+        "date": hand.date,
+        "pot": hand.pot,
+        "net": net,
+    }
+
+
+class Filter:
+    """
+    A predicate over the hands of a HandFilterIndex.
+
+    Attributes:
+        evaluate (Callable[[HandFilterIndex], int]): Returns the bitmap of matching hands
+        description (str): Readable form of the filter
+    """
+    def __init__(self, evaluate: t.Callable[["HandFilterIndex"], int], description: str) -> None:
+        self.evaluate = evaluate
+        self.description = description
+
+    def __call__(self, index: "HandFilterIndex") -> int:
+        return self.evaluate(index)
+
+    def __and__(self, other: "Filter") -> "Filter":
+        return Filter(lambda index: self(index) & other(index), f"({self.description} & {other.description})")
+
+    def __or__(self, other: "Filter") -> "Filter":
+        return Filter(lambda index: self(index) | other(index), f"({self.description} | {other.description})")
+
+    def __invert__(self) -> "Filter":
+        return Filter(lambda index: index.all & ~self(index), f"~{self.description}")
+
+    def __repr__(self) -> str:
+        return f"Filter({self.description})"
+
+
+def feature(column: str, *values: t.Any) -> Filter:
+    """Hands whose categorical feature is any of values."""
+    if column not in CATEGORICAL:
+        raise ValueError(f"Column must be one of {CATEGORICAL}. Given: {column}")
+    return Filter(lambda index: index.bitmap(column, values), f"{column} in {values!r}")
+
+
+def between(column: str, low: t.Any = None, high: t.Any = None) -> Filter:
+    """Hands whose numeric feature is within [low, high]; None leaves a side open."""
+    if column not in NUMERIC:
+        raise ValueError(f"Column must be one of {NUMERIC}. Given: {column}")
+    return Filter(lambda index: index.range_bitmap(column, low, high), f"{low!r} <= {column} <= {high!r}")
+
+
+def position(*values: t.Any) -> Filter:
+    return feature("position", *values)
+
+
+def stakes(*big_blinds: float) -> Filter:
+    return feature("big_blind", *big_blinds)
+
+
+def game_type(value: str) -> Filter:
+    return feature("game_type", value)
+
+
+def table(*names: str) -> Filter:
+    return feature("table", *names)
+
+
+def pot_type(*values: str) -> Filter:
+    return feature("pot_type", *values)
+
+
+def preflop_action(*values: str) -> Filter:
+    return feature("preflop_action", *values)
+
+
+def showdown(value: bool = True) -> Filter:
+    return feature("showdown", value)
+
+
+def won(value: bool = True) -> Filter:
+    return feature("won", value)
+
+
+def date(start: t.Optional[datetime.datetime] = None, end: t.Optional[datetime.datetime] = None) -> Filter:
+    return between("date", start, end)
+
+
+def pot(low: t.Optional[float] = None, high: t.Optional[float] = None) -> Filter:
+    return between("pot", low, high)
+
+
+class HandFilterIndex:
+    """
+    Feature columns and bitmap indexes over a list of hands.
+
+    Attributes:
+        player (Player | None): Player the features are computed for; defaults to each hand's hero
+        hands (list[Hand]): Indexed hands, bit i of a bitmap is hands[i]
+        columns (dict[str, list]): Feature columns
+        bitmaps (dict[str, dict[Any, int]]): Per categorical column, bitmap of each value
+
+    Methods:
+        add: Index more hands
+        select / count / frame: Hands, number of hands or feature rows matching a filter
+        where: Shortcut composing filters from keyword arguments
+    """
+    def __init__(self, hands: t.Iterable[Hand] = (), player: t.Optional[Player] = None) -> None:
+        self.player = player
+        self.hands: list[Hand] = []
+        self.columns: dict[str, list] = {column: [] for column in CATEGORICAL + NUMERIC}
+        self.bitmaps: dict[str, dict[t.Any, int]] = {column: {} for column in CATEGORICAL}
+        self._sorted: dict[str, tuple[list, list[int]]] = {}
+        self.add(hands)
+
+    @property
+    def all(self) -> int:
+        return (1 << len(self.hands)) - 1
+
+    def add(self, hands: t.Iterable[Hand]) -> int:
+        """Index hands the player took part in, returning how many were added."""
+        start = len(self.hands)
+        new: dict[str, dict[t.Any, list[int]]] = {column: {} for column in CATEGORICAL}
+        for hand in hands:
+            player = self.player or hand.hero
+            features = hand_features(hand, player) if player is not None else None
+            if features is None:
+                continue
+            i = len(self.hands)
+            self.hands.append(hand)
+            for column, values in self.columns.items():
+                values.append(features[column])
+            for column in CATEGORICAL:
+                new[column].setdefault(features[column], []).append(i)
+        size = len(self.hands)
+        for column, by_value in new.items():
+            bitmaps = self.bitmaps[column]
+            for value, positions in by_value.items():
+                bitmaps[value] = bitmaps.get(value, 0) | _bitmap(positions, size)
+        if size > start:
+            self._sorted.clear()
+        return size - start
+
+    def bitmap(self, column: str, values: t.Iterable[t.Any]) -> int:
+        bitmaps = self.bitmaps[column]
+        bits = 0
+        for value in values:
+            bits |= bitmaps.get(value, 0)
+        return bits
+
+    def range_bitmap(self, column: str, low: t.Any = None, high: t.Any = None) -> int:
+        if column not in self._sorted:
+            order = sorted((i for i, v in enumerate(self.columns[column]) if v is not None), key=self.columns[column].__getitem__)
+            self._sorted[column] = ([self.columns[column][i] for i in order], order)
+        values, order = self._sorted[column]
+        lo = 0 if low is None else bisect.bisect_left(values, low)
+        hi = len(values) if high is None else bisect.bisect_right(values, high)
+        return _bitmap(order[lo:hi], len(self.hands))
+
+    def indices(self, query: Filter) -> list[int]:
+        return list(_positions(query(self)))
+
+    def select(self, query: Filter) -> list[Hand]:
+        return [self.hands[i] for i in _positions(query(self))]
+
+    def count(self, query: Filter) -> int:
+        return query(self).bit_count()
+
+    def frame(self, query: t.Optional[Filter] = None) -> pl.DataFrame:
+        """Feature rows (with hand ids) of the hands matching query, or of every hand."""
+        rows = range(len(self.hands)) if query is None else self.indices(query)
+        return pl.DataFrame({
+            "hand_id": [self.hands[i].id for i in rows],
+            **{column: [values[i] for i in rows] for column, values in self.columns.items()},
+        })
+
+    def where(self, **conditions: t.Any) -> Filter:
+        """
+        Compose a filter from keywords: categorical columns take a value or a
+        list of values, numeric columns a (low, high) tuple.
+        """
+        query: t.Optional[Filter] = None
+        for column, value in conditions.items():
+            if column in NUMERIC:
+                part = between(column, *value)
+            elif isinstance(value, (list, tuple, set)):
+                part = feature(column, *value)
+            else:
+                part = feature(column, value)
+            query = part if query is None else query & part
+        return query if query is not None else Filter(lambda index: index.all, "all")
+
+    def __len__(self) -> int:
+        return len(self.hands)
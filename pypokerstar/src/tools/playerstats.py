@@ -1,29 +1,140 @@
+"""
+Per player hand lookup and ranges.
+
+PlayerHandIndex maps each player name to the hands they were dealt in, built
+once per History (and extended as hands are added) instead of scanning every
+hand's player list per query. PlayerStats uses it to build the player's
+preflop ranges as 169-class count arrays per position, in one pass over the
+player's own hands, cached until new hands arrive.
+
+Classes:
+    PlayerHandIndex: Player name -> positions of their hands in a hand list
+    PlayerStats: Hands and ranges of one player
+"""
+
 import typing as t
+import weakref
+from array import array
+from collections import defaultdict
+
+from pypokerstar.src.game.poker import Hand, History, Player, player_position
+from pypokerstar.src.types.cards import HAND_CLASSES, hand_class_index
+
+RANGE_ACTIONS = ("raises", "calls")
+
+_history_indexes: "weakref.WeakKeyDictionary[History, PlayerHandIndex]" = weakref.WeakKeyDictionary()
+
+
+class PlayerHandIndex:
+    """
+    Positions of each player's hands in a list of hands.
+
+    Attributes:
+        hands (list[Hand]): Indexed hands
+        by_player (dict[str, list[int]]): Player name -> indexes into hands
 
-from pypokerstar.src.game.poker import Hand, Player
-from pypokerstar.src.types import Card, Pair
+    Methods:
+        add: Index more hands
+        hands_of: Hands a player was dealt in
+        for_history: Shared index of a History, extended with its new hands
+    """
+    def __init__(self, hands: t.Iterable[Hand] = ()) -> None:
+        self.hands: list[Hand] = []
+        self.by_player: dict[str, list[int]] = defaultdict(list)
+        self.add(hands)
+
+    def add(self, hands: t.Iterable[Hand]) -> None:
+        for hand in hands:
+            i = len(self.hands)
+            self.hands.append(hand)
+            for player in hand.players:
+                if player is not None:
+                    self.by_player[player.name].append(i)
+
+    def hands_of(self, name: str) -> list[Hand]:
+        return [self.hands[i] for i in self.by_player.get(name, ())]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.by_player
+
+    def __len__(self) -> int:
+        return len(self.hands)
+
+    @classmethod
+    def for_history(cls, history: History) -> "PlayerHandIndex":
+        index = _history_indexes.get(history)
+        if index is None:
+            index = _history_indexes[history] = cls()
+        if len(index) < len(history.hands):
+            index.add(history.hands[len(index):])
+        return index
 
 
 class PlayerStats:
-    def __init__(self, player: Player, hands: t.Iterable[Hand]) -> None:
-        self.hands = hands
+    """
+    Hands and preflop ranges of one player.
+
+    Attributes:
+        player (Player): The player
+        index (PlayerHandIndex): Hand index the player's hands come from
+        hands (list[Hand]): Hands the player was dealt in
+
+    Methods:
+        get_range_arrays: Per position, hands played (raise or call preflop) with
+            known cards as 169 counts in HAND_CLASSES order
+        get_range: Hand class -> count, for one position or all of them
+    """
+    def __init__(
+        self,
+        player: Player,
+        hands: t.Union[History, PlayerHandIndex, t.Iterable[Hand]],
+    ) -> None:
         self.player = player
+        if isinstance(hands, History):
+            self.index = PlayerHandIndex.for_history(hands)
+        elif isinstance(hands, PlayerHandIndex):
+            self.index = hands
+        else:
+            self.index = PlayerHandIndex(hands)
+        self._ranges: t.Optional[dict[str, array]] = None
+        self._ranges_size = 0
+
+    @property
+    def hands(self) -> list[Hand]:
+        return self.index.hands_of(self.player.name)
+
+    def get_range_arrays(self) -> dict[str, array]:
+        positions = self.index.by_player.get(self.player.name, [])
+        if self._ranges is not None and self._ranges_size == len(positions):
+            return self._ranges
+        ranges = self._ranges if self._ranges is not None else {}
+        name = self.player.name
+        # only hands added since the cached ranges are counted
+        for i in positions[self._ranges_size:]:
+            hand = self.index.hands[i]
+            player = hand.get_player(name)
+            cards = player.cards if player is not None else None
+            if not cards or len(cards) != 2:
+                continue
+            hole_cards = hand.get_round("hole cards")
+            if hole_cards is None:
+                continue
+            if any(bet.type in RANGE_ACTIONS and getattr(bet.player, "name", None) == name for bet in hole_cards.bets):
+                position = player_position(hand, player) or "unknown"
+                if position not in ranges:
+                    ranges[position] = array("I", [0]) * len(HAND_CLASSES)
+                ranges[position][hand_class_index(*cards)] += 1
+        self._ranges = ranges
+        self._ranges_size = len(positions)
+        return ranges
 
-        self.hands = self._filter_hands()
-
-    def _filter_hands(self) -> t.Iterable[Hand]:
-        return [hand for hand in self.hands if self.player in hand.players]
-
-    def get_range(self) -> dict[int, t.Iterable[Card]]:
-        range = {}
-        """Returns a dictionary with the range the player playis in each position"""
-        for hand in self.hands:
-            cards = hand.get_player(self.player.name).cards
-            round = hand.get_round("hole cards")
-            for bet in round.bets:
-                if (bet.player == self.player) and (bet.type in ["raises", "calls"]):
-                    if range.get(Pair(*cards), None) is None:
-                        range[Pair(*cards)] = 1
-                    else:
-                        range[Pair(*cards)] += 1
-        return range
+    def get_range(self, position: t.Optional[str] = None) -> dict[str, int]:
+        """Returns hand class -> times played, in the given position or in all of them."""
+        arrays = self.get_range_arrays()
+        if position is not None:
+            arrays = {position: arrays[position]} if position in arrays else {}
+        totals = [0] * len(HAND_CLASSES)
+        for counts in arrays.values():
+            for i, n in enumerate(counts):
+                totals[i] += n
+        return {HAND_CLASSES[i]: n for i, n in enumerate(totals) if n}
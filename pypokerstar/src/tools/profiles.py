@@ -0,0 +1,230 @@
+"""
+Persistent opponent profiles.
+
+A profile holds the running counters of one player (hands, VPIP, PFR, 3bet,
+showdowns, money in and out) and, per position, histograms of the hand
+classes shown down as opener, caller or 3bettor. Profiles are updated one
+hand at a time, so looking up a villain is a dict access instead of a replay
+of every hand they played, and the store can be saved to and reloaded from a
+JSON file between sessions.
+
+Classes:
+    OpponentProfile: Counters and per-position showdown ranges of one player
+    ProfileStore: Profiles keyed by player name, optionally persisted to JSON
+"""
+
+import datetime
+import json
+import os
+import typing as t
+from collections import Counter
+
+from pypokerstar.src.game.poker import Hand, player_hand_stats, player_position
+from pypokerstar.src.parsers.index import HandIndex
+from pypokerstar.src.types.cards import HAND_CLASS_INDEX, RANKS
+
+COUNTERS = ("hands", "vpip", "pfr", "3bet", "wtsd", "w$sd", "showdown_seen")
+RANGE_KINDS = ("openers", "callers", "3bet")
+
+
+def _empty_position() -> dict[str, t.Any]:
+    return {**{kind: Counter() for kind in RANGE_KINDS}, "total_seen": 0}
+
+
+def _hand_class(cards: str) -> str:
+    """HAND_CLASSES key of a hand class written in any rank order (older profiles have "KAs")."""
+    high, low = sorted(cards[:2], key=RANKS.index)
+    key = high + low + cards[2:]
+    if key not in HAND_CLASS_INDEX:
+        raise ValueError(f"Not a hand class: {cards!r}")
+    return key
+
+
+def _hand_classes(counts: dict[str, int]) -> Counter:
+    out: Counter = Counter()
+    for cards, n in counts.items():
+        out[_hand_class(cards)] += n
+    return out
+
+
+class OpponentProfile:
+    """
+    Running statistics of a single player.
+
+    Attributes:
+        name (str): Player name
+        counters (dict[str, int]): Hands played and how many of them were VPIP, PFR, 3bet,
+            went to showdown, won at showdown, and showed cards
+        invested (float): Money put in the pot
+        collected (float): Money collected from the pot
+        positions (dict[str, dict]): Per position label (BTN, SB, ...), Counters of the showdown hand classes
+            (HAND_CLASSES keys, as PlayerStats uses) of `openers`, `callers` and `3bet` plus `total_seen`
+        last_hand_at (datetime | None): Date of the most recent hand added
+        updated_at (datetime | None): When the profile was last updated
+
+    Methods:
+        add: Add the stats of one hand
+        range: Showdown histogram for a position and kind
+    """
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.counters: dict[str, int] = {key: 0 for key in COUNTERS}
+        self.invested = 0.0
+        self.collected = 0.0
+        self.positions: dict[str, dict[str, t.Any]] = {}
+        self.last_hand_at: t.Optional[datetime.datetime] = None
+        self.updated_at: t.Optional[datetime.datetime] = None
+
+    def add(self, row: dict[str, t.Any], position: t.Any, date: t.Optional[datetime.datetime] = None) -> None:
+        """Add one hand given its player_hand_stats row and the player's position."""
+        c = self.counters
+        c["hands"] += 1
+        for flag in ("vpip", "pfr", "3bet", "wtsd", "w$sd"):
+            c[flag] += bool(row[flag])
+        self.invested += row["invested"]
+        self.collected += row["collected"]
+        cards = _hand_class(row["showdown_cards"]) if row["showdown_cards"] else None
+        if cards:
+            c["showdown_seen"] += 1
+            pos = self.positions.setdefault(str(position or "unknown"), _empty_position())
+            pos["total_seen"] += 1
+            if row["3bet"]:
+                pos["3bet"][cards] += 1
+            elif row["pfr"]:
+                pos["openers"][cards] += 1
+            elif row["vpip"]:
+                pos["callers"][cards] += 1
+        if date is not None and (self.last_hand_at is None or date > self.last_hand_at):
+            self.last_hand_at = date
+        self.updated_at = datetime.datetime.now()
+
+    def range(self, position: t.Any, kind: str = "openers") -> Counter:
+        if kind not in RANGE_KINDS:
+            raise ValueError(f"Range kind must be one of {RANGE_KINDS}. Given: {kind}")
+        pos = self.positions.get(str(position))
+        return pos[kind] if pos else Counter()
+
+    @property
+    def hands(self) -> int:
+        return self.counters["hands"]
+
+    @property
+    def net(self) -> float:
+        return self.collected - self.invested
+
+    def rate(self, key: str) -> float:
+        return self.counters[key] / self.hands if self.hands else 0.0
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "name": self.name,
+            "counters": self.counters,
+            "invested": self.invested,
+            "collected": self.collected,
+            "positions": {
+                key: {**{kind: dict(pos[kind]) for kind in RANGE_KINDS}, "total_seen": pos["total_seen"]}
+                for key, pos in self.positions.items()
+            },
+            "last_hand_at": self.last_hand_at.isoformat() if self.last_hand_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, t.Any]) -> "OpponentProfile":
+        profile = cls(data["name"])
+        profile.counters.update(data["counters"])
+        profile.invested = data["invested"]
+        profile.collected = data["collected"]
+        for key, pos in data["positions"].items():
+            profile.positions[key] = {**{kind: _hand_classes(pos[kind]) for kind in RANGE_KINDS}, "total_seen": pos["total_seen"]}
+        for attr in ("last_hand_at", "updated_at"):
+            if data.get(attr):
+                setattr(profile, attr, datetime.datetime.fromisoformat(data[attr]))
+        return profile
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.hands} hands, VPIP {100 * self.rate('vpip'):.1f}%, "
+            f"PFR {100 * self.rate('pfr'):.1f}%, 3bet {100 * self.rate('3bet'):.1f}%"
+        )
+
+    def __repr__(self) -> str:
+        return f"OpponentProfile({self.name!r}, hands={self.hands})"
+
+
+class ProfileStore:
+    """
+    Opponent profiles keyed by player name.
+
+    Hand ids already added are kept in a HandIndex, so feeding the same hands
+    again (a re-parsed folder, a watcher restart) does not count them twice.
+
+    Attributes:
+        path (str | None): JSON file the store is loaded from and saved to
+        profiles (dict[str, OpponentProfile]): Profiles by player name
+        index (HandIndex): Ids of the hands already added
+
+    Methods:
+        add_hand: Update the profiles of the players of a hand
+        update: Add many hands
+        get: Profile of a player, or None
+        load / save: Read or write the JSON file
+    """
+    def __init__(self, path: t.Optional[str] = None) -> None:
+        self.path = path
+        self.profiles: dict[str, OpponentProfile] = {}
+        self.index = HandIndex()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def add_hand(self, hand: Hand) -> bool:
+        """Add a hand to its players' profiles, returning False if it was already added."""
+        if hand.id is not None and not self.index.add(hand.id):
+            return False
+        stats = player_hand_stats(hand)
+        for player in hand.players:
+            if player is None:
+                continue
+            profile = self.profiles.get(player.name)
+            if profile is None:
+                profile = self.profiles[player.name] = OpponentProfile(player.name)
+            profile.add(stats[player.name], player_position(hand, player), hand.date)
+        return True
+
+    def update(self, hands: t.Iterable[Hand]) -> int:
+        """Add hands, returning how many were new."""
+        return sum(self.add_hand(hand) for hand in hands)
+
+    def get(self, name: str) -> t.Optional[OpponentProfile]:
+        return self.profiles.get(name)
+
+    def __getitem__(self, name: str) -> OpponentProfile:
+        return self.profiles[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.profiles
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def load(self, path: t.Optional[str] = None) -> None:
+        with open(path or self.path, "r") as file:
+            data = json.load(file)
+        self.index.ids.update(data.get("hand_ids", []))
+        for item in data.get("profiles", []):
+            profile = OpponentProfile.from_dict(item)
+            self.profiles[profile.name] = profile
+
+    def save(self, path: t.Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given to save the profile store")
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        data = {
+            "hand_ids": sorted(self.index.ids),
+            "profiles": [profile.to_dict() for profile in self.profiles.values()],
+        }
+        with open(path, "w") as file:
+            json.dump(data, file)
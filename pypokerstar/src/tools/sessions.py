@@ -0,0 +1,171 @@
+"""
+Playing sessions.
+
+Hands are grouped per table into sessions: consecutive hands at the same
+table belong to one session as long as the gap between them is below a
+threshold. Each session keeps its running summary (hands, duration, net,
+rake, net in big blinds), so the session list is ready as soon as hands are
+added and new hands only touch the session of their table.
+
+Classes:
+    Session: Summary of one playing session at a table
+    SessionTracker: Incremental segmentation of hands into sessions
+"""
+
+import datetime
+import typing as t
+
+import polars as pl
+
+from pypokerstar.src.game.poker import Hand, Player, hand_big_blind, hand_table
+
+
+class Session:
+    """
+    A run of hands at one table without a break longer than the tracker gap.
+
+    Attributes:
+        table (str): Table name
+        game_type (str): cash or tournament
+        start (datetime): Date of the first hand
+        end (datetime): Date of the last hand
+        hands (int): Number of hands
+        net (float): Player result over the session
+        net_bb (float): Player result in big blinds of each hand
+        rake (float): Rake of the pots played
+
+    Methods:
+        add: Add one hand record to the summary
+    """
+    def __init__(self, table: str, game_type: str, start: datetime.datetime) -> None:
+        self.table = table
+        self.game_type = game_type
+        self.start = start
+        self.end = start
+        self.hands = 0
+        self.net = 0.0
+        self.net_bb = 0.0
+        self.rake = 0.0
+
+    def add(self, date: datetime.datetime, net: float, rake: float, big_blind: t.Optional[float]) -> None:
+        self.start = min(self.start, date)
+        self.end = max(self.end, date)
+        self.hands += 1
+        self.net += net
+        self.rake += rake
+        if big_blind:
+            self.net_bb += net / big_blind
+
+    @property
+    def duration(self) -> datetime.timedelta:
+        return self.end - self.start
+
+    @property
+    def hands_per_hour(self) -> float:
+        hours = self.duration.total_seconds() / 3600
+        return self.hands / hours if hours else float(self.hands)
+
+    @property
+    def bb_per_100(self) -> float:
+        return 100 * self.net_bb / self.hands if self.hands else 0.0
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "table": self.table,
+            "game_type": self.game_type,
+            "start": self.start,
+            "end": self.end,
+            "minutes": self.duration.total_seconds() / 60,
+            "hands": self.hands,
+            "hands_per_hour": self.hands_per_hour,
+            "net": self.net,
+            "bb_per_100": self.bb_per_100,
+            "rake": self.rake,
+        }
+
+    def __str__(self) -> str:
+        return f"Session at {self.table} from {self.start} to {self.end}: {self.hands} hands, net {self.net:.2f}"
+
+    def __repr__(self) -> str:
+        return f"Session({self.table!r}, {self.start}, hands={self.hands})"
+
+
+class SessionTracker:
+    """
+    Segments the hands of a player into sessions, incrementally.
+
+    Hands are reduced to small per-hand records grouped by table. Hands that
+    arrive in date order extend or open the last session of their table;
+    an out-of-order hand only re-segments its own table.
+
+    Attributes:
+        player (Player | None): Player whose results are summed; defaults to each hand's hero
+        gap (timedelta): Longest break between two hands of the same session
+        sessions (dict[str, list[Session]]): Sessions per table, in date order
+
+    Methods:
+        add_hands: Add hands (usable as a HandHistoryWatcher callback)
+        get_sessions: All sessions ordered by start date
+        summary: DataFrame with one row per session
+    """
+    def __init__(self, player: t.Optional[Player] = None, gap: datetime.timedelta = datetime.timedelta(minutes=30)) -> None:
+        self.player = player
+        self.gap = gap
+        self.sessions: dict[str, list[Session]] = {}
+        self._records: dict[str, list[tuple]] = {}
+        self._seen: set[str] = set()
+        self._summary: t.Optional[pl.DataFrame] = None
+
+    def _record(self, hand: Hand) -> t.Optional[tuple]:
+        player = self.player or hand.hero
+        if hand.date is None or player is None or hand.get_player(player.name) is None:
+            return None
+        net = next((v for p, v in hand.result.items() if p.name == player.name), 0.0)
+        return (hand.date, net, hand.rake or 0.0, hand_big_blind(hand), hand.game_type)
+
+    def _append(self, table: str, record: tuple) -> None:
+        date, net, rake, big_blind, game_type = record
+        sessions = self.sessions.setdefault(table, [])
+        if not sessions or date - sessions[-1].end > self.gap:
+            sessions.append(Session(table, game_type, date))
+        sessions[-1].add(date, net, rake, big_blind)
+
+    def _rebuild(self, table: str) -> None:
+        self._records[table].sort(key=lambda r: r[0])
+        self.sessions[table] = []
+        for record in self._records[table]:
+            self._append(table, record)
+
+    def add_hands(self, hands: t.Iterable[Hand]) -> int:
+        """Add hands not seen yet, returning how many were added."""
+        new: dict[str, list[tuple]] = {}
+        for hand in hands:
+            if hand.id in self._seen:
+                continue
+            record = self._record(hand)
+            if record is None:
+                continue
+            self._seen.add(hand.id)
+            new.setdefault(hand_table(hand), []).append(record)
+        for table, records in new.items():
+            records.sort(key=lambda r: r[0])
+            stored = self._records.setdefault(table, [])
+            in_order = not stored or records[0][0] >= stored[-1][0]
+            stored.extend(records)
+            if in_order:
+                for record in records:
+                    self._append(table, record)
+            else:
+                self._rebuild(table)
+        if new:
+            self._summary = None
+        return sum(len(records) for records in new.values())
+
+    def get_sessions(self) -> list[Session]:
+        return sorted((s for sessions in self.sessions.values() for s in sessions), key=lambda s: s.start)
+
+    def summary(self) -> pl.DataFrame:
+        """One row per session, ordered by start date; cached until hands are added."""
+        if self._summary is None:
+            self._summary = pl.DataFrame([s.to_dict() for s in self.get_sessions()])
+        return self._summary
@@ -11,11 +11,12 @@ Classes:
 """
 
 
-import itertools
-import random
 import typing as t
+from array import array
 
-from pydantic import BaseModel
+import numpy as np
+
+from pypokerstar.src.types.rng import Seed, UniformBuffer, make_rng
 
 SPADES = "♠️"
 CLUBS = "♣️"
@@ -25,6 +26,75 @@ DIAMONDS = "♦️"
 SUITS = {"s": SPADES, "c": CLUBS, "h": HEARTS, "d": DIAMONDS}
 REVERSE_SUITS = {v: k for k, v in SUITS.items()}
 
+# Starting hand classes in range-grid order (row-major over RANKS), the same
+# layout the range editor uses and backend/encoding.py imports for the "pr1"
+# wire format: pairs on the diagonal, suited hands above it and offsuit hands
+# below it.
+RANKS = "AKQJT98765432"
+
+
+def _hand_classes() -> list[str]:
+    hands = []
+    for i, r1 in enumerate(RANKS):
+        for j, r2 in enumerate(RANKS):
+            if i == j:
+                hands.append(r1 + r2)
+            elif i < j:
+                hands.append(r1 + r2 + "s")
+            else:
+                hands.append(r2 + r1 + "o")
+    return hands
+
+
+HAND_CLASSES: list[str] = _hand_classes()
+HAND_CLASS_INDEX: dict[str, int] = {h: i for i, h in enumerate(HAND_CLASSES)}
+
+
+def rank_index(number: int) -> int:
+    """Position of a card number (1-13, Ace = 1) in RANKS."""
+    return 0 if number == 1 else 14 - number
+
+
+def hand_class_index(card1: "Card", card2: "Card") -> int:
+    """Index in HAND_CLASSES of the starting hand made of two cards."""
+    i, j = rank_index(card1.number), rank_index(card2.number)
+    if card1.suit == card2.suit and i != j:
+        return min(i, j) * 13 + max(i, j)
+    return max(i, j) * 13 + min(i, j)
+
+
+# Cards are numbered 0-51 as rank_index * 4 + suit (SUITS order), and the 1326
+# two-card combos 0-1325 over pairs of card numbers lo < hi as hi * (hi - 1) / 2 + lo.
+# Both lookups below are built once so a Pair resolves its ids with two list reads.
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS.values())}
+
+
+def card_index(card: "Card") -> int:
+    """Number 0-51 of a card."""
+    return rank_index(card.number) * 4 + SUIT_INDEX[card.suit]
+
+
+def _combo_tables() -> tuple[list[int], list[int]]:
+    combo_index = [-1] * (52 * 52)
+    combo_class = [0] * 1326
+    for hi in range(52):
+        for lo in range(hi):
+            combo = hi * (hi - 1) // 2 + lo
+            combo_index[lo * 52 + hi] = combo_index[hi * 52 + lo] = combo
+            i, j = lo // 4, hi // 4
+            if i == j:
+                combo_class[combo] = i * 13 + i
+            elif lo % 4 == hi % 4:
+                combo_class[combo] = i * 13 + j
+            else:
+                combo_class[combo] = j * 13 + i
+    return combo_index, combo_class
+
+
+# card_index(a) * 52 + card_index(b) -> combo id (-1 for the same card twice)
+COMBO_INDEX, COMBO_CLASS = _combo_tables()
+
+
 class Card:
     """
     Represents a single playing card.
@@ -142,6 +212,9 @@ class Card:
 class Pair:
     """
     Represents a two-card poker hand combination.
+
+    Pairs compare and hash by their starting hand class, so AsKs and AhKh are
+    equal; class_id and combo_id can be used directly as array indexes.
     
     Attributes:
         cards (list[Card]): The two cards in sorted order
@@ -149,65 +222,139 @@ class Pair:
         card2 (Card): Second/higher card
         suited (bool): Whether cards are same suit
         pocket_pair (bool): Whether cards are same number
+        combo_id (int): Index of the exact two cards among the 1326 combos
+        class_id (int): Index of the starting hand in HAND_CLASSES (169 classes)
         hand (str): Standard hand notation (e.g. "AKs" for suited Ace-King)
     """
     def __init__(self, card1: Card, card2: Card) -> None:
         self.cards = sorted([card1, card2], key=lambda x: x.number)
         self.card1 = self.cards[0]
         self.card2 = self.cards[1]
-        self.suited: bool = False
-        self.pocket_pair = False
-        self.hand = ""
-        if card1.number == card2.number:
-            self.hand = str(card1.number) + str(card2.number)
-            self.pocket_pair = True
-
-        if self.card1.suited(self.card2):
-            self.hand = str(self.card1)[0] + str(self.card2)[0] + "s"
-            self.suited = True
-
-        else:
-            self.hand = str(self.card1)[0] + str(self.card2)[0] + "o"
-
-    def __eq__(self, other: "Pair") -> bool:
-        return self.hand == other.hand
+        self.combo_id = COMBO_INDEX[card_index(card1) * 52 + card_index(card2)]
+        if self.combo_id < 0:
+            raise ValueError(f"A pair needs two different cards. Given: {card1} {card2}")
+        self.class_id = COMBO_CLASS[self.combo_id]
+        self.pocket_pair = card1.number == card2.number
+        self.suited = card1.suit == card2.suit
+        self.hand = HAND_CLASSES[self.class_id]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Pair):
+            return NotImplemented
+        return self.class_id == other.class_id
 
-    def __hash__(self):
-        return (
-            self.cards[0].number * 100
-            + self.cards[1].number * 10
-            + (1 if self.cards[0].suited(self.cards[1]) else 0)
-        )
+    def __hash__(self) -> int:
+        return self.class_id
 
     def __str__(self) -> str:
         return str(self.hand)
 
+    def __repr__(self) -> str:
+        return f"Pair({self.card1!r}, {self.card2!r})"
+
 
 class Deck:
     """
-    Implementation of standard 52-card poker deck.
-    
+    Standard 52-card poker deck backed by an array of card numbers (card_index).
+
+    The array is a permutation of the 52 cards split in three regions:
+    [0, size) live cards, [size, base) cards dealt since the last reset and
+    [base, 52) dead cards taken out with remove_cards. Dealing picks a random
+    live card and swaps it to the end of the live region, so a draw costs one
+    random number and no shuffle is needed; removing a card is a swap through
+    the card -> position array, and reset puts every dealt card back in O(1).
+    Dead cards are also kept as a bitmask (bit card_index set).
+
     Attributes:
-        cards (list[Card]): Remaining cards in the deck
-        
+        order (array): Card numbers, live cards first
+        size (int): Number of live cards
+        base (int): Number of cards that are not dead
+        dead (int): Bitmask of the dead cards
+        rng (np.random.Generator): Random generator; a seed or a Generator from
+            spawn_rngs makes the deals reproducible
+        cards (list[Card]): Live cards
+
     Methods:
-        draw: Removes and returns top card(s) from deck
+        deal: Deal card numbers
+        draw: Deal Card objects
+        remove_cards: Take cards out of the deck until reset(keep_dead=False)
+        reset: Put the dealt (and optionally the dead) cards back
+        shuffle: Put the dealt cards back, in a random order
     """
-    def __init__(self) -> None:
-        self.cards = [
-            [Card(number=n, suit=suit) for n in range(1, 13, 1)] for suit in SUITS.values()
-        ]
-        self.cards = list(itertools.chain.from_iterable(self.cards))
-        random.shuffle(self.cards)
-
-    def draw(self, cards: int = 1) -> Card:
-        return self.cards.pop(0)
-    
+    def __init__(self, seed: Seed = None, rng: t.Optional[np.random.Generator] = None) -> None:
+        self.rng = make_rng(rng if rng is not None else seed)
+        self._uniforms = UniformBuffer(self.rng)
+        self.order = array("B", range(52))
+        self.positions = array("B", range(52))
+        self.size = 52
+        self.base = 52
+        self.dead = 0
+
+    def _swap(self, i: int, j: int) -> None:
+        order, positions = self.order, self.positions
+        a, b = order[i], order[j]
+        order[i], order[j] = b, a
+        positions[b], positions[a] = i, j
+
+    def deal(self, cards: int = 1) -> list[int]:
+        if cards > self.size:
+            raise ValueError(f"Cannot deal {cards} cards from a deck of {self.size}")
+        order, positions = self.order, self.positions
+        dealt = []
+        size = self.size
+        for u in self._uniforms.take(cards):
+            i = int(u * size)
+            size -= 1
+            a, b = order[i], order[size]
+            order[i], order[size] = b, a
+            positions[b], positions[a] = i, size
+            dealt.append(a)
+        self.size = size
+        return dealt
+
+    def draw(self, cards: int = 1) -> t.Union[Card, list[Card]]:
+        dealt = [DECK_CARDS[i] for i in self.deal(cards)]
+        return dealt[0] if cards == 1 else dealt
+
+    def remove_cards(self, *cards: Card) -> None:
+        for card in cards:
+            i = card_index(card)
+            if self.dead >> i & 1:
+                continue
+            position = self.positions[i]
+            if position < self.size:
+                self.size -= 1
+                self._swap(position, self.size)
+                position = self.size
+            self.base -= 1
+            self._swap(position, self.base)
+            self.dead |= 1 << i
+
+    def reset(self, keep_dead: bool = True) -> None:
+        if not keep_dead:
+            self.base = 52
+            self.dead = 0
+        self.size = self.base
+
     def shuffle(self) -> None:
-        random.shuffle(self.cards)
+        self.reset()
+        for i, u in zip(range(self.size - 1, 0, -1), self._uniforms.take(self.size - 1)):
+            self._swap(i, int(u * (i + 1)))
+
+    @property
+    def cards(self) -> list[Card]:
+        return [DECK_CARDS[i] for i in self.order[:self.size]]
+
+    def __contains__(self, card: Card) -> bool:
+        return self.positions[card_index(card)] < self.size
+
+    def __len__(self) -> int:
+        return self.size
+
 
-    def remove_cards(self, *cards: t.Iterable[Card]) -> None:
-        self.cards = [c for c in self.cards if c not in cards]
+# Card objects by card_index, shared by every Deck
+DECK_CARDS: list[Card] = [Card(number=n, suit=suit) for n in range(1, 14) for suit in SUITS.values()]
+DECK_CARDS.sort(key=card_index)
 
 
 class Range:
@@ -0,0 +1,63 @@
+"""
+Seeded random number streams.
+
+Simulations take an explicit NumPy Generator instead of the global random
+module, so a run is reproducible from its seed and parallel workers never
+share state. spawn_rngs derives independent child streams from one seed via
+SeedSequence.spawn: worker i always gets the same stream for a given root
+seed, whatever the number of processes or the order they run in.
+
+Classes:
+    UniformBuffer: Uniform floats drawn from a Generator in blocks
+"""
+
+import typing as t
+
+import numpy as np
+
+Seed = t.Union[None, int, t.Sequence[int], np.random.SeedSequence, np.random.Generator]
+
+
+def make_rng(seed: Seed = None) -> np.random.Generator:
+    """Generator for a seed; a Generator is returned as is so it can be shared."""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_rngs(seed: Seed, n: int) -> list[np.random.Generator]:
+    """n independent Generators derived from one seed."""
+    if isinstance(seed, np.random.Generator):
+        return list(seed.spawn(n))
+    sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in sequence.spawn(n)]
+
+
+class UniformBuffer:
+    """
+    Uniform floats in [0, 1) drawn from a Generator a block at a time.
+
+    Calling the Generator for every single number costs more than the work
+    done with it in the dealing loops; a block is drawn as one array and
+    handed out from a list.
+
+    Attributes:
+        rng (np.random.Generator): Source generator
+        block (int): Numbers drawn per refill
+
+    Methods:
+        take: The next n numbers
+    """
+    def __init__(self, rng: np.random.Generator, block: int = 4096) -> None:
+        self.rng = rng
+        self.block = block
+        self._values: list[float] = []
+        self._next = 0
+
+    def take(self, n: int) -> list[float]:
+        if self._next + n > len(self._values):
+            self._values = self.rng.random(max(n, self.block)).tolist()
+            self._next = 0
+        start = self._next
+        self._next += n
+        return self._values[start:self._next]
@@ -0,0 +1,48 @@
+import typing as t
+
+import pytest
+
+from pypokerstar.src.game.poker import Bet, Hand, Player, Round
+from pypokerstar.src.types.cards import Card
+
+
+@pytest.fixture
+def make_hand() -> t.Callable[..., Hand]:
+    """
+    Build a Hand from players in seat order and rounds given as
+    {round name: [(player name, bet type, amount), ...]}; seat 1 has the button.
+    """
+    def build(names: t.Sequence[str], rounds: dict[str, list[tuple]], board: str = "", cards: t.Optional[dict[str, str]] = None) -> Hand:
+        players = {name: Player(name=name, pot=100, seat=seat) for seat, name in enumerate(names, start=1)}
+        for name, hole in (cards or {}).items():
+            players[name].cards = [Card.from_string(c) for c in hole.split()]
+        built = []
+        for round_name, bets in rounds.items():
+            rnd = Round(round_name)
+            for name, bet_type, amount in bets:
+                rnd.add_bet(Bet(players[name], bet_type, amount))
+            if round_name == "flop" and board:
+                rnd.update_board(*[Card.from_string(c) for c in board.split()[:3]])
+            built.append(rnd)
+        header = "PokerStars Hand #1: Hold'em No Limit (€0.01/€0.02) - Table 'Test' 6-max Seat #1 is the button"
+        return Hand(id="1", raw_text=header, players=players.values(), rounds=built)
+    return build
+
+
+@pytest.fixture(scope="session")
+def backend(tmp_path_factory):
+    """backend.main on a throwaway SQLite database, imported once per test session."""
+    import os
+
+    database = tmp_path_factory.mktemp("db") / "ranges.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    from backend import main
+    return main
+
+
+@pytest.fixture
+def client(backend):
+    from fastapi.testclient import TestClient
+
+    with TestClient(backend.app) as test_client:
+        yield test_client
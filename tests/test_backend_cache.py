@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+from backend import cache
+from backend.cache import MemoryResponseCache, make_entry
+
+RANGE = {"player": "cache", "category": "Ranges", "position": "UTG", "cardRange": {"AA": {"raise": 100}}}
+
+
+def test_delete_invalidates_if_modified_since(client, backend, monkeypatch):
+    # the delete lands in a later second than the first response
+    later = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=2)
+    for name in ("keep", "drop"):
+        assert client.post("/ranges/save", json={**RANGE, "name": name}).status_code == 200
+    params = {"player": "cache", "category": "Ranges", "position": "UTG"}
+    first = client.get("/names", params=params)
+    assert first.json() == ["drop", "keep"]
+    last_modified = first.headers["Last-Modified"]
+    assert client.get("/names", params=params, headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    monkeypatch.setattr(cache, "_change_time", lambda: later)
+    assert client.request("DELETE", "/ranges/delete", json={**RANGE, "name": "drop"}).status_code == 200
+    after = client.get("/names", params=params, headers={"If-Modified-Since": last_modified})
+    assert after.status_code == 200
+    assert after.json() == ["keep"]
+    assert after.headers["Last-Modified"] != last_modified
+
+
+def test_etag_round_trip(client):
+    params = {"player": "cache"}
+    first = client.get("/ranges/tree", params=params)
+    again = client.get("/ranges/tree", params=params, headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_same_second_changes_are_told_apart_by_etag(client):
+    params = {"player": "cache-etag"}
+    body = {**RANGE, "player": "cache-etag"}
+    assert client.post("/ranges/save", json={**body, "name": "one"}).status_code == 200
+    first = client.get("/ranges/tree", params=params)
+    assert client.post("/ranges/save", json={**body, "name": "two"}).status_code == 200
+    after = client.get("/ranges/tree", params=params, headers={"If-None-Match": first.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != first.headers["ETag"]
+
+
+def test_change_time_follows_the_clock():
+    response_cache = MemoryResponseCache()
+    for i in range(2000):
+        response_cache.invalidate(f"player{i}")
+    now = datetime.utcnow()
+    assert response_cache.changed_at(None) <= now
+    assert response_cache.changed_at("player7") <= now
+    assert response_cache.version("player7") == 8
+    assert response_cache.version(None) == 2000
+    response_cache.invalidate()
+    assert response_cache.version("player7") == 2001
+
+
+def test_response_built_during_a_write_is_not_cached(client, backend, monkeypatch):
+    params = {"player": "cache-race"}
+    assert client.post("/ranges/save", json={**RANGE, "player": "cache-race", "name": "one"}).status_code == 200
+    encode = backend.jsonable_encoder
+
+    def write_while_building(body):
+        # a save for the same player lands between reading the rows and caching them
+        backend.response_cache.invalidate("cache-race")
+        return encode(body)
+
+    monkeypatch.setattr(backend, "jsonable_encoder", write_while_building)
+    client.get("/ranges/tree", params=params)
+    assert backend.response_cache.get("cache-race", "application/json /ranges/tree?player=cache-race") is None
+    monkeypatch.undo()
+    client.get("/ranges/tree", params=params)
+    assert backend.response_cache.get("cache-race", "application/json /ranges/tree?player=cache-race") is not None
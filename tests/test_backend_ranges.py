@@ -0,0 +1,69 @@
+def save(client, player, name, position="UTG", category="Ranges"):
+    body = {"player": player, "category": category, "position": position, "name": name, "cardRange": {"AA": {"raise": 100}}}
+    assert client.post("/ranges/save", json=body).status_code == 200
+
+
+def test_list_pages_with_a_cursor(client):
+    names = [f"range{i:02d}" for i in range(7)]
+    for name in names:
+        save(client, "pages", name)
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"player": "pages", "limit": 3, "include_data": False}
+        if cursor is not None:
+            params["cursor"] = cursor
+        page = client.get("/ranges/list", params=params).json()
+        assert len(page["ranges"]) <= 3
+        assert all("cardRange" not in item for item in page["ranges"])
+        seen += [item["name"] for item in page["ranges"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == names
+    assert pages == 3
+    assert len(client.get("/ranges/list", params={"player": "pages"}).json()["ranges"]) == 7
+
+
+def test_tree_pages_with_a_cursor(client):
+    for i in range(5):
+        save(client, "tree-pages", f"open{i}", position="BTN" if i % 2 else "CO")
+    full = client.get("/ranges/tree", params={"player": "tree-pages"}).json()
+    merged, cursor = {}, None
+    while True:
+        params = {"player": "tree-pages", "limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        page = client.get("/ranges/tree", params=params).json()
+        for position, categories in page["tree"]["tree-pages"].items():
+            for category, names in categories.items():
+                merged.setdefault(position, {}).setdefault(category, []).extend(names)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert merged == full["tree-pages"]
+    assert sorted(merged["CO"]["Ranges"]) == ["open0", "open2", "open4"]
+
+
+def test_bulk_upsert_is_idempotent(client):
+    ranges = [
+        {"player": "bulk", "category": "Ranges", "position": pos, "name": f"open {pos}", "cardRange": {"AA": {"raise": 100}}}
+        for pos in ("UTG", "CO", "BTN")
+    ]
+    # a repeated key in one payload: the last one wins
+    payload = {"ranges": ranges + [{**ranges[0], "cardRange": {"KK": {"raise": 100}}}]}
+    for _ in range(2):
+        response = client.post("/ranges/bulk", json=payload)
+        assert response.status_code == 200
+        assert response.json()["upserted"] == 3
+    listed = client.get("/ranges/list", params={"player": "bulk"}).json()["ranges"]
+    assert sorted(item["name"] for item in listed) == ["open BTN", "open CO", "open UTG"]
+    by_name = {item["name"]: item["cardRange"] for item in listed}
+    assert by_name["open UTG"] == {"KK": {"raise": 100}}
+    assert by_name["open CO"] == {"AA": {"raise": 100}}
+
+    changed = {"ranges": [{**ranges[1], "cardRange": {"QQ": {"call": 50}}}]}
+    assert client.post("/ranges/bulk", json=changed).json()["upserted"] == 1
+    listed = client.get("/ranges/list", params={"player": "bulk"}).json()["ranges"]
+    assert len(listed) == 3
+    assert {item["name"]: item["cardRange"] for item in listed}["open CO"] == {"QQ": {"call": 50}}
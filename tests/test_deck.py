@@ -0,0 +1,47 @@
+import pytest
+
+from pypokerstar.src.types.cards import DECK_CARDS, Card, Deck, card_index
+
+
+def test_deals_every_card_once():
+    deck = Deck(seed=1)
+    dealt = deck.deal(52)
+    assert sorted(dealt) == list(range(52))
+    assert len(deck) == 0
+    with pytest.raises(ValueError):
+        deck.deal(1)
+
+
+def test_reset_puts_dealt_cards_back():
+    deck = Deck(seed=2)
+    for _ in range(50):
+        hand = deck.deal(9)
+        assert len(set(hand)) == 9
+        assert not any(DECK_CARDS[card] in deck for card in hand)
+        deck.reset()
+        assert len(deck) == 52
+        assert sorted(deck.order) == list(range(52))
+
+
+def test_dead_cards_are_never_dealt():
+    deck = Deck(seed=3)
+    dead = [Card.from_string(c) for c in ("As", "Kd", "2c")]
+    deck.deal(10)
+    deck.remove_cards(*dead)
+    for _ in range(20):
+        deck.reset()
+        assert len(deck) == 49
+        dealt = deck.deal(49)
+        assert len(set(dealt)) == 49
+        assert not {card_index(card) for card in dead} & set(dealt)
+    deck.reset(keep_dead=False)
+    assert len(deck) == 52 and all(card in deck for card in dead)
+
+
+def test_same_seed_same_deals():
+    first, second = Deck(seed=4), Deck(seed=4)
+    for _ in range(10):
+        assert first.deal(7) == second.deal(7)
+        first.shuffle()
+        second.shuffle()
+        assert first.cards == second.cards
@@ -0,0 +1,65 @@
+import base64
+
+from backend.encoding import (
+    ENCODING,
+    ENCODING_KEY,
+    decode_card_range,
+    encode_card_range,
+    pack_pair_actions,
+    unpack_pair_actions,
+)
+from pypokerstar.src.types.cards import HAND_CLASSES
+
+CARD_RANGE = {
+    "name": "BTN open",
+    "pairActions": {
+        "AA": {"action": "raise", "color": "#e53935", "percent": 100},
+        "AKs": [
+            {"action": "raise", "color": "#e53935", "percent": 62.5},
+            {"action": "call", "color": "#43a047", "percent": 37.25},
+        ],
+        "72o": {"action": "fold", "percent": 0.01},
+        "T9s": [{"color": "#43a047", "percent": 50}],
+        "22": [],
+    },
+}
+
+
+def test_card_range_round_trip():
+    encoded = encode_card_range(CARD_RANGE)
+    assert encoded[ENCODING_KEY] == ENCODING
+    assert isinstance(encoded["pairActions"], str)
+    assert encoded["name"] == CARD_RANGE["name"]
+    assert decode_card_range(encoded) == CARD_RANGE
+
+
+def test_every_class_round_trips_uncompressed():
+    pair_actions = {hand: {"action": "raise", "percent": i % 100} for i, hand in enumerate(HAND_CLASSES)}
+    packed = pack_pair_actions(pair_actions, compress=False)
+    assert packed[3] == 0
+    assert unpack_pair_actions(packed) == pair_actions
+    assert unpack_pair_actions(pack_pair_actions(pair_actions)) == pair_actions
+
+
+def test_records_follow_the_library_grid_order():
+    packed = pack_pair_actions({HAND_CLASSES[20]: {"percent": 1}}, compress=False)
+    records = packed[4 + 2:]  # empty action and color tables
+    assert [i for i, head in enumerate(records[:20]) if head] == []
+    assert records[20] != 0
+
+
+def test_payloads_that_do_not_fit_stay_json():
+    for card_range in (
+        {"pairActions": {"AXs": {"percent": 10}}},
+        {"pairActions": {"AA": {"percent": 33.333}}},
+        {"pairActions": {"AA": {"percent": 10, "weight": 2}}},
+        {"pairActions": "not a mapping"},
+    ):
+        assert encode_card_range(card_range) is card_range
+        assert decode_card_range(card_range) is card_range
+
+
+def test_encoding_twice_is_a_no_op():
+    encoded = encode_card_range(CARD_RANGE)
+    assert encode_card_range(encoded) is encoded
+    assert base64.b64decode(encoded["pairActions"])[:2] == b"PR"
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from phevaluator import evaluate_cards
+
+from pypokerstar.src.game.evaluator import (
+    CATEGORIES,
+    COMBO_CARDS,
+    MAX_RANK,
+    Evaluator,
+    get_evaluator,
+    hand_category,
+)
+from pypokerstar.src.types.cards import COMBO_INDEX, DECK_CARDS
+
+
+def reference(cards) -> int:
+    """phevaluator's public API on card strings."""
+    return evaluate_cards(*[DECK_CARDS[card].standard_string() for card in cards])
+
+
+def random_hands(n: int, size: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.argsort(rng.random((n, 52)), axis=1)[:, :size]
+
+
+@pytest.fixture
+def evaluator() -> Evaluator:
+    evaluator = get_evaluator()
+    evaluator.clear()
+    return evaluator
+
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_ranks_match_phevaluator(evaluator, size):
+    hands = random_hands(2000, size, seed=size)
+    expected = [reference(hand) for hand in hands.tolist()]
+    assert evaluator.evaluate_many(hands).tolist() == expected
+    assert [evaluator.evaluate(hand) for hand in hands[:200].tolist()] == expected[:200]
+
+
+def test_board_ranks_match_phevaluator(evaluator):
+    board = random_hands(1, 5, seed=11)[0].tolist()
+    ranks = evaluator.board_ranks(board)
+    assert evaluator.board_ranks(list(reversed(board))) is ranks
+    for combo, (lo, hi) in enumerate(COMBO_CARDS.tolist()):
+        assert combo == COMBO_INDEX[lo * 52 + hi]
+        if lo in board or hi in board:
+            assert ranks[combo] == MAX_RANK + 1
+        else:
+            assert ranks[combo] == reference([lo, hi, *board])
+
+
+def test_hand_categories(evaluator):
+    # royal flush, quads, wheel straight, seven high
+    def cards(text):
+        return [next(i for i, card in enumerate(DECK_CARDS) if card.standard_string() == c) for c in text.split()]
+
+    ranks = [evaluator.evaluate(cards(hand)) for hand in ("As Ks Qs Js Ts", "9c 9d 9h 9s 2c", "Ac 2d 3h 4s 5c", "7c 5d 4h 3s 2c")]
+    assert ranks[0] == 1 and ranks[-1] == MAX_RANK
+    assert [CATEGORIES[c] for c in hand_category(np.array(ranks))] == ["straight flush", "four of a kind", "straight", "high card"]
+
+
+def test_board_memo_keeps_the_most_recent_boards():
+    evaluator = type(get_evaluator())(memo_size=2)
+    boards = [board.tolist() for board in random_hands(3, 5, seed=5)]
+    first = evaluator.board_ranks(boards[0])
+    evaluator.board_ranks(boards[1])
+    assert evaluator.board_ranks(boards[0]) is first
+    evaluator.board_ranks(boards[2])
+    assert evaluator.board_ranks(boards[0]) is first
+    assert len(evaluator._boards) == 2
+    assert tuple(sorted(boards[1])) not in evaluator._boards
+
+
+def test_evaluator_is_abstract():
+    with pytest.raises(TypeError):
+        Evaluator()
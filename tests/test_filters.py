@@ -0,0 +1,53 @@
+import datetime
+from pathlib import Path
+
+import pytest
+
+from pypokerstar.src.game.poker import Player
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+from pypokerstar.src.tools.filters import HandFilterIndex, date, feature, hand_features, pot, pot_type, position, showdown
+
+SAMPLE = Path(__file__).parent / "pokerdata.txt"
+HERO = Player(name="pipinoelbreve9")
+
+
+@pytest.fixture(scope="module")
+def hands():
+    return list(PokerStarsParser().parse(file_content=SAMPLE.read_text(encoding="utf-8-sig"), hero=HERO, progress=False))
+
+
+def brute_force(hands, predicate) -> list[str]:
+    rows = ((hand, hand_features(hand, HERO)) for hand in hands)
+    return [hand.id for hand, row in rows if row is not None and predicate(row)]
+
+
+def test_bitmap_filters_match_a_scan(hands):
+    index = HandFilterIndex(hands, player=HERO)
+    start = datetime.datetime(2025, 8, 26, 10, 20)
+    cases = [
+        (position("BTN", "CO") & ~showdown(), lambda r: r["position"] in ("BTN", "CO") and not r["showdown"]),
+        (pot_type("single raised", "3bet") | pot(0.5), lambda r: r["pot_type"] in ("single raised", "3bet") or r["pot"] >= 0.5),
+        (date(start) & feature("vpip", True), lambda r: r["date"] >= start and r["vpip"]),
+        (index.where(won=True, pot=(None, 0.2)), lambda r: r["won"] and r["pot"] <= 0.2),
+    ]
+    for query, predicate in cases:
+        expected = brute_force(hands, predicate)
+        assert [hand.id for hand in index.select(query)] == expected, query
+        assert index.count(query) == len(expected)
+        assert index.frame(query)["hand_id"].to_list() == expected
+    assert len(index) == len(brute_force(hands, lambda r: True))
+
+
+def test_adding_hands_extends_the_bitmaps(hands):
+    index = HandFilterIndex(hands[:60], player=HERO)
+    query = position("BB") | pot(1.0)
+    index.count(query)
+    index.add(hands[60:])
+    full = HandFilterIndex(hands, player=HERO)
+    assert index.select(query) == full.select(query)
+    assert index.count(~query) == len(index) - index.count(query)
+
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(ValueError):
+        feature("pot", 1)
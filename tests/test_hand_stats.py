@@ -0,0 +1,39 @@
+from pypokerstar.src.game.poker import player_hand_stats
+
+PREFLOP = [("SB", "small blind", 0.01), ("BB", "big blind", 0.02)]
+CARDS = {"BTN": "As Kd", "SB": "7c 2h", "BB": "Qh Qs"}
+
+
+def test_wtsd_needs_a_showdown_reached_without_folding(make_hand):
+    # BTN and BB show down, SB folded although its cards are known (the hero's always are)
+    hand = make_hand(
+        ["BTN", "SB", "BB"],
+        {
+            "table": PREFLOP,
+            "hole cards": [("BTN", "raises", 0.06), ("SB", "folds", 0), ("BB", "calls", 0.04)],
+            "flop": [("BB", "checks", 0), ("BTN", "checks", 0)],
+            "show down": [],
+            "summary": [("BB", "collected", 0.13)],
+        },
+        board="Qd 7s 2c",
+        cards=CARDS,
+    )
+    stats = player_hand_stats(hand)
+    assert stats["BTN"]["wtsd"] and not stats["BTN"]["w$sd"]
+    assert stats["BB"]["wtsd"] and stats["BB"]["w$sd"]
+    assert not stats["SB"]["wtsd"] and not stats["SB"]["w$sd"]
+
+
+def test_no_wtsd_without_a_showdown(make_hand):
+    hand = make_hand(
+        ["BTN", "SB", "BB"],
+        {
+            "table": PREFLOP,
+            "hole cards": [("BTN", "raises", 0.06), ("SB", "folds", 0), ("BB", "folds", 0)],
+            "summary": [("BTN", "collected", 0.03)],
+        },
+        cards=CARDS,
+    )
+    stats = player_hand_stats(hand)
+    assert not any(row["wtsd"] or row["w$sd"] for row in stats.values())
+    assert stats["BTN"]["collected"] == 0.03
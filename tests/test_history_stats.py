@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+from polars.testing import assert_frame_equal
+
+from pypokerstar.src.game.poker import History
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+
+SAMPLE = Path(__file__).parent / "pokerdata.txt"
+
+
+@pytest.fixture(scope="module")
+def hands():
+    return list(PokerStarsParser().parse(file_content=SAMPLE.read_text(encoding="utf-8-sig"), progress=False))
+
+
+@pytest.mark.parametrize("every, player", [("15m", None), ("1h", None), ("30m", "pipinoelbreve9")])
+def test_incremental_bucket_stats_match_a_full_recompute(hands, every, player):
+    # hands arrive in batches and out of date order: later batches reach back into cached buckets
+    order = hands[40:] + hands[:40]
+    history = History(hands=order[:50])
+    history.get_bucket_stats(every, player=player)
+    for start in range(50, len(order), 30):
+        for hand in order[start:start + 30]:
+            history.add_hand(hand)
+        incremental = history.get_bucket_stats(every, player=player)
+        full = History(hands=order[:start + 30]).get_bucket_stats(every, player=player)
+        assert_frame_equal(incremental, full)
+    assert incremental.height > 1
@@ -0,0 +1,34 @@
+import asyncio
+import logging
+
+from backend.hud import watch_folder
+
+
+class FlakyWatcher:
+    directory = "live"
+
+    def __init__(self) -> None:
+        self.polls = 0
+
+    def poll(self) -> list:
+        self.polls += 1
+        if self.polls == 1:
+            raise OSError("file vanished while reading")
+        return []
+
+
+def test_watch_folder_keeps_polling_after_an_error(caplog):
+    watcher = FlakyWatcher()
+
+    async def run() -> None:
+        task = asyncio.create_task(watch_folder(watcher, ingestor=None, interval=0))
+        for _ in range(500):
+            if watcher.polls >= 3:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    with caplog.at_level(logging.ERROR, logger="backend.hud"):
+        asyncio.run(run())
+    assert watcher.polls >= 3
+    assert "Polling live failed" in caplog.text
@@ -0,0 +1,88 @@
+import pickle
+import shutil
+from pathlib import Path
+
+from pypokerstar.src.game.poker import History, Player
+from pypokerstar.src.parsers.index import HANDS_FORMAT, HandIndex
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+
+SAMPLE = Path(__file__).parent / "pokerstars.txt"
+HERO = Player(name="pipinoelbreve9")
+
+
+def history_folder(tmp_path: Path) -> Path:
+    folder = tmp_path / "history"
+    folder.mkdir()
+    shutil.copy(SAMPLE, folder / "table.txt")
+    # the same hands again, as in a re-exported _1 file
+    shutil.copy(SAMPLE, folder / "table_1.txt")
+    return folder
+
+
+def test_parse_dir_returns_each_hand_once(tmp_path):
+    parser = PokerStarsParser()
+    hands = parser.parse_dir(str(history_folder(tmp_path)), hero=HERO)
+    ids = [hand.id for hand in hands]
+    assert len(ids) == len(set(ids)) == 15
+    assert parser.duplicates == 15
+
+
+def test_persisted_index_returns_the_same_hands_on_a_second_run(tmp_path):
+    folder = history_folder(tmp_path)
+    path = str(tmp_path / "cache" / "hands.idx")
+    first = PokerStarsParser(index=HandIndex(path)).parse_dir(str(folder), hero=HERO)
+
+    parser = PokerStarsParser(index=HandIndex(path))
+    second = parser.parse_dir(str(folder), hero=HERO)
+    assert sorted(hand.id for hand in second) == sorted(hand.id for hand in first)
+    assert {hand.id: hand.result[HERO] for hand in second} == {hand.id: hand.result[HERO] for hand in first}
+    assert all(hand.hero == HERO for hand in second)
+    assert parser.duplicates == 15
+
+    # new hands are parsed and stored next to the ones from the index
+    (folder / "other.txt").write_text(SAMPLE.read_text(encoding="utf-8-sig").replace("Hand #2574", "Hand #9574"))
+    third = PokerStarsParser(index=HandIndex(path)).parse_dir(str(folder), hero=HERO)
+    assert len(third) == 30
+    assert len(HandIndex(path).hands) == 30
+
+
+def test_stored_hands_are_refreshed_for_the_new_hero(tmp_path):
+    folder = history_folder(tmp_path)
+    path = str(tmp_path / "hands.idx")
+    PokerStarsParser(index=HandIndex(path)).parse_dir(str(folder))
+    hands = PokerStarsParser(index=HandIndex(path)).parse_dir(str(folder), hero=HERO)
+    for hand in hands:
+        assert hand.hero is hand.players_map[HERO.name]
+    assert History(hands=hands, hero=HERO).hands == hands
+
+
+def test_ids_without_a_stored_hand_are_parsed_again(tmp_path):
+    folder = history_folder(tmp_path)
+    path = tmp_path / "hands.idx"
+    # an id file from before hands were stored next to it
+    ids = [hand.id for hand in PokerStarsParser().parse_dir(str(folder))]
+    path.write_text("\n".join(ids))
+    parser = PokerStarsParser(index=HandIndex(str(path)))
+    assert sorted(hand.id for hand in parser.parse_dir(str(folder), hero=HERO)) == sorted(ids)
+    assert parser.duplicates == 15
+
+
+def test_unreadable_or_outdated_hand_files_are_discarded(tmp_path):
+    folder = history_folder(tmp_path)
+    path = str(tmp_path / "hands.idx")
+    PokerStarsParser(index=HandIndex(path)).parse_dir(str(folder))
+    for content in (b"not a pickle", pickle.dumps({"format": HANDS_FORMAT - 1, "hands": {"x": object()}})):
+        with open(HandIndex.hands_path(path), "wb") as file:
+            file.write(content)
+        index = HandIndex(path)
+        assert index.hands == {} and len(index) == 15
+        assert len(PokerStarsParser(index=index).parse_dir(str(folder), hero=HERO)) == 15
+
+
+def test_hand_file_is_bounded(tmp_path):
+    folder = history_folder(tmp_path)
+    path = str(tmp_path / "hands.idx")
+    PokerStarsParser(index=HandIndex(path, max_hands=10)).parse_dir(str(folder))
+    assert len(HandIndex(path).hands) == 10
+    # the five hands not kept are parsed again
+    assert len(PokerStarsParser(index=HandIndex(path, max_hands=10)).parse_dir(str(folder))) == 15
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend import ingest
+from backend.ingest import HandIngestor, parse_hand_history, split_hands
+from backend.models import Base, HandRecord
+
+SAMPLE = Path(__file__).parent / "pokerstars.txt"
+
+
+@pytest.fixture
+def ingestor(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'hands.db'}")
+    Base.metadata.create_all(engine)
+    return HandIngestor(sessionmaker(bind=engine))
+
+
+def stored(ingestor: HandIngestor) -> int:
+    db = ingestor.session_factory()
+    try:
+        return db.execute(select(func.count()).select_from(HandRecord)).scalar_one()
+    finally:
+        db.close()
+
+
+def test_store_skips_known_hands(ingestor):
+    text = SAMPLE.read_text(encoding="utf-8-sig")
+    rows, failed = parse_hand_history(text)
+    assert rows and not failed
+    assert len(ingestor.store(rows)) == len(rows)
+    assert ingestor.store(rows) == []
+    # a batch repeating a hand, and overlapping the stored ones
+    hands = split_hands(text)
+    again, _ = parse_hand_history("\n\n".join(hands[:3] + hands[:1]))
+    assert ingestor.store(again) == []
+    assert stored(ingestor) == len(rows)
+
+
+def test_finished_jobs_are_evicted(ingestor, monkeypatch):
+    monkeypatch.setattr(ingest, "MAX_JOBS", 3)
+    old = ingestor.new_job()
+    old.finished_at = datetime.utcnow() - timedelta(seconds=ingest.JOB_TTL + 1)
+    running = ingestor.new_job()
+    done = [ingestor.new_job() for _ in range(2)]
+    for job in done:
+        job.finished_at = datetime.utcnow()
+    latest = ingestor.new_job()
+    assert old.id not in ingestor.jobs
+    assert done[0].id not in ingestor.jobs
+    assert set(ingestor.jobs) == {running.id, done[1].id, latest.id}
@@ -0,0 +1,91 @@
+from pypokerstar.src.game.lines import Line, classify_lines
+
+PREFLOP = [
+    ("SB", "small blind", 0.01),
+    ("BB", "big blind", 0.02),
+]
+
+
+def hand_with_flop(make_hand, flop):
+    return make_hand(
+        ["BTN", "SB", "BB"],
+        {
+            "table": PREFLOP,
+            "hole cards": [("BTN", "raises", 0.06), ("SB", "folds", 0), ("BB", "calls", 0.04)],
+            "flop": flop,
+        },
+    )
+
+
+def test_preflop_lines(make_hand):
+    hand = make_hand(
+        ["BTN", "SB", "BB", "UTG"],
+        {
+            "table": PREFLOP,
+            "hole cards": [
+                ("UTG", "raises", 0.06),
+                ("BTN", "calls", 0.06),
+                ("SB", "raises", 0.24),
+                ("BB", "folds", 0),
+                ("UTG", "folds", 0),
+                ("BTN", "raises", 0.6),
+            ],
+        },
+    )
+    lines = classify_lines(hand)
+    assert lines["UTG"] & Line.RFI
+    assert lines["UTG"] & Line.FACED_3BET
+    assert lines["UTG"] & Line.FOLD_TO_3BET
+    assert lines["BTN"] & Line.COLD_CALL
+    assert lines["BTN"] & Line.FOUR_BET
+    assert lines["SB"] & Line.THREE_BET
+    assert lines["BB"] == Line.NONE
+
+
+def test_check_fold_to_cbet(make_hand):
+    lines = classify_lines(hand_with_flop(make_hand, [("BB", "checks", 0), ("BTN", "bets", 0.08), ("BB", "folds", 0)]))
+    assert lines["BTN"] & Line.CBET_OPP and lines["BTN"] & Line.CBET
+    assert lines["BB"] & Line.FACED_CBET
+    assert lines["BB"] & Line.FOLD_TO_CBET
+
+
+def test_check_raise_against_cbet(make_hand):
+    lines = classify_lines(
+        hand_with_flop(
+            make_hand,
+            [("BB", "checks", 0), ("BTN", "bets", 0.08), ("BB", "raises", 0.3), ("BTN", "raises", 0.9), ("BB", "folds", 0)],
+        )
+    )
+    assert lines["BB"] & Line.FACED_CBET
+    assert lines["BB"] & Line.CHECK_RAISE
+    # answered the c-bet with a raise: the later fold is to the re-raise
+    assert not lines["BB"] & Line.FOLD_TO_CBET
+
+
+def test_checked_through_flop(make_hand):
+    lines = classify_lines(hand_with_flop(make_hand, [("BB", "checks", 0), ("BTN", "checks", 0)]))
+    assert lines["BTN"] & Line.CBET_OPP
+    assert not lines["BTN"] & Line.CBET
+    assert not lines["BB"] & Line.FACED_CBET
+
+
+def test_donk_bet(make_hand):
+    lines = classify_lines(hand_with_flop(make_hand, [("BB", "bets", 0.08), ("BTN", "calls", 0.08)]))
+    assert lines["BB"] & Line.DONK
+    assert not lines["BTN"] & Line.CBET_OPP
+    assert not lines["BTN"] & Line.FACED_CBET
+
+
+def test_bet_after_aggressor_checks_is_not_a_donk(make_hand):
+    lines = classify_lines(
+        make_hand(
+            ["BTN", "SB", "BB"],
+            {
+                "table": PREFLOP,
+                "hole cards": [("SB", "raises", 0.06), ("BTN", "folds", 0), ("BB", "calls", 0.04)],
+                "flop": [("SB", "checks", 0), ("BB", "bets", 0.08), ("SB", "folds", 0)],
+            },
+        )
+    )
+    assert not lines["BB"] & Line.DONK
+    assert not lines["SB"] & Line.FACED_CBET
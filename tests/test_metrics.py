@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from pypokerstar.src.game.poker import History, Player, player_hand_stats
+from pypokerstar.src.metrics.metrics import PFR, VPIP, Metric, PopulationBaseline, evaluate_metrics, population_priors, registry, with_intervals
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+
+SAMPLE = Path(__file__).parent / "pokerstars.txt"
+HERO = Player(name="pipinoelbreve9")
+
+
+@pytest.fixture(scope="module")
+def history() -> History:
+    hands = PokerStarsParser().parse(file_content=SAMPLE.read_text(encoding="utf-8-sig"), hero=HERO, progress=False)
+    return History(hands=hands, hero=HERO)
+
+
+def test_metric_is_abstract():
+    with pytest.raises(TypeError):
+        Metric([], HERO)
+
+
+def test_hero_metrics_match_hand_stats(history):
+    flags = [player_hand_stats(hand)[HERO.name] for hand in history.hands]
+    vpip = VPIP(history, HERO)
+    assert vpip.value == pytest.approx(sum(f["vpip"] for f in flags) / len(flags))
+    assert vpip.sample_size == len(flags)
+    assert PFR(history, HERO).value == pytest.approx(sum(f["pfr"] for f in flags) / len(flags))
+
+
+def test_registry_evaluates_metrics_in_one_frame(history):
+    row = evaluate_metrics(history, ["vpip", "pfr"]).filter(pl.col("player") == HERO.name).row(0, named=True)
+    assert row["hands"] == len(history.hands)
+    assert row["vpip"] == pytest.approx(VPIP(history, HERO).value)
+    assert row["pfr"] <= row["vpip"]
+
+
+def test_intervals_match_the_closed_forms():
+    result = pl.DataFrame({"vpip": [0.5, 0.1, 1.0, None], "vpip_n": [100, 10, 4, 0]})
+    wilson = with_intervals(result)
+    # Wilson interval of 50/100 at 95%
+    assert wilson.row(0, named=True)["vpip_lo"] == pytest.approx(0.4038, abs=1e-4)
+    assert wilson.row(0, named=True)["vpip_hi"] == pytest.approx(0.5962, abs=1e-4)
+    assert (wilson["vpip_lo"] <= result["vpip"].fill_null(0)).all()
+    assert (wilson["vpip_hi"] >= result["vpip"].fill_null(1)).all()
+    # an empty sample spans [0, 1] and is shrunk to the pooled rate
+    prior = population_priors(result)["vpip"]
+    assert prior == pytest.approx((50 + 1 + 4) / 114)
+    assert wilson.row(3, named=True) == {**wilson.row(3, named=True), "vpip_lo": 0.0, "vpip_hi": 1.0, "vpip_shrunk": prior}
+
+    beta = with_intervals(result, method="beta", priors={"vpip": 0.25}, prior_strength=10)
+    assert beta["vpip_shrunk"].to_list()[:3] == pytest.approx([52.5 / 110, 3.5 / 20, 6.5 / 14])
+    assert all(lo <= shrunk <= hi for lo, shrunk, hi in beta.select("vpip_lo", "vpip_shrunk", "vpip_hi").rows())
+    with pytest.raises(ValueError):
+        with_intervals(result, method="normal")
+
+
+def test_hero_interval_contains_the_rate(history):
+    vpip = VPIP(history, HERO)
+    low, high = vpip.interval()
+    assert low <= vpip.value <= high
+    narrow = vpip.interval(confidence=0.5)
+    assert low < narrow[0] <= narrow[1] < high
+
+
+def test_population_baseline_pools_the_players_per_group(history):
+    stats = history.get_main_stats()
+    baseline = PopulationBaseline(exclude=[HERO.name])
+    pool = baseline.get(history, ["vpip", "pfr"])
+    # one aggregation per snapshot, reused until the stats frame changes
+    assert baseline.get(stats, ["vpip", "pfr"]) is pool
+    others = stats.filter(pl.col("player") != HERO.name)
+    assert pool["pool_hands"].sum() == others.height
+    expected = registry.evaluate(others, ["vpip"], by=["big_blind", "position"])
+    joined = pool.join(expected, on=["big_blind", "position"], suffix="_expected")
+    assert joined.height == pool.height
+    assert joined["vpip"].to_list() == pytest.approx(joined["vpip_expected"].to_list(), nan_ok=True)
+
+    compared = baseline.compare(history, players=[HERO.name], names=["vpip"])
+    assert set(compared["player"]) == {HERO.name}
+    assert compared["hands"].sum() == stats.filter(pl.col("player") == HERO.name).height
+    row = compared.row(0, named=True)
+    assert row["vpip_diff"] == pytest.approx(row["vpip"] - row["vpip_pool"], nan_ok=True)
@@ -0,0 +1,67 @@
+import json
+
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import Session
+
+from backend.migrations import LEGACY_TABLE, migrate
+from backend.models import Category, Player, Range
+
+LEGACY_ROWS = [
+    # player, category, position, name, range_data, created_at, updated_at
+    ("hero", "Ranges", "UTG", "open", {"AA": {"raise": 100}}, "2024-01-01 10:00:00", "2024-01-01 10:00:00"),
+    ("hero", "Ranges", "UTG", "open", {"KK": {"raise": 100}}, "2024-01-01 10:00:00", "2024-02-01 10:00:00"),
+    ("hero", "Defense", "BB", "vs BTN", {"T9s": {"call": 100}}, "2024-01-02 10:00:00", "2024-01-02 10:00:00"),
+    ("villain", "Ranges", "BTN", "open", {"A2o": {"raise": 50}}, "2024-01-03 10:00:00", None),
+]
+
+
+def legacy_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE ranges (id INTEGER PRIMARY KEY, player VARCHAR, category VARCHAR, position VARCHAR, "
+            "name VARCHAR, range_data JSON, created_at DATETIME, updated_at DATETIME)"
+        ))
+        for player, category, position, name, data, created_at, updated_at in LEGACY_ROWS:
+            conn.execute(
+                text("INSERT INTO ranges (player, category, position, name, range_data, created_at, updated_at) "
+                     "VALUES (:player, :category, :position, :name, :data, :created_at, :updated_at)"),
+                {"player": player, "category": category, "position": position, "name": name,
+                 "data": json.dumps(data), "created_at": created_at, "updated_at": updated_at},
+            )
+    return engine
+
+
+def ranges_of(engine):
+    with Session(engine) as db:
+        stmt = (
+            select(Player.name, Category.name, Range)
+            .join(Player, Range.player_id == Player.id)
+            .join(Category, Range.category_id == Category.id)
+        )
+        return {(p, c, r.position, r.name): r.card_range for p, c, r in db.execute(stmt)}
+
+
+def test_legacy_ranges_are_moved_to_the_normalized_tables(tmp_path):
+    engine = legacy_database(tmp_path)
+    migrate(engine)
+    tables = set(inspect(engine).get_table_names())
+    assert {"players", "categories", "ranges", LEGACY_TABLE} <= tables
+    assert ranges_of(engine) == {
+        # the most recently updated duplicate wins
+        ("hero", "Ranges", "UTG", "open"): {"KK": {"raise": 100}},
+        ("hero", "Defense", "BB", "vs BTN"): {"T9s": {"call": 100}},
+        ("villain", "Ranges", "BTN", "open"): {"A2o": {"raise": 50}},
+    }
+    with engine.connect() as conn:
+        assert conn.execute(text(f"SELECT COUNT(*) FROM {LEGACY_TABLE}")).scalar_one() == len(LEGACY_ROWS)
+
+
+def test_migrate_is_idempotent(tmp_path):
+    engine = legacy_database(tmp_path)
+    migrate(engine)
+    before = ranges_of(engine)
+    migrate(engine)
+    assert ranges_of(engine) == before
+    indexes = {index["name"] for index in inspect(engine).get_indexes("ranges")}
+    assert {index.name for index in Range.__table__.indexes} <= indexes
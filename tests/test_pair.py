@@ -0,0 +1,33 @@
+import itertools
+from collections import Counter
+
+import pytest
+
+from pypokerstar.src.types.cards import DECK_CARDS, HAND_CLASSES, Card, Pair
+
+
+def pair(cards: str) -> Pair:
+    return Pair(*[Card.from_string(c) for c in cards.split()])
+
+
+def test_ids_cover_every_combo_and_class():
+    pairs = [Pair(a, b) for a, b in itertools.combinations(DECK_CARDS, 2)]
+    assert sorted(p.combo_id for p in pairs) == list(range(1326))
+    classes = Counter(p.class_id for p in pairs)
+    assert sorted(classes) == list(range(169))
+    # 6 combos per pocket pair, 4 per suited and 12 per offsuit class
+    for i, count in classes.items():
+        hand = HAND_CLASSES[i]
+        assert count == (6 if len(hand) == 2 else 4 if hand.endswith("s") else 12), hand
+    assert all(p.hand == HAND_CLASSES[p.class_id] for p in pairs)
+
+
+def test_pairs_compare_by_class():
+    assert pair("As Ks") == pair("Kh Ah")
+    assert pair("As Ks") != pair("As Kd")
+    assert len({pair("As Ks"), pair("Ad Kd"), pair("As Kd"), pair("7c 7d"), pair("7h 7s")}) == 3
+    assert (pair("As Ks").hand, pair("As Kd").hand, pair("7c 7d").hand) == ("AKs", "AKo", "77")
+    assert pair("As Ks").combo_id != pair("Kh Ah").combo_id
+    assert pair("Ks As").combo_id == pair("As Ks").combo_id
+    with pytest.raises(ValueError):
+        pair("As As")
@@ -0,0 +1,40 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from pypokerstar.src.game.poker import History, resolve_positions
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+
+SAMPLE = Path(__file__).parent / "pokerdata.txt"
+BLIND_PATTERN = re.compile(r"^(.+?): posts (small|big) blind", re.MULTILINE)
+
+
+@pytest.mark.parametrize("button, seats, expected", [
+    (1, [1, 2, 3, 4, 5, 6], {1: "BTN", 2: "SB", 3: "BB", 4: "UTG", 5: "MP", 6: "CO"}),
+    # clockwise from the button, wrapping past the last seat
+    (5, [1, 3, 5, 6], {5: "BTN", 6: "SB", 1: "BB", 3: "CO"}),
+    # heads-up: the button posts the small blind and is labelled BTN
+    (2, [2, 6], {2: "BTN", 6: "BB"}),
+    # dead button: the first player after the empty seat is the small blind
+    (4, [1, 2, 5, 6], {5: "SB", 6: "BB", 1: "UTG", 2: "CO"}),
+    (None, [1, 2], {}),
+    (1, [1], {}),
+])
+def test_resolve_positions(button, seats, expected):
+    assert resolve_positions(button, seats) == expected
+
+
+def test_blind_posters_resolve_to_the_blinds():
+    hands = PokerStarsParser().parse(file_content=SAMPLE.read_text(encoding="utf-8-sig"), progress=False)
+    checked = 0
+    for hand in hands:
+        blinds = BLIND_PATTERN.findall(hand.raw_text.split("*** HOLE CARDS ***")[0])
+        if len(hand.players) == 2 or len(blinds) != 2:
+            continue
+        for name, blind in blinds:
+            assert hand.positions[name] == ("SB" if blind == "small" else "BB"), hand.id
+            checked += 1
+    assert checked > 100
+    frame = History(hands=hands).get_main_stats()
+    assert frame["position"].dtype.categories.to_list()[0] == "UTG"
@@ -0,0 +1,55 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from pypokerstar.src.game.poker import Player, pair_notation
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+from pypokerstar.src.tools.playerstats import PlayerStats
+from pypokerstar.src.tools.profiles import RANGE_KINDS, ProfileStore
+from pypokerstar.src.types.cards import HAND_CLASS_INDEX, Card
+
+SAMPLE = Path(__file__).parent / "pokerdata.txt"
+
+
+@pytest.fixture(scope="module")
+def hands():
+    return PokerStarsParser().parse(file_content=SAMPLE.read_text(encoding="utf-8-sig"), progress=False)
+
+
+@pytest.mark.parametrize(
+    "cards, expected",
+    [("As 9s", "A9s"), ("9s As", "A9s"), ("Kd Ah", "AKo"), ("2c Ad", "A2o"), ("Th Th", "TT"), ("Tc 9c", "T9s")],
+)
+def test_pair_notation_is_ace_high(cards, expected):
+    assert pair_notation(*[Card.from_string(c) for c in cards.split()]) == expected
+
+
+def test_profile_ranges_use_the_hand_class_grid(hands):
+    store = ProfileStore()
+    store.update(hands)
+    raised = 0
+    for profile in store.profiles.values():
+        for position in profile.positions:
+            for kind in RANGE_KINDS:
+                assert set(profile.range(position, kind)) <= set(HAND_CLASS_INDEX)
+        # hands raised preflop are in PlayerStats' range too, under the same key
+        keys = Counter()
+        for position in profile.positions:
+            keys.update(profile.range(position, "openers"))
+            keys.update(profile.range(position, "3bet"))
+        played = PlayerStats(Player(name=profile.name), hands).get_range()
+        assert all(played.get(key, 0) >= n for key, n in keys.items())
+        raised += sum(keys.values())
+    assert raised > 0
+
+
+def test_older_profiles_are_rekeyed_on_load(tmp_path):
+    path = tmp_path / "profiles.json"
+    positions = {"BTN": {"openers": {"KAs": 2, "AKs": 1}, "callers": {"2Ao": 1}, "3bet": {}, "total_seen": 4}}
+    data = {"name": "villain", "counters": {"hands": 4}, "invested": 1.0, "collected": 0.0, "positions": positions}
+    path.write_text(json.dumps({"hand_ids": [], "profiles": [data]}))
+    profile = ProfileStore(str(path))["villain"]
+    assert profile.range("BTN", "openers") == Counter({"AKs": 3})
+    assert profile.range("BTN", "callers") == Counter({"A2o": 1})
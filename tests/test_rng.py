@@ -0,0 +1,37 @@
+import numpy as np
+
+from pypokerstar.src.types.cards import Deck
+from pypokerstar.src.types.rng import UniformBuffer, make_rng, spawn_rngs
+
+
+def test_spawned_streams_are_reproducible_and_distinct():
+    first = [rng.random(5).tolist() for rng in spawn_rngs(11, 4)]
+    second = [rng.random(5).tolist() for rng in spawn_rngs(np.random.SeedSequence(11), 4)]
+    assert first == second
+    assert len({tuple(stream) for stream in first}) == 4
+    # worker i gets the same stream whatever the number of workers
+    assert [rng.random(5).tolist() for rng in spawn_rngs(11, 2)] == first[:2]
+    shared = make_rng(3)
+    assert make_rng(shared) is shared
+
+
+def test_buffered_uniforms_follow_the_generator():
+    buffer = UniformBuffer(make_rng(5), block=8)
+    taken = buffer.take(3) + buffer.take(5)
+    assert taken == make_rng(5).random(8).tolist()
+    assert len(buffer.take(20)) == 20
+
+
+def test_seeded_equity_is_reproducible(make_hand):
+    hand = make_hand(
+        ["hero", "villain"],
+        {"hole cards": [("hero", "raises", 2), ("villain", "calls", 2)], "flop": [("hero", "checks", 0), ("villain", "checks", 0)]},
+        board="As 7d 2c",
+        cards={"hero": "Ah Kh"},
+    )
+    flop = hand.get_round("flop")
+    equity = flop.get_hero_equity(hand.players_map["hero"], 500, rng=7)
+    assert equity == flop.get_hero_equity(hand.players_map["hero"], 500, rng=7)
+    assert 0.8 < equity < 1.0
+    decks = [Deck(rng=rng) for rng in spawn_rngs(7, 2)]
+    assert decks[0].deal(10) != decks[1].deal(10)
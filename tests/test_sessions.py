@@ -0,0 +1,47 @@
+import datetime
+from pathlib import Path
+
+import pytest
+
+from pypokerstar.src.game.poker import Player
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+from pypokerstar.src.tools.sessions import SessionTracker
+
+SAMPLE = Path(__file__).parent / "pokerstars.txt"
+HERO = Player(name="pipinoelbreve9")
+GAP = datetime.timedelta(seconds=20)
+
+
+@pytest.fixture(scope="module")
+def hands():
+    return PokerStarsParser().parse(file_content=SAMPLE.read_text(encoding="utf-8-sig"), hero=HERO, progress=False)
+
+
+def sessions(tracker: SessionTracker) -> list[tuple]:
+    return [(s.table, s.start, s.end, s.hands, round(s.net, 9)) for s in tracker.get_sessions()]
+
+
+def test_sessions_split_on_gaps(hands):
+    tracker = SessionTracker(HERO, gap=GAP)
+    assert tracker.add_hands(hands) == len(hands)
+    found = tracker.get_sessions()
+    # breaks longer than 20 seconds: 20:30:36 -> 20:30:59 and 20:31:30 -> 20:32:24
+    assert [s.hands for s in found] == [7, 6, 2]
+    assert sum(s.net for s in found) == pytest.approx(sum(hand.result[HERO] for hand in hands))
+    assert tracker.summary()["hands"].to_list() == [7, 6, 2]
+
+
+def test_incremental_and_out_of_order_hands_match_a_single_pass(hands):
+    single = SessionTracker(HERO, gap=GAP)
+    single.add_hands(hands)
+    expected = sessions(single)
+
+    tracker = SessionTracker(HERO, gap=GAP)
+    for chunk in (hands[10:], hands[:4], hands[4:10]):
+        tracker.add_hands(chunk)
+        tracker.summary()
+    assert sessions(tracker) == expected
+    assert tracker.summary().height == len(expected)
+    # hands already seen are not counted twice
+    assert tracker.add_hands(hands) == 0
+    assert sessions(tracker) == expected
@@ -0,0 +1,38 @@
+import polars as pl
+
+from pypokerstar.src.game.poker import Player
+from pypokerstar.src.game.simulation import Game, TableState, check_call, simulate
+
+
+def aggressive(state: TableState, seat: int) -> tuple[str, float]:
+    """Raises to odd sizes often so that stacks get split into awkward amounts."""
+    draw = state.rng.random()
+    if draw < 0.15:
+        return "folds", 0.0
+    if draw < 0.6:
+        return "raises", state.current_bet * 2.37 + 0.13
+    return "calls", 0.0
+
+
+def test_game_hands_conserve_chips():
+    players = [Player(name=f"p{i}", pot=pot) for i, pot in enumerate((10.0, 7.33, 23.01, 4.07, 15.5, 9.99))]
+    game = Game(*players, strategies=[aggressive] * 6, small_blind=0.01, big_blind=0.02, rng=7)
+    total = sum(p.pot for p in players)
+    hands = game.play(200)
+    assert hands
+    for hand in hands:
+        assert abs(sum(hand.result.values())) < 1e-9
+        for rnd in hand.rounds:
+            for bet in rnd.bets:
+                # no float residue such as "calls 7.1e-15"
+                assert bet.amount == round(bet.amount, 2)
+                assert bet.type in ("checks", "folds") or abs(bet.amount) >= 0.01
+    assert abs(sum(p.pot for p in players) - total) < 1e-9
+    assert all(p.pot == round(p.pot, 2) for p in players)
+
+
+def test_simulate_nets_to_zero():
+    result = simulate([aggressive, check_call, aggressive], 500, seed=3, stack=12.34, small_blind=0.05, big_blind=0.1)
+    per_hand = result.results.group_by("hand").agg(pl.col("net").sum())
+    assert len(per_hand) == 500
+    assert per_hand["net"].abs().max() < 1e-9
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pypokerstar.src.game.poker import History
+from pypokerstar.src.game.texture import FEATURES, Flush, Paired, Straight, texture_features
+from pypokerstar.src.parsers.pokerstars import PokerStarsParser
+from pypokerstar.src.types.cards import Card, card_index
+
+SAMPLE = Path(__file__).parent / "pokerdata.txt"
+
+
+def board(cards: str) -> list[int]:
+    return [card_index(Card.from_string(c)) for c in cards.split()]
+
+
+@pytest.mark.parametrize("cards, expected", [
+    # suits, flush, paired, high, connected, straight
+    ("Ks 7d 2c", (1, Flush.NONE, Paired.UNPAIRED, 13, 1, Straight.NONE)),
+    ("Ah 2h 3d", (2, Flush.DRAW, Paired.UNPAIRED, 14, 3, Straight.POSSIBLE)),
+    ("Qs Js 9s", (3, Flush.POSSIBLE, Paired.UNPAIRED, 12, 3, Straight.POSSIBLE)),
+    ("8c 8d 4h Kc", (2, Flush.DRAW, Paired.PAIRED, 13, 2, Straight.DRAW)),
+    ("Th Td 5c 5s Jh", (2, Flush.NONE, Paired.TWO_PAIR, 11, 2, Straight.NONE)),
+    ("6c 6d 6h 9s 9c", (2, Flush.NONE, Paired.FULL_HOUSE, 9, 2, Straight.NONE)),
+    ("7c 7d 7h 2s Ad", (2, Flush.NONE, Paired.TRIPS, 14, 2, Straight.NONE)),
+])
+def test_features_of_known_boards(cards, expected):
+    features = texture_features(np.array([board(cards)]))
+    assert tuple(int(features[name][0]) for name in FEATURES) == expected
+
+
+def test_duplicate_boards_in_any_order_share_features():
+    boards = np.array([board("Ah 2h 3d"), board("3d Ah 2h"), board("Ks 7d 2c")])
+    features = texture_features(boards)
+    assert all(values[0] == values[1] for values in features.values())
+    with pytest.raises(ValueError):
+        texture_features(np.array([board("Ah 2h")]))
+
+
+def test_history_textures_are_computed_incrementally():
+    hands = PokerStarsParser().parse(file_content=SAMPLE.read_text(encoding="utf-8-sig"), progress=False)
+    history = History(hands=hands[:70])
+    history.get_board_textures()
+    for hand in hands[70:]:
+        history.add_hand(hand)
+    textures = history.get_board_textures()
+    assert textures.equals(History(hands=hands).get_board_textures())
+    assert textures["hand_id"].to_list() == [hand.id for hand in history.hands]
+    # streets a hand did not reach are null
+    no_flop = textures.filter(textures["board_cards"] < 3)
+    assert no_flop.height and no_flop["flop_high"].null_count() == no_flop.height
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from pypokerstar.src.game.poker import History, Player
+from pypokerstar.src.parsers.watcher import HandHistoryWatcher
+
+SAMPLE = Path(__file__).parent / "pokerstars.txt"
+HERO = Player(name="pipinoelbreve9")
+
+
+def sample_hands() -> list[str]:
+    return [hand for hand in SAMPLE.read_text(encoding="utf-8-sig").split("\n\n\n\n") if hand.strip()]
+
+
+def append(path: Path, text: str) -> None:
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(text)
+
+
+def test_poll_reports_only_complete_new_hands(tmp_path):
+    hands = sample_hands()
+    table = tmp_path / "table.txt"
+    table.write_text("\n\n\n\n".join(hands[:5]) + "\n\n\n\n", encoding="utf-8")
+    history = History(hero=HERO)
+    reported = []
+    watcher = HandHistoryWatcher(str(tmp_path), hero=HERO, history=history)
+    watcher.subscribe(reported.append)
+    # what was on disk before the watcher started is not reported
+    assert watcher.poll() == []
+
+    # two complete hands and the first half of a third one still being written
+    third = hands[7]
+    append(table, hands[5] + "\n\n\n\n" + hands[6] + "\n\n\n\n" + third[:200])
+    assert len(watcher.poll()) == 2
+    append(table, third[200:] + "\n\n\n\n")
+    new = watcher.poll()
+    assert len(new) == 1 and new[0].raw_text.startswith(third.strip()[:40])
+    assert len(history.hands) == 3 and len(reported) == 2
+
+    # the same hands in a re-exported copy are not reported again
+    (tmp_path / "table_1.txt").write_text("\n\n\n\n".join(hands[5:8]) + "\n\n\n\n", encoding="utf-8")
+    assert watcher.poll() == []
+    assert watcher.parser.duplicates == 3
+
+
+def test_from_start_reads_existing_files(tmp_path):
+    hands = sample_hands()
+    (tmp_path / "table.txt").write_text("\n\n\n\n".join(hands) + "\n\n\n\n", encoding="utf-8")
+    watcher = HandHistoryWatcher(str(tmp_path), hero=HERO, from_start=True)
+    assert len(watcher.poll()) == len(hands)
+    assert watcher.poll() == []